@@ -1,28 +1,76 @@
-import boto3
+"""Entry points of the wedding Lambda functions.
+
+Each Lambda function uses exactly one of the handlers below, so nothing is built when this module is imported: each
+handler, and the stores, caches and clients it depends on, is built on the handler's first invocation, and modules
+only one handler needs are imported by the function that builds it.
+
+Endpoints are deployed either as one function per handler, or all together as a single function using
+`router_handler`, which shares one warm container, template cache and set of stores between every endpoint.
+"""
 import logging
-from configargparse import ArgParser
+from functools import lru_cache
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from wedding.general.profiling import Profiler
+
+
+class _LazyHandler:
+    """A Lambda handler that is built on its first invocation."""
+
+    def __init__(self, build) -> None:
+        self.__build   = build
+        self.__handler = None
+
+    def build(self):
+        """Build the handler, unless it has already been built, and return it."""
+        if self.__handler is None:
+            _configure()
+            self.__handler = self.__build()
+        return self.__handler
+
+    def __call__(self, event, context):
+        return self.build()(event, context)
+
 
-from toolz import get
+def parties_resource(store: 'model.PartyStore'):
+    from wedding import model
+    from wedding.general.filters import boolean
+    from wedding.general.resource import StoreBackedResource
 
-import wedding.invitation
-from wedding.general.resource import StoreBackedResource
-from wedding import rsvp, model
-from wedding.general.functional import option
+    return StoreBackedResource[model.Party](store, model.PartyCodec, {
+        'title'    : str,
+        'local'    : boolean,
+        'rsvpStage': str
+    })
 
 
-def parties_resource(store: model.PartyStore):
-    return StoreBackedResource[model.Party](store, model.PartyCodec)
+def drivers_resource(store: 'model.DriverStore'):
+    from wedding import model
+    from wedding.general.filters import boolean, number
+    from wedding.general.resource import StoreBackedResource
 
+    return StoreBackedResource[model.Driver](store, model.DriverCodec, {
+        'firstName': str,
+        'lastName' : str,
+        'capacity' : number,
+        'available': boolean
+    })
 
-def drivers_resource(store: model.DriverStore):
-    return StoreBackedResource[model.Driver](store, model.DriverCodec)
 
+def passengers_resource(store: 'model.PassengerGroupStore'):
+    from wedding import model
+    from wedding.general.resource import StoreBackedResource
 
-def passengers_resource(store: model.PassengerGroupStore):
-    return StoreBackedResource[model.PassengerGroup](store, model.PassengerGroupCodec)
+    return StoreBackedResource[model.PassengerGroup](store, model.PassengerGroupCodec, {
+        'contactName': str,
+        'arrival'    : str
+    })
 
 
 def argument_parser():
+    from configargparse import ArgParser
+
     parser = ArgParser()
     parser.add_argument(
         '--parties-table',
@@ -39,6 +87,42 @@ def argument_parser():
         default = 'Passengers',
         env_var = 'PASSENGERS_TABLE'
     )
+    parser.add_argument(
+        '--dynamo-workers',
+        env_var = 'DYNAMO_WORKERS',
+        default = 4,
+        type    = int,
+        help    = 'Number of threads each DynamoDB store sends the requests of bulk reads and writes with, and ' +
+                  'scans its table with in parallel. 1 sends them one at a time and scans sequentially.'
+    )
+    parser.add_argument(
+        '--dynamo-scan-segments',
+        env_var = 'DYNAMO_SCAN_SEGMENTS',
+        default = None,
+        type    = int,
+        help    = 'Number of segments a parallel scan divides a table into. Defaults to --dynamo-workers.'
+    )
+    parser.add_argument(
+        '--party-cache-size',
+        env_var = 'PARTY_CACHE_SIZE',
+        default = 0,
+        type    = int,
+        help    = 'Number of parties to cache in memory across invocations. 0 disables the cache.'
+    )
+    parser.add_argument(
+        '--party-cache-ttl',
+        env_var = 'PARTY_CACHE_TTL',
+        default = 30.0,
+        type    = float,
+        help    = 'Seconds a cached party is served before it is read from DynamoDB again'
+    )
+    parser.add_argument(
+        '--party-cache-negative-ttl',
+        env_var = 'PARTY_CACHE_NEGATIVE_TTL',
+        default = 0.0,
+        type    = float,
+        help    = 'Seconds the absence of a party is cached for. 0 disables negative caching.'
+    )
     parser.add_argument(
         '--envelope-bucket',
         env_var = 'ENVELOPE_BUCKET',
@@ -74,6 +158,13 @@ def argument_parser():
         default = 'thank_you_template.html',
         help    = 'S3 key of the thank-you-for-your-RSVP template'
     )
+    parser.add_argument(
+        '--template-ttl',
+        env_var = 'TEMPLATE_TTL',
+        default = 60.0,
+        type    = float,
+        help    = 'Seconds a cached template is served before it is revalidated against S3'
+    )
     parser.add_argument(
         '--error-url',
         env_var = 'ERROR_URL',
@@ -103,6 +194,26 @@ def argument_parser():
         default = 'https://www.flyingjs4.life/index.html',
         help    = 'URL of the Flying Js wedding website homepage!'
     )
+    parser.add_argument(
+        '--metrics-namespace',
+        env_var = 'METRICS_NAMESPACE',
+        default = None,
+        help    = 'CloudWatch namespace to publish per-invocation latency metrics to. Metrics are off if not given.'
+    )
+    parser.add_argument(
+        '--profile-rate',
+        env_var = 'PROFILE_RATE',
+        default = 0.0,
+        type    = float,
+        help    = 'Fraction of invocations to profile with cProfile. 0 disables profiling, as does leaving out ' +
+                  '--profile-bucket.'
+    )
+    parser.add_argument(
+        '--profile-bucket',
+        env_var = 'PROFILE_BUCKET',
+        default = None,
+        help    = 'S3 bucket name and prefix to upload profiles to. Required to profile invocations.'
+    )
     parser.add_argument(
         '--verbosity',
         env_var = 'VERBOSITY',
@@ -113,76 +224,198 @@ def argument_parser():
     return parser
 
 
-args   = argument_parser().parse_args()
-dynamo = boto3.resource('dynamodb')
-logging.basicConfig()
-logger = logging.getLogger('life.flyingjs4.wedding')
-logger.setLevel(args.verbosity)
-logger.debug('New lambda instance initialized')
+@lru_cache(maxsize = None)
+def _args():
+    return argument_parser().parse_args()
+
 
+@lru_cache(maxsize = None)
+def _logger() -> logging.Logger:
+    logging.basicConfig()
+    logger = logging.getLogger('life.flyingjs4.wedding')
+    logger.setLevel(_args().verbosity)
+    logger.debug('New lambda instance initialized')
+    return logger
+
+
+def _bucket(bucket_and_prefix: str):
+    """The S3 bucket and key prefix named by a `bucket/prefix` argument."""
+    import boto3
+    from toolz import get
+    from wedding.general.functional import option
+
+    parts = bucket_and_prefix.split('/', 1)
+    return (
+        boto3.resource('s3').Bucket(parts[0]),
+        option.cata(lambda prefix: prefix + '/', lambda: '')(get(1, parts, None))
+    )
 
-def _template_getter():
-    template_bucket = args.template_bucket.split('/')[0]
-    templates       = boto3.resource('s3').Bucket(template_bucket)
-    template_prefix = option.cata(
-        lambda prefix: prefix + '/',
-        lambda: ''
-    )(get(1, args.template_bucket.split('/'), None))
 
-    return lambda key: templates.Object(template_prefix + key).get()['Body'].read().decode('utf-8')
+@lru_cache(maxsize = None)
+def _configure() -> None:
+    from wedding.general import metrics, profiling
+    from wedding.general.functional import option
 
+    args = _args()
+    _logger()
+    metrics.configure(option.fmap(metrics.Instrumentation)(args.metrics_namespace))
+    profiling.configure(_profiler(args.profile_rate, args.profile_bucket))
 
-get_template = _template_getter()
 
+def _profiler(rate: float, bucket: Optional[str]) -> Optional['Profiler']:
+    """The profiler to sample invocations with, if profiling is on.
 
-party_store           = model.party_store          (dynamo.Table(args.parties_table   ))
-driver_store          = model.driver_store         (dynamo.Table(args.drivers_table   ))
-passenger_group_store = model.passenger_group_store(dynamo.Table(args.passengers_table))
+    Profiles are only uploaded to S3: nobody can read the ephemeral storage of a Lambda container, and profiles
+    written there would fill it.
+    """
+    if rate <= 0:
+        return None
+    if bucket is None:
+        _logger().warning('Profiling is off: --profile-rate is set but --profile-bucket is not')
+        return None
 
+    from wedding.general.profiling import Profiler
+    from wedding.general.aws.s3 import S3ProfileSink
 
-parties_handler    = parties_resource   (party_store          )
-drivers_handler    = drivers_resource   (driver_store         )
-passengers_handler = passengers_resource(passenger_group_store)
+    return Profiler(S3ProfileSink(*_bucket(bucket)), rate)
 
 
-envelope_handler = \
-    wedding.invitation.EnvelopeImageHandler(
-        args.envelope_bucket,
-        party_store
+@lru_cache(maxsize = None)
+def _dynamo():
+    import boto3
+    return boto3.resource('dynamodb')
+
+
+@lru_cache(maxsize = None)
+def _template_cache():
+    from wedding.general.aws.s3 import S3TemplateSource
+    from wedding.general.template import TemplateCache
+
+    return TemplateCache(
+        S3TemplateSource(*_bucket(_args().template_bucket)),
+        _args().template_ttl
     )
 
 
-invitation_handler = \
-    wedding.invitation.InvitationHandler(
-        lambda: get_template(args.invitation_template),
-        args.error_url,
-        party_store
+@lru_cache(maxsize = None)
+def _party_store():
+    from wedding import model
+
+    args  = _args()
+    store = model.party_store(_dynamo().Table(args.parties_table), args.dynamo_workers, args.dynamo_scan_segments)
+    return (
+        model.CachingPartyStore(
+            store,
+            max_size     = args.party_cache_size,
+            ttl          = args.party_cache_ttl,
+            negative_ttl = args.party_cache_negative_ttl
+        ) if args.party_cache_size > 0 else
+        store
+    )
+
+
+def _driver_store():
+    from wedding import model
+
+    args = _args()
+    return model.driver_store(_dynamo().Table(args.drivers_table), args.dynamo_workers, args.dynamo_scan_segments)
+
+
+def _passenger_group_store():
+    from wedding import model
+
+    args = _args()
+    return model.passenger_group_store(
+        _dynamo().Table(args.passengers_table),
+        args.dynamo_workers,
+        args.dynamo_scan_segments
+    )
+
+
+parties_handler    = _LazyHandler(lambda: parties_resource   (_party_store()          ))
+drivers_handler    = _LazyHandler(lambda: drivers_resource   (_driver_store()         ))
+passengers_handler = _LazyHandler(lambda: passengers_resource(_passenger_group_store()))
+
+
+def _envelope_handler():
+    from wedding.invitation import EnvelopeImageHandler
+
+    return EnvelopeImageHandler(
+        _args().envelope_bucket,
+        _party_store()
+    )
+
+
+def _invitation_handler():
+    from wedding.invitation import InvitationHandler
+
+    return InvitationHandler(
+        _template_cache().resolver(_args().invitation_template),
+        _args().error_url,
+        _party_store()
     )
 
 
-rsvp_handler = \
-    rsvp.RsvpHandler(
-        lambda: get_template(args.rsvp_template),
+def _rsvp_handler():
+    from wedding.rsvp import RsvpHandler
+
+    args = _args()
+    return RsvpHandler(
+        _template_cache().resolver(args.rsvp_template),
         args.rideshare_url,
         args.decline_url,
         args.error_url,
-        party_store,
-        logger
+        _party_store(),
+        _logger()
     )
 
 
-ride_share_handler = \
-    rsvp.RideShareHandler(
-        lambda: get_template(args.rideshare_template),
+def _ride_share_handler():
+    from wedding.rsvp import RideShareHandler
+
+    args = _args()
+    return RideShareHandler(
+        _template_cache().resolver(args.rideshare_template),
         args.error_url,
         args.thank_you_url,
-        party_store,
-        logger
+        _party_store(),
+        _logger()
     )
 
 
-thank_you_handler = \
-    rsvp.ThankYouHandler(
-        lambda: get_template(args.thank_you_template),
-        args.homepage_url
+def _thank_you_handler():
+    from wedding.rsvp import ThankYouHandler
+
+    return ThankYouHandler(
+        _template_cache().resolver(_args().thank_you_template),
+        _args().homepage_url
     )
+
+
+envelope_handler   = _LazyHandler(_envelope_handler  )
+invitation_handler = _LazyHandler(_invitation_handler)
+rsvp_handler       = _LazyHandler(_rsvp_handler      )
+ride_share_handler = _LazyHandler(_ride_share_handler)
+thank_you_handler  = _LazyHandler(_thank_you_handler )
+
+
+def _router():
+    from wedding.general.aws.rest.router import Router
+
+    return Router({
+        '/parties'        : parties_handler,
+        '/parties/{id}'   : parties_handler,
+        '/drivers'        : drivers_handler,
+        '/drivers/{id}'   : drivers_handler,
+        '/passengers'     : passengers_handler,
+        '/passengers/{id}': passengers_handler,
+        '/envelopes/{id}' : envelope_handler,
+        '/invitation'     : invitation_handler,
+        '/rsvp'           : rsvp_handler,
+        '/rideshare'      : ride_share_handler,
+        '/thanks'         : thank_you_handler
+    })
+
+
+router_handler = _LazyHandler(_router)
+"""Every endpoint in one Lambda function, as an alternative to deploying one function per handler."""
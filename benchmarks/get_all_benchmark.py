@@ -0,0 +1,63 @@
+"""Compare the throughput of :meth:`wedding.general.aws.dynamodb.DynamoDbStore.get_all` with each codec mode.
+
+Parties are read from an in-memory table, so the numbers measure decoding rather than DynamoDB. The cost of the scan
+itself is measured with a codec that does not decode, and subtracted to give the time spent decoding each party. Run
+from the repository root:
+
+    $ python -m benchmarks.get_all_benchmark
+"""
+import timeit
+
+from tests.data_generators import create_party, guest
+from tests.general.aws.fake_table import FakeTable
+from wedding.general.aws.dynamodb import DynamoDbStore
+from wedding.general.model import JsonEncoder, JsonCodec, codec
+from wedding.model import Party, PartyCodec, PartySchema
+
+
+PARTIES          = 2000
+GUESTS           = 4
+MarshmallowCodec = codec(PartySchema(strict=True), compiled=False)
+ScanOnlyCodec    = JsonCodec[Party](PartyCodec.encode, lambda item: item)
+MODES = [
+    ('marshmallow', MarshmallowCodec, False),
+    ('compiled'   , PartyCodec      , False),
+    ('trusted'    , PartyCodec      , True )
+]
+
+
+def _table() -> FakeTable:
+    table = FakeTable(page_size = PARTIES)
+    for i in range(PARTIES):
+        party = create_party(f'party{i}', *[guest(f'Guest{j}', f'guest{j}', f'id{i}-{j}') for j in range(GUESTS)])
+        table.items[party.id] = PartyCodec.encode(party)
+    return table
+
+
+def _seconds(table: FakeTable, value_codec: JsonCodec[Party], trusted: bool) -> float:
+    store = DynamoDbStore[str, Party](
+        table,
+        lambda party: party.id,
+        JsonEncoder[str](lambda i: {'id': i}),
+        value_codec,
+        trusted = trusted
+    )
+    assert len(list(store.get_all())) == PARTIES
+    return min(timeit.repeat(lambda: list(store.get_all()), number = 1, repeat = 5))
+
+
+def main() -> None:
+    table = _table()
+    scan  = _seconds(table, ScanOnlyCodec, False)
+    print(f'{"mode":>12} {"parties/s":>12} {"decode us":>10} {"decode speedup":>15}')
+
+    baseline = None
+    for name, value_codec, trusted in MODES:
+        seconds  = _seconds(table, value_codec, trusted)
+        decode   = (seconds - scan) / PARTIES * 1e6
+        baseline = baseline or decode
+        print(f'{name:>12} {PARTIES / seconds:>12.0f} {decode:>10.1f} {baseline / decode:>14.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""Compare applying an RSVP to every guest of a party one guest at a time against :func:`wedding.model.modify_guests`.
+
+The baseline folds a remove-then-append update over each guest, as RSVP submission used to, which is quadratic in
+the size of the party. Run from the repository root:
+
+    $ python -m benchmarks.guest_update_benchmark
+"""
+import timeit
+
+from toolz.functoolz import compose
+
+from tests.data_generators import create_party, guest
+from wedding.general.functional import sequence
+from wedding.model import Guest, Party, get_guest, modify_guests, remove_guest
+
+
+PARTY_SIZES = [1, 4, 16, 64, 256]
+
+
+def _one_at_a_time(attending, party: Party) -> Party:
+    def set_attending(g: Guest):
+        def _modify(p: Party) -> Party:
+            updated = get_guest(g.id, p)._replace(attending = attending.get(g.id, False))
+            without = remove_guest(g.id, p)
+            return without._replace(guests = without.guests + [updated])
+        return _modify
+
+    return sequence.foldr(set_attending)(party.guests)(party)
+
+
+def _batched(attending, party: Party) -> Party:
+    return modify_guests(lambda g: g._replace(attending = attending.get(g.id, False)), party)
+
+
+def _per_update_us(update, attending, party: Party) -> float:
+    number = max(10, 20000 // len(party.guests))
+    return min(timeit.repeat(lambda: update(attending, party), number = number, repeat = 3)) / number * 1e6
+
+
+def main() -> None:
+    print(f'{"guests":>8} {"one at a time us":>18} {"batched us":>12} {"speedup":>9}')
+    for party_size in PARTY_SIZES:
+        party     = create_party('party', *[guest(f'Guest{i}', None, f'id{i}') for i in range(party_size)])
+        attending = {f'id{i}': i % 2 == 0 for i in range(party_size)}
+        assert sorted(_one_at_a_time(attending, party).guests) == sorted(_batched(attending, party).guests)
+
+        baseline = _per_update_us(_one_at_a_time, attending, party)
+        batched  = _per_update_us(_batched, attending, party)
+        print(f'{party_size:>8} {baseline:>18.1f} {batched:>12.1f} {baseline / batched:>8.2f}x')
+
+
+if __name__ == '__main__':
+    main()
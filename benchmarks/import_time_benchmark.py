@@ -0,0 +1,133 @@
+"""Measure the cold-start cost of each Lambda handler in `aws/app.py`, and fail if it exceeds its budget.
+
+Every measurement runs in a fresh interpreter, which imports `app` and builds one handler the way its first
+invocation does. Nothing is invoked, so no AWS requests are made. Importing `app` on its own must not import any of
+the modules the handlers depend on, and the REST resource handlers must not import the modules that only page
+handlers need. Run from the repository root:
+
+    $ python -m benchmarks.import_time_benchmark
+
+The exit status is 1 if any budget is exceeded. On Python 3.7 and later the slowest imports of each handler that is
+over budget are listed, as measured by `python -X importtime`.
+"""
+import json
+import os
+import subprocess
+import sys
+
+
+ROOT    = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPEATS = 5
+
+IMPORT_BUDGET_MS = 30
+"""Budget for importing `app` without building any handler."""
+
+HANDLER_BUDGETS_MS = {
+    'parties_handler'   : 500,
+    'drivers_handler'   : 500,
+    'passengers_handler': 500,
+    'envelope_handler'  : 500,
+    'invitation_handler': 600,
+    'rsvp_handler'      : 600,
+    'ride_share_handler': 600,
+    'thank_you_handler' : 600,
+    'router_handler'    : 300
+}
+"""Budgets for importing `app` and building each handler, including the boto3 resources it uses. Most of the cost is
+importing boto3, so the budgets leave room for a noisy machine."""
+
+REST_HANDLERS = ['parties_handler', 'drivers_handler', 'passengers_handler']
+
+HEAVY_MODULES = ['boto3', 'botocore', 'marshmallow', 'pystache', 'configargparse', 'toolz', 'wedding']
+"""Packages that importing `app` on its own must not import."""
+
+PAGE_MODULES = ['pystache', 'cProfile', 'pstats']
+"""Modules that the REST resource handlers must not import."""
+
+ROUTER_MODULES = ['boto3', 'botocore']
+"""Packages that building the router must not import while profiling is off: it builds no store or client until an
+endpoint is invoked."""
+
+
+_PROBE = '''
+import json, sys, time
+handler, heavy, sys.argv = sys.argv[1], sys.argv[2:], sys.argv[:1]
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+if handler:
+    getattr(app, handler).build()
+built = time.perf_counter()
+print(json.dumps({
+    'import': (imported - start) * 1000,
+    'total' : (built - start) * 1000,
+    'loaded': sorted({name.split('.')[0] for name in sys.modules} & set(heavy))
+}))
+'''
+
+
+def _environment():
+    return dict(
+        os.environ,
+        PYTHONPATH         = os.pathsep.join([ROOT, os.environ.get('PYTHONPATH', '')]),
+        AWS_DEFAULT_REGION = os.environ.get('AWS_DEFAULT_REGION', 'us-east-1')
+    )
+
+
+def _run(handler: str, *options: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *options, '-c', _PROBE, handler, *HEAVY_MODULES, *PAGE_MODULES],
+        cwd    = os.path.join(ROOT, 'aws'),
+        env    = _environment(),
+        stdout = subprocess.PIPE,
+        stderr = subprocess.PIPE,
+        check  = True
+    )
+
+
+def measure(handler: str):
+    """The fastest of several cold starts that build `handler`, or only import `app` if `handler` is empty."""
+    runs = [json.loads(_run(handler).stdout.decode('utf-8')) for _ in range(REPEATS)]
+    return min(runs, key = lambda run: run['total'])
+
+
+def _slowest_imports(handler: str, count: int = 10):
+    stderr = _run(handler, '-X', 'importtime').stderr.decode('utf-8')
+    lines  = [line.split('|') for line in stderr.splitlines() if line.startswith('import time:')][1:]
+    return sorted(((int(cumulative), name.rstrip()) for _, cumulative, name in lines), reverse = True)[:count]
+
+
+def main() -> int:
+    failures = []
+
+    bare = measure('')
+    print(f'{"import app":<20} {bare["import"]:8.1f} ms (budget {IMPORT_BUDGET_MS} ms)')
+    if bare['loaded']:
+        failures.append(f'importing app imports {", ".join(bare["loaded"])}')
+    if bare['import'] > IMPORT_BUDGET_MS:
+        failures.append('import app')
+
+    for handler, budget in HANDLER_BUDGETS_MS.items():
+        run = measure(handler)
+        print(f'{handler:<20} {run["total"]:8.1f} ms (budget {budget} ms)')
+        forbidden = (
+            PAGE_MODULES   if handler in REST_HANDLERS   else
+            ROUTER_MODULES if handler == 'router_handler' else
+            []
+        )
+        needless = [name for name in forbidden if name in run['loaded']]
+        if needless:
+            failures.append(f'{handler} imports {", ".join(needless)}')
+        if run['total'] > budget:
+            failures.append(handler)
+            if sys.version_info >= (3, 7):
+                for microseconds, name in _slowest_imports(handler):
+                    print(f'    {microseconds / 1000:8.1f} ms  {name}')
+
+    for failure in failures:
+        print(f'Over budget: {failure}')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
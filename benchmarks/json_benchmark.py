@@ -0,0 +1,57 @@
+"""Compare the JSON libraries :mod:`wedding.general.fastjson` can use on a large collection of parties.
+
+Each installed library encodes the body of a `GET /parties` response and decodes the body of a `POST /parties`
+request, both with every party in the collection. The baseline is `json.dumps` and `json.loads` with their default
+settings, which the resources used before. Install `orjson` or `ujson` to include them. Run from the repository root:
+
+    $ python -m benchmarks.json_benchmark
+"""
+import json
+import timeit
+
+from tests.data_generators import create_party, guest
+from wedding.general import fastjson
+from wedding.general.fastjson import BACKENDS
+from wedding.model import PartyCodec
+
+
+PARTIES = 2000
+GUESTS  = 4
+
+
+def _body():
+    return {
+        'items': [
+            PartyCodec.encode(
+                create_party(f'party{i}', *[guest(f'Guëst{j}', f'guest{j}', f'id{i}-{j}') for j in range(GUESTS)])
+            )
+            for i in range(PARTIES)
+        ]
+    }
+
+
+def _seconds(f) -> float:
+    return min(timeit.repeat(f, number = 1, repeat = 5))
+
+
+def main() -> None:
+    body = _body()
+    text = json.dumps(body)
+    print(f'{"library":>10} {"encode ms":>10} {"decode ms":>10} {"encode speedup":>15} {"decode speedup":>15}')
+
+    encode, decode = _seconds(lambda: json.dumps(body)), _seconds(lambda: json.loads(text))
+    print(f'{"baseline":>10} {encode * 1000:>10.1f} {decode * 1000:>10.1f} {1:>14.2f}x {1:>14.2f}x')
+
+    for name in BACKENDS:
+        fastjson.configure(name)
+        assert fastjson.loads(fastjson.dumps(body)) == body
+        seconds = _seconds(lambda: fastjson.dumps(body)), _seconds(lambda: fastjson.loads(text))
+        print(
+            f'{name:>10} {seconds[0] * 1000:>10.1f} {seconds[1] * 1000:>10.1f} ' +
+            f'{encode / seconds[0]:>14.2f}x {decode / seconds[1]:>14.2f}x'
+        )
+    fastjson.configure(None)
+
+
+if __name__ == '__main__':
+    main()
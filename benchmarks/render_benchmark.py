@@ -0,0 +1,65 @@
+"""Compare per-render latency of :mod:`wedding.general.mustache` against :func:`pystache.render`.
+
+Renders the RSVP page template, whose guest list grows with the size of the party, plus the ride-share URL
+template. Run from the repository root:
+
+    $ python -m benchmarks.render_benchmark
+"""
+import os.path
+import timeit
+
+import pystache
+
+from wedding.general import mustache
+
+
+TEMPLATES     = os.path.join(os.path.dirname(__file__), '..', 'aws', 'resources', 'templates')
+PARTY_SIZES   = [1, 2, 4, 8, 16]
+REPETITIONS   = 2000
+RIDESHARE_URL = '/rideshare?guest={{guestId}}&party={{partyId}}&local={{local}}&rideshare={{rideshare}}'
+
+
+def _rsvp_context(party_size: int):
+    return {
+        'partyId': 'flyingjs',
+        'guestId': 'guest0',
+        'guests' : [
+            {
+                'id'       : f'guest{i}',
+                'firstName': f'First{i}',
+                'lastName' : 'Doe',
+                'attending': i % 2 == 0
+            }
+            for i in range(party_size)
+        ]
+    }
+
+
+def _per_render_us(render, template: str, context) -> float:
+    return min(timeit.repeat(lambda: render(template, context), number = REPETITIONS, repeat = 3)) / REPETITIONS * 1e6
+
+
+def _compare(name: str, template: str, context) -> None:
+    assert mustache.render(template, context) == pystache.render(template, context)
+
+    baseline = _per_render_us(pystache.render, template, context)
+    compiled = _per_render_us(mustache.render, template, context)
+    print(f'{name:<24} {baseline:>12.1f} {compiled:>12.1f} {baseline / compiled:>8.2f}x')
+
+
+def main() -> None:
+    with open(os.path.join(TEMPLATES, 'rsvp_template.html'), encoding = 'utf-8') as template_file:
+        rsvp_template = template_file.read()
+
+    print(f'{"template":<24} {"pystache us":>12} {"compiled us":>12} {"speedup":>9}')
+    for party_size in PARTY_SIZES:
+        _compare(f'rsvp ({party_size} guests)', rsvp_template, _rsvp_context(party_size))
+    _compare(
+        'rideshare url',
+        RIDESHARE_URL,
+        {'guestId': 'guest0', 'partyId': 'flyingjs', 'local': True, 'rideshare': False}
+    )
+
+
+if __name__ == '__main__':
+    main()
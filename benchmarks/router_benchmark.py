@@ -0,0 +1,43 @@
+"""Measure the per-invocation overhead of dispatching events through :obj:`wedding.general.aws.rest.router.Router`.
+
+Routes the same table of endpoints as `aws/app.py` to a handler that does nothing, and compares each way of routing
+an event with calling the handler directly. Run from the repository root:
+
+    $ python -m benchmarks.router_benchmark
+"""
+import timeit
+
+from wedding.general.aws.rest.router import Router
+
+
+REPETITIONS = 100000
+RESOURCES   = [
+    '/parties', '/parties/{id}', '/drivers', '/drivers/{id}', '/passengers', '/passengers/{id}', '/envelopes/{id}',
+    '/invitation', '/rsvp', '/rideshare', '/thanks'
+]
+EVENTS = [
+    ('resource'              , {'resource': '/thanks', 'httpMethod': 'GET'}),
+    ('resource with method'  , {'resource': '/rsvp'  , 'httpMethod': 'POST'}),
+    ('path, first resource'  , {'path': '/parties'   , 'httpMethod': 'GET'}),
+    ('path, last resource'   , {'path': '/thanks'    , 'httpMethod': 'GET'})
+]
+
+
+def _nothing(event, context):
+    return None
+
+
+def main() -> None:
+    router = Router(dict({resource: _nothing for resource in RESOURCES}, **{'POST /rsvp': _nothing}))
+    direct = min(timeit.repeat(lambda: _nothing({}, None), number = REPETITIONS, repeat = 5)) / REPETITIONS
+
+    print(f'{"event":>22} {"us/event":>10} {"overhead us":>12}')
+    print(f'{"direct call":>22} {direct * 1e6:>10.2f} {0:>12.2f}')
+    for name, event in EVENTS:
+        assert router.route(event) is _nothing
+        seconds = min(timeit.repeat(lambda: router(event, None), number = REPETITIONS, repeat = 5)) / REPETITIONS
+        print(f'{name:>22} {seconds * 1e6:>10.2f} {(seconds - direct) * 1e6:>12.2f}')
+
+
+if __name__ == '__main__':
+    main()
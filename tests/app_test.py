@@ -0,0 +1,101 @@
+import importlib.util
+import logging
+import os
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from tests.data_generators import create_party, guest
+from tests.general.aws.fake_table import FakeTable, FakeClient
+
+
+@pytest.fixture
+def app(monkeypatch):
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'aws', 'app.py')
+    spec = importlib.util.spec_from_file_location('app', path)
+    app  = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(app)
+    # Configuring parses the command line and environment of a Lambda function
+    monkeypatch.setattr(app, '_configure', lambda: None)
+    return app
+
+
+def test_lazy_handler_is_built_once_on_first_invocation(app):
+    built = []
+
+    def build():
+        built.append(len(built))
+        return lambda event, context: (len(built), event, context)
+
+    handler = app._LazyHandler(build)
+    assert built == []
+
+    assert handler('first', 'context') == (1, 'first', 'context')
+    assert handler('second', None) == (1, 'second', None)
+    assert built == [0]
+
+
+class _ConcurrentClient(FakeClient):
+    """Holds every batch request until `concurrency` requests are in flight at once."""
+
+    def __init__(self, table: FakeTable, concurrency: int) -> None:
+        super().__init__(table)
+        self.__barrier = threading.Barrier(concurrency, timeout = 5)
+
+    def batch_get_item(self, **kwargs):
+        self.__barrier.wait()
+        return super().batch_get_item(**kwargs)
+
+    def batch_write_item(self, **kwargs):
+        self.__barrier.wait()
+        return super().batch_write_item(**kwargs)
+
+
+def _tables(app, monkeypatch, concurrency: int, *argv: str):
+    tables = {}
+
+    def table(name: str) -> FakeTable:
+        tables[name]      = FakeTable()
+        tables[name].meta = SimpleNamespace(client = _ConcurrentClient(tables[name], concurrency))
+        return tables[name]
+
+    args = app.argument_parser().parse_args(list(argv))
+    monkeypatch.setattr(app, '_args', lambda: args)
+    monkeypatch.setattr(app, '_dynamo', lambda: SimpleNamespace(Table = table))
+    return tables
+
+
+def test_dynamo_workers_send_bulk_writes_concurrently(app, monkeypatch):
+    _tables(app, monkeypatch, 3, '--dynamo-workers', '3')
+    parties = [create_party(f'party{i}', guest('John', 'john', f'id{i}')) for i in range(3 * 25)]
+
+    report = app._party_store().put_all(parties)
+
+    assert sorted(report.succeeded) == sorted(party.id for party in parties)
+    assert report.failed == []
+
+
+def test_dynamo_workers_scan_tables_in_parallel(app, monkeypatch):
+    tables  = _tables(app, monkeypatch, 1, '--dynamo-workers', '2', '--dynamo-scan-segments', '5')
+    drivers = app._driver_store()
+
+    assert list(drivers.get_all()) == []
+    assert {args['Segment'] for _, args in tables['Drivers'].requests} == set(range(5))
+
+
+def test_dynamo_workers_get_many_concurrently(app, monkeypatch):
+    tables  = _tables(app, monkeypatch, 2, '--dynamo-workers', '2')
+    parties = app._party_store()
+    for i in range(2 * 100):
+        parties.put(create_party(f'party{i}', guest('John', 'john', f'id{i}')))
+
+    ids = sorted(tables['Parties'].items)
+    assert sorted(party.id for party in parties.get_many(ids)) == ids
+
+
+def test_profiling_is_off_without_rate_or_bucket(app, monkeypatch):
+    monkeypatch.setattr(app, '_logger', lambda: logging.getLogger('test'))
+
+    assert app._profiler(0, 'bucket/profiles') is None
+    assert app._profiler(0.5, None) is None
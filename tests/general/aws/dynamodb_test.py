@@ -0,0 +1,391 @@
+import threading
+
+import pytest
+from boto3.dynamodb.conditions import Attr
+from marshmallow import ValidationError
+from toolz.itertoolz import concat
+
+from tests.data_generators import create_party, guest
+from tests.general.aws.fake_table import FakeTable
+from wedding.general.aws.dynamodb import DynamoDbStore
+from wedding.general.model import JsonEncoder
+from wedding.general.filters import Filter
+from wedding.general.store import InvalidCursor, ReadOnlyStore
+from wedding.model import Party, PartyCodec, RsvpStages, NotInvited, EmailOpened
+
+
+party = create_party('does', guest('John', 'john', 'id1'), guest('Jane', 'jane', 'id2'))
+
+
+def _store(table: FakeTable, **kwargs) -> DynamoDbStore[str, Party]:
+    return DynamoDbStore[str, Party](
+        table,
+        lambda party: party.id,
+        JsonEncoder[str](lambda i: {'id': i}),
+        PartyCodec,
+        **kwargs
+    )
+
+
+def test_update():
+    table = FakeTable()
+    store = _store(table)
+    store.put(party)
+
+    updated = store.update(party.id, {'title': 'The Does'}, Attr('title').eq(party.title))
+
+    assert updated == party._replace(title = 'The Does')
+    assert store.get(party.id) == updated
+    assert [operation for operation, _ in table.requests] == ['PutItem', 'UpdateItem', 'GetItem']
+
+
+def test_update_condition_not_satisfied():
+    store = _store(FakeTable())
+    store.put(party)
+
+    assert store.update(party.id, {'title': 'The Does'}, Attr('title').eq('Someone Else')) is None
+    assert store.get(party.id) == party
+
+
+def test_update_missing_item():
+    table = FakeTable()
+
+    assert _store(table).update('nobody', {'title': 'The Does'}) is None
+    assert table.items == {}
+
+
+def test_modify_unchanged_does_not_write():
+    table = FakeTable()
+    store = _store(table)
+    store.put(party)
+    table.requests.clear()
+
+    assert store.modify(party.id, lambda p: p._replace(title = party.title)) == party
+    assert [operation for operation, _ in table.requests] == ['GetItem']
+
+
+def test_modify_writes_only_changed_attributes():
+    table = FakeTable()
+    store = _store(table)
+    store.put(party)
+    table.requests.clear()
+
+    modified = store.modify(party.id, lambda p: p._replace(title = 'The Does'))
+
+    assert modified == party._replace(title = 'The Does')
+    assert store.get(party.id) == modified
+    operation, request = table.requests[1]
+    assert operation == 'UpdateItem'
+    assert request['UpdateExpression'] == 'SET #u0 = :u0'
+
+
+def test_modify_retries_concurrent_changes():
+    table = FakeTable()
+    store = _store(table)
+    store.put(party)
+    calls = []
+
+    def rename(p: Party) -> Party:
+        if not calls:
+            table.items[party.id]['title'] = 'Someone Else'
+        calls.append(p)
+        return p._replace(title = p.title + '!')
+
+    assert store.modify(party.id, rename).title == 'Someone Else!'
+    assert len(calls) == 2
+
+
+def test_modify_missing():
+    table = FakeTable()
+
+    assert _store(table).modify('nobody', lambda p: p._replace(title = 'The Does')) is None
+    assert table.items == {}
+
+
+def _parties(n: int):
+    return [create_party(str(i), guest('John', 'john', f'{i}-1')) for i in range(n)]
+
+
+def test_get_many():
+    table = FakeTable()
+    store = _store(table)
+    parties = _parties(250)
+    for p in parties:
+        store.put(p)
+    table.requests.clear()
+
+    keys = [p.id for p in parties] + ['nobody', parties[0].id]
+
+    assert sorted(store.get_many(keys), key = lambda p: int(p.id)) == parties
+    assert [operation for operation, _ in table.requests] == ['BatchGetItem'] * 3
+
+
+def test_get_many_retries_unprocessed_keys():
+    table = FakeTable(batch_limit = 30)
+    store = _store(table)
+    store.BACKOFF_BASE = 0
+    parties = _parties(100)
+    for p in parties:
+        store.put(p)
+
+    assert sorted(store.get_many(p.id for p in parties), key = lambda p: int(p.id)) == parties
+
+
+def test_get_many_concurrently():
+    table = FakeTable()
+    store = _store(table, workers = 4)
+    parties = _parties(1000)
+    for p in parties:
+        store.put(p)
+
+    assert sorted(store.get_many(p.id for p in parties), key = lambda p: int(p.id)) == parties
+
+
+def test_get_all():
+    table = FakeTable(page_size = 7)
+    store = _store(table)
+    parties = _parties(50)
+    for p in parties:
+        store.put(p)
+
+    assert sorted(store.get_all(), key = lambda p: int(p.id)) == parties
+
+
+def test_parallel_get_all_matches_sequential():
+    table = FakeTable(page_size = 7)
+    parties = _parties(200)
+    for p in parties:
+        _store(table).put(p)
+    sequential = list(_store(table).get_all())
+
+    for workers, segments in [(4, None), (2, 8), (1, 3)]:
+        parallel = DynamoDbStore[str, Party](
+            table,
+            lambda party: party.id,
+            JsonEncoder[str](lambda i: {'id': i}),
+            PartyCodec,
+            workers       = workers,
+            scan_segments = segments
+        )
+        assert sorted(parallel.get_all(), key = lambda p: int(p.id)) == sorted(sequential, key = lambda p: int(p.id))
+
+
+class _SlowFirstSegmentTable(FakeTable):
+    """A table whose first scan segment is only read once it is released."""
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.release = threading.Event()
+
+    def scan(self, Segment = 0, TotalSegments = 1, **kwargs):
+        if TotalSegments > 1 and Segment == 0 and not self.release.wait(timeout = 5):
+            raise TimeoutError('The first segment was never released')
+        return super().scan(Segment = Segment, TotalSegments = TotalSegments, **kwargs)
+
+
+def test_parallel_get_all_yields_segments_as_they_are_read():
+    table = _SlowFirstSegmentTable(page_size = 2)
+    for p in _parties(100):
+        _store(table).put(p)
+    later, start = [], None
+    while True:
+        page  = FakeTable.scan(table, Segment = 1, TotalSegments = 2, ExclusiveStartKey = start)
+        later = later + page['Items']
+        start = page.get('LastEvaluatedKey')
+        if start is None:
+            break
+    assert len(later) > 2 * DynamoDbStore.SCAN_PREFETCH * table.page_size
+
+    store = _store(table, workers = 2)
+    read  = []
+    for value in store.get_all():
+        read.append(value)
+        if len(read) == len(later):
+            # Every value so far came from the later segment, which was read while the first was held back
+            assert sorted(p.id for p in read) == sorted(item['id'] for item in later)
+            table.release.set()
+
+    assert len(read) == 100
+
+
+def test_parallel_get_all_stops_early():
+    table = FakeTable(page_size = 5)
+    store = _store(table, workers = 4)
+    for p in _parties(500):
+        store.put(p)
+    table.requests.clear()
+
+    values = iter(store.get_all())
+    next(values)
+    values.close()
+
+    assert len(table.requests) < 100 / 5
+
+
+def test_put_all():
+    table = FakeTable(batch_limit = 10)
+    store = _store(table, workers = 3)
+    store.BACKOFF_BASE = 0
+    parties = _parties(100)
+
+    report = store.put_all(iter(parties + [parties[0]._replace(title = 'The Does')]))
+
+    assert sorted(report.succeeded) == sorted([parties[0].id] + [p.id for p in parties])
+    assert report.failed == []
+    assert sorted(store.get_all(), key = lambda p: int(p.id)) == [parties[0]._replace(title = 'The Does')] + parties[1:]
+
+
+def test_put_all_reports_failures():
+    table = FakeTable(batch_limit = 0)
+    store = _store(table)
+    store.BACKOFF_BASE = 0
+
+    report = store.put_all(_parties(3) + [party._replace(rsvp_stage = 'not a stage')])
+
+    assert report.succeeded == []
+    assert sorted(key for key, _ in report.failed) == sorted(['0', '1', '2', party.id])
+
+
+def test_delete_all():
+    table = FakeTable(batch_limit = 10)
+    store = _store(table, workers = 2)
+    store.BACKOFF_BASE = 0
+    parties = _parties(60)
+    store.put_all(parties)
+    del table.requests[:]
+
+    report = store.delete_all(iter([p.id for p in parties[:40]] + ['missing', parties[0].id]))
+
+    assert sorted(report.succeeded) == sorted([p.id for p in parties[:40]] + ['missing', parties[0].id])
+    assert report.failed == []
+    assert sorted(p.id for p in store.get_all()) == sorted(p.id for p in parties[40:])
+    assert {operation for operation, _ in table.requests} == {'BatchWriteItem', 'Scan'}
+
+
+def test_delete_all_reports_failures():
+    table = FakeTable(batch_limit = 0)
+    store = _store(table)
+    store.BACKOFF_BASE = 0
+    store.put(party)
+
+    report = store.delete_all([party.id])
+
+    assert report.succeeded == []
+    assert [key for key, _ in report.failed] == [party.id]
+    assert store.get(party.id) == party
+
+
+def test_trusted_reads_skip_validation():
+    table = FakeTable()
+    _store(table).put(party)
+    table.items[party.id]['title'] = 7
+
+    with pytest.raises(ValidationError):
+        _store(table).get(party.id)
+    assert _store(table, trusted = True).get(party.id) == party._replace(title = 7)
+    assert list(_store(table, trusted = True).get_all()) == [party._replace(title = 7)]
+
+
+def test_get_page():
+    table = FakeTable(page_size = 100)
+    store = _store(table)
+    parties = [party._replace(id = f'party{i}') for i in range(7)]
+    store.put_all(parties)
+
+    pages, cursor = [], None
+    while cursor is not None or not pages:
+        page   = store.get_page(3, cursor)
+        cursor = page.cursor
+        pages.append(page.items)
+
+    assert [len(items) for items in pages] == [3, 3, 1]
+    assert [operation for operation, _ in table.requests].count('Scan') == 3
+    assert list(concat(pages)) == list(store.get_all())
+
+
+@pytest.mark.parametrize('cursor', ['', 'not a cursor', 'e30=', 'eyJvdGhlciI6IHsiUyI6ICJ4In19'])
+def test_get_page_rejects_invalid_cursors(cursor):
+    with pytest.raises(InvalidCursor):
+        _store(FakeTable()).get_page(3, cursor)
+
+
+def _filter_parties():
+    return [
+        party._replace(id = f'party{i}', local = i % 2 == 0, rsvp_stage = RsvpStages[i % len(RsvpStages)])
+        for i in range(12)
+    ]
+
+
+def test_find_scans_with_filter_expression():
+    table   = FakeTable()
+    store   = _store(table)
+    parties = _filter_parties()
+    store.put_all(parties)
+
+    found = store.find([Filter('local', 'eq', True), Filter('rsvpStage', 'in', ['not_invited', 'email_opened'])])
+
+    assert sorted(found) == sorted(p for p in parties if p.local and p.rsvp_stage in [NotInvited, EmailOpened])
+    assert {operation for operation, _ in table.requests} == {'BatchWriteItem', 'Scan'}
+
+
+def test_find_queries_matching_index():
+    index   = {
+        'IndexName' : 'ByStage',
+        'KeySchema' : [
+            {'AttributeName': 'rsvpStage', 'KeyType': 'HASH' },
+            {'AttributeName': 'title'    , 'KeyType': 'RANGE'}
+        ],
+        'Projection': {'ProjectionType': 'ALL'}
+    }
+    table   = FakeTable(indexes = [index], page_size = 2)
+    store   = _store(table)
+    parties = _filter_parties()
+    store.put_all(parties)
+
+    found = store.find([Filter('local', 'eq', True), Filter('rsvpStage', 'eq', 'not_invited')])
+
+    assert sorted(found) == sorted(p for p in parties if p.local and p.rsvp_stage == NotInvited)
+    queries = [request for operation, request in table.requests if operation == 'Query']
+    assert queries and all(request['IndexName'] == 'ByStage' for request in queries)
+    assert 'Scan' not in [operation for operation, _ in table.requests]
+
+
+def test_get_page_with_filters():
+    store   = _store(FakeTable(page_size = 100))
+    parties = _filter_parties()
+    store.put_all(parties)
+
+    items, cursor = [], None
+    while True:
+        page   = store.get_page(4, cursor, [Filter('local', 'eq', False)])
+        items += page.items
+        cursor = page.cursor
+        if cursor is None:
+            break
+
+    assert sorted(items) == sorted(p for p in parties if not p.local)
+
+
+def test_project():
+    table   = FakeTable(page_size = 5)
+    store   = _store(table)
+    parties = _filter_parties()
+    store.put_all(parties)
+    names   = ['id', 'rsvpStage']
+    partial = {p.id: PartyCodec.encode_partial(p, names) for p in parties}
+
+    projected = store.project(names, PartyCodec)
+
+    assert projected.get('party1') == partial['party1']
+    assert sorted(projected.get_many(['party2', 'party3']), key = str) == [partial['party2'], partial['party3']]
+    assert sorted(projected.get_all(), key = str) == sorted(partial.values(), key = str)
+    assert sorted(projected.find([Filter('local', 'eq', True)]), key = str) == sorted(
+        (partial[p.id] for p in parties if p.local), key = str
+    )
+    assert all(
+        request.get('ProjectionExpression') == '#p0, #p1'
+        for operation, request in table.requests
+        if operation != 'BatchWriteItem'
+    )
+    with pytest.raises(ReadOnlyStore):
+        projected.put(partial['party1'])
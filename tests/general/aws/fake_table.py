@@ -0,0 +1,264 @@
+import copy
+import re
+import zlib
+from types import SimpleNamespace
+from typing import Dict, Any, List, Tuple
+
+from boto3.dynamodb import conditions
+from boto3.dynamodb.types import TypeSerializer
+from botocore.exceptions import ClientError
+
+
+_TYPES = {
+    'NULL': lambda v: v is None,
+    'BOOL': lambda v: isinstance(v, bool),
+    'S'   : lambda v: isinstance(v, str),
+    'L'   : lambda v: isinstance(v, list),
+    'M'   : lambda v: isinstance(v, dict)
+}
+
+
+def _value(operand, item):
+    return item.get(operand.name) if isinstance(operand, conditions.AttributeBase) else operand
+
+
+def evaluate(condition, item: Dict[str, Any]) -> bool:
+    """Evaluate a boto3 condition object against an item."""
+    values = [
+        evaluate(v, item) if isinstance(v, conditions.ConditionBase) else v
+        for v in condition._values
+    ]
+    operands = [_value(v, item) for v in values]
+    exists   = lambda v: isinstance(v, conditions.AttributeBase) and v.name in item
+
+    return {
+        conditions.Equals            : lambda: operands[0] == operands[1],
+        conditions.NotEquals         : lambda: operands[0] != operands[1],
+        conditions.LessThan          : lambda: operands[0] <  operands[1],
+        conditions.LessThanEquals    : lambda: operands[0] <= operands[1],
+        conditions.GreaterThan       : lambda: operands[0] >  operands[1],
+        conditions.GreaterThanEquals : lambda: operands[0] >= operands[1],
+        conditions.In                : lambda: operands[0] in operands[1],
+        conditions.BeginsWith        : lambda: str(operands[0] or '').startswith(operands[1]),
+        conditions.Between           : lambda: operands[1] <= operands[0] <= operands[2],
+        conditions.AttributeExists   : lambda: exists(values[0]),
+        conditions.AttributeNotExists: lambda: not exists(values[0]),
+        conditions.AttributeType     : lambda: exists(values[0]) and _TYPES[values[1]](operands[0]),
+        conditions.And               : lambda: values[0] and values[1],
+        conditions.Or                : lambda: values[0] or values[1],
+        conditions.Not               : lambda: not values[0]
+    }[type(condition)]()
+
+
+def project(item: Dict[str, Any], ProjectionExpression = None, ExpressionAttributeNames = None) -> Dict[str, Any]:
+    """Keep only the attributes of an item named by a projection expression."""
+    if ProjectionExpression is None:
+        return copy.deepcopy(item)
+    aliases = ExpressionAttributeNames or {}
+    names   = [aliases.get(name.strip(), name.strip()) for name in ProjectionExpression.split(',')]
+    return {name: copy.deepcopy(item[name]) for name in names if name in item}
+
+
+def conditional_check_failed(operation: str, item: Dict[str, Any] = None) -> ClientError:
+    # Like boto3, the item of a failed request is in DynamoDB's typed format, even when sent through a Table resource
+    return ClientError(
+        dict(
+            {'Error': {'Code': 'ConditionalCheckFailedException', 'Message': 'The conditional request failed'}},
+            **({'Item': {name: TypeSerializer().serialize(value) for name, value in item.items()}} if item else {})
+        ),
+        operation
+    )
+
+
+class FakeClient:
+    """The batch operations of a boto3 DynamoDB client, for a single :obj:`FakeTable`."""
+
+    def __init__(self, table) -> None:
+        self.__table = table
+
+    def batch_get_item(self, RequestItems):
+        table = self.__table
+        request    = RequestItems[table.name]
+        keys       = request['Keys']
+        projection = {
+            name: request[name] for name in ('ProjectionExpression', 'ExpressionAttributeNames') if name in request
+        }
+        table.requests.append(('BatchGetItem', dict(projection, Keys = keys)))
+        assert len(keys) <= 100
+
+        processed, unprocessed = keys[:table.batch_limit], keys[table.batch_limit:]
+        return {
+            'Responses'      : {table.name: [
+                project(table.items[key[table.hash_key]], **projection)
+                for key in processed
+                if key[table.hash_key] in table.items
+            ]},
+            'UnprocessedKeys': {table.name: dict(projection, Keys = unprocessed)} if unprocessed else {}
+        }
+
+
+    def batch_write_item(self, RequestItems):
+        table    = self.__table
+        requests = RequestItems[table.name]
+        table.requests.append(('BatchWriteItem', {'Requests': requests}))
+        keys = [
+            (request.get('PutRequest', {}).get('Item') or request['DeleteRequest']['Key'])[table.hash_key]
+            for request in requests
+        ]
+        if len(requests) > 25 or len(set(keys)) != len(keys):
+            raise ClientError({'Error': {'Code': 'ValidationException', 'Message': 'Bad batch'}}, 'BatchWriteItem')
+
+        processed, unprocessed = requests[:table.batch_limit], requests[table.batch_limit:]
+        for request in processed:
+            if 'PutRequest' in request:
+                item = request['PutRequest']['Item']
+                table.items[item[table.hash_key]] = copy.deepcopy(item)
+            else:
+                table.items.pop(request['DeleteRequest']['Key'][table.hash_key], None)
+
+        return {'UnprocessedItems': {table.name: unprocessed} if unprocessed else {}}
+
+
+class FakeTable:
+    """An in-memory stand-in for a boto3 DynamoDB `Table` resource with a single hash key.
+
+    Batch requests process at most `batch_limit` items, returning the rest as unprocessed. Scans and queries return
+    pages of at most `page_size` items, ordered by a hash of the item's key; segments of a parallel scan are contiguous
+    ranges of that hash, so reading segments in order gives the same items as a sequential scan. Like DynamoDB, filter
+    expressions are applied to each page after it has been read. Queries of `indexes` evaluate their key condition
+    against whole items.
+    """
+
+    def __init__(self,
+                 hash_key   : str                  = 'id',
+                 batch_limit: int                  = 100,
+                 page_size  : int                  = 10,
+                 indexes    : List[Dict[str, Any]] = None) -> None:
+        self.name        = 'Fake'
+        self.hash_key    = hash_key
+        self.batch_limit = batch_limit
+        self.page_size   = page_size
+        self.key_schema  = [{'AttributeName': hash_key, 'KeyType': 'HASH'}]
+        self.global_secondary_indexes = indexes
+        self.local_secondary_indexes  = None
+        self.items: Dict[Any, Dict[str, Any]] = {}
+        self.requests: List[Tuple[str, Dict[str, Any]]] = []
+        self.meta = SimpleNamespace(client = FakeClient(self))
+
+    def __key(self, key: Dict[str, Any]):
+        return key[self.hash_key]
+
+    def __check(self, operation: str, item: Dict[str, Any], condition) -> None:
+        if condition is not None and not evaluate(condition, item):
+            raise conditional_check_failed(operation)
+
+    def get_item(self, Key, ProjectionExpression = None, ExpressionAttributeNames = None):
+        self.requests.append(('GetItem', {'Key': Key, 'ProjectionExpression': ProjectionExpression}))
+        item = self.items.get(self.__key(Key))
+        return {'Item': project(item, ProjectionExpression, ExpressionAttributeNames)} if item is not None else {}
+
+    def put_item(self, Item, ConditionExpression = None):
+        self.requests.append(('PutItem', {'Item': Item}))
+        self.__check('PutItem', self.items.get(Item[self.hash_key], {}), ConditionExpression)
+        self.items[Item[self.hash_key]] = copy.deepcopy(Item)
+        return {}
+
+    def delete_item(self, Key):
+        self.requests.append(('DeleteItem', {'Key': Key}))
+        self.items.pop(self.__key(Key), None)
+        return {}
+
+    def update_item(self,
+                    Key,
+                    UpdateExpression,
+                    ExpressionAttributeNames,
+                    ExpressionAttributeValues = None,
+                    ConditionExpression = None,
+                    ReturnValues = 'NONE',
+                    ReturnValuesOnConditionCheckFailure = 'NONE'):
+        self.requests.append(('UpdateItem', {'Key': Key, 'UpdateExpression': UpdateExpression}))
+        current = self.items.get(self.__key(Key), {})
+        if ConditionExpression is not None and not evaluate(ConditionExpression, current):
+            raise conditional_check_failed(
+                'UpdateItem',
+                current if ReturnValuesOnConditionCheckFailure == 'ALL_OLD' else None
+            )
+
+        updated = dict(copy.deepcopy(current), **Key)
+        for clause, body in re.findall(r'(SET|REMOVE) ((?:(?!SET |REMOVE ).)*)', UpdateExpression):
+            for action in filter(None, (a.strip() for a in body.split(','))):
+                if clause == 'SET':
+                    name, value = (part.strip() for part in action.split('='))
+                    updated[ExpressionAttributeNames[name]] = copy.deepcopy(ExpressionAttributeValues[value])
+                else:
+                    updated.pop(ExpressionAttributeNames[action], None)
+
+        self.items[self.__key(Key)] = updated
+        return {'Attributes': copy.deepcopy(updated)} if ReturnValues == 'ALL_NEW' else {}
+
+    @staticmethod
+    def __hash(key) -> int:
+        return zlib.crc32(str(key).encode('utf-8'))
+
+    def __page(self, keys, ExclusiveStartKey, Limit, FilterExpression, ProjectionExpression, ExpressionAttributeNames):
+        keys = sorted(keys, key = lambda key: (self.__hash(key), str(key)))
+        if ExclusiveStartKey is not None:
+            start = ExclusiveStartKey[self.hash_key]
+            keys  = [key for key in keys if (self.__hash(key), str(key)) > (self.__hash(start), str(start))]
+
+        page = keys[:min(self.page_size, Limit or self.page_size)]
+        return dict(
+            {'Items': [
+                project(self.items[key], ProjectionExpression, ExpressionAttributeNames)
+                for key in page
+                if FilterExpression is None or evaluate(FilterExpression, self.items[key])
+            ]},
+            **({'LastEvaluatedKey': {self.hash_key: page[-1]}} if len(page) < len(keys) else {})
+        )
+
+    def scan(self,
+             ExclusiveStartKey        = None,
+             Segment                  = 0,
+             TotalSegments            = 1,
+             Limit                    = None,
+             FilterExpression         = None,
+             ProjectionExpression     = None,
+             ExpressionAttributeNames = None):
+        self.requests.append(('Scan', {
+            'ExclusiveStartKey'   : ExclusiveStartKey,
+            'Segment'             : Segment,
+            'FilterExpression'    : FilterExpression,
+            'ProjectionExpression': ProjectionExpression
+        }))
+        return self.__page(
+            [key for key in self.items if self.__hash(key) * TotalSegments >> 32 == Segment],
+            ExclusiveStartKey,
+            Limit,
+            FilterExpression,
+            ProjectionExpression,
+            ExpressionAttributeNames
+        )
+
+    def query(self,
+              KeyConditionExpression,
+              IndexName                = None,
+              ExclusiveStartKey        = None,
+              Limit                    = None,
+              FilterExpression         = None,
+              ProjectionExpression     = None,
+              ExpressionAttributeNames = None):
+        self.requests.append(('Query', {
+            'KeyConditionExpression': KeyConditionExpression,
+            'IndexName'             : IndexName,
+            'ExclusiveStartKey'     : ExclusiveStartKey,
+            'FilterExpression'      : FilterExpression,
+            'ProjectionExpression'  : ProjectionExpression
+        }))
+        return self.__page(
+            [key for key, item in self.items.items() if evaluate(KeyConditionExpression, item)],
+            ExclusiveStartKey,
+            Limit,
+            FilterExpression,
+            ProjectionExpression,
+            ExpressionAttributeNames
+        )
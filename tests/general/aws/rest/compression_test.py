@@ -0,0 +1,45 @@
+import gzip
+
+import pytest
+
+from wedding.general.aws.rest import compression
+from wedding.general.aws.rest.compression import negotiate, accept_encoding
+
+
+@pytest.mark.parametrize('header, expected', [
+    (None                   , None  ),
+    (''                     , None  ),
+    ('identity'             , None  ),
+    ('gzip'                 , 'gzip'),
+    ('deflate, GZIP'        , 'gzip'),
+    ('gzip;q=0'             , None  ),
+    ('*'                    , 'gzip'),
+    ('*, gzip;q=0'          , None  ),
+    ('gzip;q=0.5, identity' , 'gzip'),
+    ('gzip ; q=bad'         , None  )
+])
+def test_negotiate_gzip(header, expected, monkeypatch):
+    monkeypatch.setattr(compression, 'ENCODERS', {'gzip': compression.ENCODERS['gzip']})
+    assert negotiate(header) == expected
+
+
+def test_negotiate_prefers_higher_quality(monkeypatch):
+    monkeypatch.setattr(compression, 'ENCODERS', {'br': lambda data: data, 'gzip': lambda data: data})
+
+    assert negotiate('gzip, br') == 'br'
+    assert negotiate('gzip, br;q=0.8') == 'gzip'
+    assert negotiate('br;q=0, *') == 'gzip'
+
+
+def test_gzip_round_trip_is_deterministic():
+    data = b'wedding ' * 500
+
+    assert gzip.decompress(compression.compress(data, 'gzip')) == data
+    assert compression.compress(data, 'gzip') == compression.compress(data, 'gzip')
+
+
+def test_accept_encoding_ignores_header_case():
+    assert accept_encoding({'headers': {'accept-encoding': 'gzip'}}) == 'gzip'
+    assert accept_encoding({'headers': {'Accept-Encoding': 'br'}}) == 'br'
+    assert accept_encoding({'headers': None}) is None
+    assert accept_encoding({}) is None
@@ -0,0 +1,43 @@
+import pytest
+
+from wedding.general.aws.rest import etags
+
+
+etag = etags.strong('content')
+
+
+@pytest.mark.parametrize('if_none_match, expected', [
+    (None                              , False),
+    (''                                , False),
+    (etag                              , True ),
+    ('W/' + etag                       , True ),
+    ('"other", ' + etag                , True ),
+    (etags.encoded(etag, 'gzip')       , True ),
+    ('*'                               , True ),
+    ('"other"'                         , False),
+    (etags.strong('other content')     , False)
+])
+def test_matches(if_none_match, expected):
+    assert etags.matches(if_none_match, etag) == expected
+
+
+def test_parse():
+    assert etags.parse(None) == []
+    assert etags.parse(' W/"a" ,"b",') == ['"a"', '"b"']
+
+
+def test_strong():
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etags.strong('a', 'bc') != etags.strong('ab', 'c')
+    assert etags.encoded(etag, 'gzip') == etag[:-1] + '-gzip"'
+
+
+def test_fingerprint_only_hashes_changed_text(monkeypatch):
+    hashed      = []
+    strong      = etags.strong
+    fingerprint = etags.Fingerprint()
+    monkeypatch.setattr(etags, 'strong', lambda text: hashed.append(text) or strong(text))
+
+    assert fingerprint('template') == fingerprint('template') == strong('template')
+    assert fingerprint('changed') == strong('changed')
+    assert hashed == ['template', 'changed']
@@ -0,0 +1,34 @@
+import pytest
+from marshmallow import ValidationError
+
+from wedding.general.aws.rest import ndjson
+from wedding.general.aws.rest.ndjson import Lines, LineError
+
+
+@pytest.mark.parametrize('headers, expected', [
+    ({'Content-Type': 'application/x-ndjson'               }, True ),
+    ({'content-type': 'Application/JSONL; charset=utf-8'   }, True ),
+    ({'Content-Type': 'application/json'                   }, False),
+    (None                                                   , False)
+])
+def test_is_ndjson(headers, expected):
+    assert ndjson.is_ndjson({'headers': headers}) == expected
+
+
+def test_lines_are_decoded_as_they_are_read():
+    decoded = []
+
+    def decode(value):
+        if 'n' not in value:
+            raise ValidationError({'n': ['Missing data for required field.']})
+        decoded.append(value['n'])
+        return value['n']
+
+    lines = Lines('{"n": 1}\r\n\n[1, \n{"m": 2}\n{"n": 3}', decode)
+    read  = iter(lines)
+
+    assert next(read) == 1
+    assert decoded == [1]
+    assert list(read) == [3]
+    assert [error.line for error in lines.errors] == [3, 4]
+    assert lines.errors[1] == LineError(4, str(ValidationError({'n': ['Missing data for required field.']})))
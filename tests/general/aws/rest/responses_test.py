@@ -1,6 +1,9 @@
+import base64
+import gzip
 import json
 
-from wedding.general.aws.rest.responses import Created, InternalServerError
+from wedding.general.aws.rest import compression, etags
+from wedding.general.aws.rest.responses import Created, InternalServerError, Ok, TemporaryRedirect, conditional
 
 
 def test_no_message():
@@ -21,3 +24,99 @@ def test_message():
     assert not as_json['isBase64Encoded']
     assert json.loads(as_json['body'])['message'] == 'some message'
     assert error.body == as_json['body']
+
+
+def test_message_is_escaped():
+    message = 'Invalid "id": C:\\parties\n'
+    assert json.loads(InternalServerError(message).body) == {'message': message}
+
+
+def _decompress(as_json):
+    return gzip.decompress(base64.b64decode(as_json['body'])).decode('utf-8')
+
+
+def test_compressed():
+    ok      = Ok('é' * compression.MIN_SIZE)
+    as_json = ok.as_json('gzip, deflate')
+
+    assert as_json['isBase64Encoded']
+    assert as_json['headers'] == {'Content-Encoding': 'gzip', 'Vary': 'Accept-Encoding'}
+    assert _decompress(as_json) == ok.body
+    assert ok.as_json('gzip') is not as_json and ok.as_json('gzip') == as_json
+
+
+def test_not_compressed():
+    small = Ok('x' * (compression.MIN_SIZE - 1))
+    large = Ok('x' * compression.MIN_SIZE)
+
+    for response, accept_encoding in [(small, 'gzip'), (large, None), (large, 'identity'), (large, 'gzip;q=0')]:
+        as_json = response.as_json(accept_encoding)
+        assert not as_json['isBase64Encoded']
+        assert as_json['body'] == response.body
+        assert 'headers' not in as_json
+
+
+def test_body_not_made_smaller_is_sent_as_is(monkeypatch):
+    monkeypatch.setattr(compression, 'MIN_SIZE', 1)
+    as_json = Ok('short').as_json('gzip')
+
+    assert not as_json['isBase64Encoded']
+    assert as_json['body'] == 'short'
+
+
+def test_redirect_not_compressed():
+    redirect = TemporaryRedirect('https://example.com/' + 'a' * compression.MIN_SIZE)
+
+    assert redirect.precompress().as_json('gzip')['body'] == redirect.body
+
+
+def test_precompress():
+    ok = Ok('x' * compression.MIN_SIZE).precompress(['gzip'])
+
+    assert _decompress(ok.as_json('gzip')) == ok.body
+
+
+def test_etag():
+    etag = etags.strong('x' * compression.MIN_SIZE)
+    ok   = Ok('x' * compression.MIN_SIZE, etag)
+
+    assert ok.as_json()['headers'] == {'ETag': etag}
+    assert ok.as_json('gzip')['headers']['ETag'] == etags.encoded(etag, 'gzip')
+    assert 'headers' not in Ok('x').as_json()
+
+
+def test_conditional():
+    etag     = etags.strong('body')
+    rendered = []
+
+    def render():
+        rendered.append(True)
+        return 'body'
+
+    not_modified = conditional(etag, etag, render).as_json()
+    ok           = conditional('"other"', etag, render).as_json()
+
+    assert (not_modified['statusCode'], not_modified['body'], not_modified['headers']) == (304, '', {'ETag': etag})
+    assert (ok['statusCode'], ok['body'], ok['headers']) == (200, 'body', {'ETag': etag})
+    assert rendered == [True]
+
+
+def test_not_modified_has_the_etag_of_the_compressed_body():
+    etag = etags.strong('x' * compression.MIN_SIZE)
+    ok   = conditional(None, etag, lambda: 'x' * compression.MIN_SIZE).as_json('gzip')
+
+    not_modified = conditional(ok['headers']['ETag'], etag, lambda: '').as_json('gzip')
+
+    assert not_modified['statusCode'] == 304
+    assert not_modified['headers'] == {'ETag': etags.encoded(etag, 'gzip'), 'Vary': 'Accept-Encoding'}
+    assert not_modified['headers']['ETag'] == ok['headers']['ETag']
+
+
+def test_not_modified_keeps_the_etag_of_an_uncompressed_body():
+    etag = etags.strong('x')
+    ok   = conditional(None, etag, lambda: 'x').as_json('gzip')
+
+    not_modified = conditional(ok['headers']['ETag'], etag, lambda: '').as_json('gzip')
+
+    assert not_modified['statusCode'] == 304
+    assert not_modified['headers'] == {'ETag': etag}
@@ -0,0 +1,54 @@
+import pytest
+
+from wedding.general.aws.rest.responses import NotFound, MethodNotAllowed
+from wedding.general.aws.rest.router import Router
+
+
+def _handler(name):
+    return lambda event, context: (name, context)
+
+
+router = Router({
+    '/parties'     : _handler('parties'),
+    '/parties/{id}': _handler('party'),
+    '/rsvp'        : _handler('rsvp'),
+    'POST /rsvp'   : _handler('submit rsvp'),
+    'GET /thanks'  : _handler('thanks')
+})
+
+
+@pytest.mark.parametrize('event, expected', [
+    ({'resource': '/parties'     , 'httpMethod': 'GET'   }, 'parties'    ),
+    ({'resource': '/parties/{id}', 'httpMethod': 'DELETE'}, 'party'      ),
+    ({'resource': '/rsvp'        , 'httpMethod': 'GET'   }, 'rsvp'       ),
+    ({'resource': '/rsvp'        , 'httpMethod': 'post'  }, 'submit rsvp'),
+    ({'resource': '/rsvp'                                }, 'rsvp'       ),
+    ({'path'    : '/parties/does', 'httpMethod': 'GET'   }, 'party'      ),
+    ({'path'    : '/parties'     , 'httpMethod': 'GET'   }, 'parties'    ),
+    ({'path'    : '/thanks'      , 'httpMethod': 'GET'   }, 'thanks'     )
+])
+def test_routes(event, expected):
+    assert router(event, 'context') == (expected, 'context')
+
+
+@pytest.mark.parametrize('event, expected', [
+    ({'resource': '/drivers'          , 'httpMethod': 'GET' }, NotFound        ),
+    ({'path'    : '/parties/does/more', 'httpMethod': 'GET' }, NotFound        ),
+    ({'partyId' : 'does'                                    }, NotFound        ),
+    ({'resource': '/thanks'           , 'httpMethod': 'POST'}, MethodNotAllowed)
+])
+def test_unrouted(event, expected):
+    assert router(event, None)['statusCode'] == expected().status_code
+
+
+def test_warm_up_reaches_every_handler():
+    warmed = []
+
+    def handler(name):
+        return lambda event, context: warmed.append(name) or {'warmup': True, 'cold': name == 'party'}
+
+    shared = handler('parties')
+    router = Router({'/parties': shared, '/parties/{id}': shared, '/rsvp': handler('party')})
+
+    assert router({'warmup': True}, None) == {'warmup': True, 'cold': True}
+    assert warmed == ['parties', 'party']
@@ -0,0 +1,107 @@
+from tests.data_generators import create_party, guest
+from tests.general.aws.fake_table import FakeTable
+from wedding.general.caching import CachingStore
+from wedding.model import party_store, CachingPartyStore, CardClicked
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+does    = create_party('does'   , guest('John', 'john', 'id1'))
+smiths  = create_party('smiths' , guest('Jane', 'jane', 'id2'))
+joneses = create_party('joneses', guest('Jim' , 'jim' , 'id3'))
+
+
+def _cache(table: FakeTable, clock: Clock, **kwargs) -> CachingStore:
+    parties = party_store(table)
+    for party in [does, smiths, joneses]:
+        parties.put(party)
+    table.requests.clear()
+    return CachingPartyStore(parties, clock = clock, **kwargs)
+
+
+def test_read_through_with_ttl():
+    table = FakeTable()
+    clock = Clock()
+    cache = _cache(table, clock, ttl = 10)
+
+    assert cache.get(does.id) == does
+    assert cache.get(does.id) == does
+    assert len(table.requests) == 1
+
+    clock.now = 10
+    assert cache.get(does.id) == does
+    assert len(table.requests) == 2
+    assert cache.stats.hit_rate == 1 / 3
+
+
+def test_lru_eviction():
+    table = FakeTable()
+    cache = _cache(table, Clock(), max_size = 2)
+
+    cache.get(does.id)
+    cache.get(smiths.id)
+    cache.get(does.id)
+    cache.get(joneses.id)
+    table.requests.clear()
+
+    assert cache.get(does.id) == does
+    assert cache.get(smiths.id) == smiths
+    assert [operation for operation, _ in table.requests] == ['GetItem']
+    assert cache.stats.evictions == 2
+
+
+def test_negative_caching():
+    table = FakeTable()
+    cache = _cache(table, Clock(), negative_ttl = 5)
+
+    assert cache.get('nobody') is None
+    assert cache.get('nobody') is None
+    assert len(table.requests) == 1
+
+
+def test_writes_update_cache():
+    table = FakeTable()
+    cache = _cache(table, Clock())
+
+    cache.get(does.id)
+    renamed = cache.modify(does.id, lambda party: party._replace(title = 'The Does'))
+    advanced = cache.advance(does.id, CardClicked)
+    table.requests.clear()
+
+    assert cache.get(does.id) == advanced == renamed._replace(rsvp_stage = CardClicked)
+    assert table.requests == []
+
+    cache.delete(does.id)
+    assert cache.get(does.id) is None
+
+
+def test_get_many():
+    table = FakeTable()
+    cache = _cache(table, Clock(), negative_ttl = 5)
+    cache.get(does.id)
+    table.requests.clear()
+
+    keys = [does.id, smiths.id, 'nobody']
+    assert sorted(p.id for p in cache.get_many(keys)) == sorted([does.id, smiths.id])
+    assert sorted(p.id for p in cache.get_many(keys)) == sorted([does.id, smiths.id])
+    assert [operation for operation, _ in table.requests] == ['BatchGetItem']
+
+
+def test_delete_all_invalidates():
+    table = FakeTable()
+    cache = _cache(table, Clock())
+    cache.get(does.id)
+    cache.get(smiths.id)
+
+    report = cache.delete_all([does.id, smiths.id])
+
+    assert sorted(report.succeeded) == sorted([does.id, smiths.id])
+    assert cache.get(does.id) is None
+    assert cache.get(smiths.id) is None
+    assert cache.get(joneses.id) == joneses
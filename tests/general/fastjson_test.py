@@ -0,0 +1,41 @@
+import json
+from datetime import date
+
+import pytest
+
+from wedding.general import fastjson
+from wedding.general.fastjson import BACKENDS
+
+
+@pytest.fixture(params = list(BACKENDS))
+def backend(request):
+    fastjson.configure(request.param)
+    yield request.param
+    fastjson.configure(None)
+
+
+def test_round_trip(backend):
+    value = {'title': 'The "Does"', 'path': 'C:\\parties/does', 'names': ['Zoë', '\u2028', '\t\x00'], 'n': 2.5}
+
+    assert fastjson.backend() == backend
+    assert json.loads(fastjson.dumps(value)) == value
+    assert fastjson.loads(fastjson.dumps(value)) == value
+    assert fastjson.loads(fastjson.dumps(value).encode('utf-8')) == value
+
+
+def test_sort_keys(backend):
+    assert fastjson.dumps({'b': 1, 'a': {'d': 2, 'c': 3}}, sort_keys = True) == '{"a":{"c":3,"d":2},"b":1}'
+
+
+def test_default(backend):
+    assert json.loads(fastjson.dumps({'on': date(2018, 10, 6)}, default = str)) == {'on': '2018-10-06'}
+
+
+def test_invalid_json(backend):
+    with pytest.raises(ValueError):
+        fastjson.loads('{"items": [')
+
+
+def test_unknown_backend():
+    with pytest.raises(KeyError):
+        fastjson.configure('simplejson')
@@ -0,0 +1,43 @@
+from decimal import Decimal
+
+import pytest
+
+from wedding.general.filters import Filter, InvalidFilter, parse_filters, matches, boolean, number
+
+
+attributes = {'title': str, 'local': boolean, 'capacity': number}
+
+
+def test_parse_equality():
+    assert parse_filters({'title': 'The Does', 'local': 'true'}, attributes) == [
+        Filter('title', 'eq', 'The Does'),
+        Filter('local', 'eq', True)
+    ]
+
+
+def test_parse_operators():
+    assert parse_filters({'capacity': 'ge:3', 'title': 'in:a,b:c'}, attributes) == [
+        Filter('capacity', 'ge', Decimal(3)),
+        Filter('title', 'in', ['a', 'b:c'])
+    ]
+
+
+def test_parse_operands_that_look_like_operators():
+    assert parse_filters({'title': 'eq:in:a'}, attributes) == [Filter('title', 'eq', 'in:a')]
+    assert parse_filters({'title': 'Re: the wedding'}, attributes) == [Filter('title', 'eq', 'Re: the wedding')]
+
+
+@pytest.mark.parametrize('parameters', [{'guests': 'none'}, {'local': 'maybe'}, {'capacity': 'lt:many'}])
+def test_parse_rejects_invalid_filters(parameters):
+    with pytest.raises(InvalidFilter):
+        parse_filters(parameters, attributes)
+
+
+def test_matches():
+    item = {'title': 'The Does', 'capacity': 3, 'local': None}
+
+    assert matches([Filter('title', 'begins_with', 'The'), Filter('capacity', 'gt', Decimal(2))], item)
+    assert matches([Filter('capacity', 'in', [Decimal(3), Decimal(4)]), Filter('missing', 'ne', 1)], item)
+    assert not matches([Filter('title', 'begins_with', 'The'), Filter('capacity', 'lt', 3)], item)
+    assert not matches([Filter('local', 'ge', 1)], item)
+    assert not matches([Filter('title', 'gt', 1)], item)
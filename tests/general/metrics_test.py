@@ -0,0 +1,104 @@
+import json
+from itertools import count as counter
+
+import pytest
+
+from tests.data_generators import create_party, guest
+from tests.general.aws.fake_table import FakeTable
+from wedding.general import metrics
+from wedding.general.aws.rest import LambdaHandler, lambda_resource
+from wedding.general.metrics import Instrumentation
+from wedding.model import party_store
+
+
+class _Handler(LambdaHandler):
+    def __init__(self, handle) -> None:
+        self.__handle = handle
+
+    def _handle(self, event):
+        return self.__handle(event)
+
+
+@pytest.fixture
+def lines(monkeypatch):
+    monkeypatch.setattr(lambda_resource, '_warm', True)
+    lines = []
+    ticks = counter()
+    metrics.configure(Instrumentation('Wedding', lines.append, clock = lambda: next(ticks) / 1000, now = lambda: 1.5))
+    yield lines
+    metrics.configure(None)
+
+
+def test_one_line_per_invocation(lines):
+    def handle(_):
+        with metrics.timer('Render'):
+            pass
+        metrics.count('Items', 3)
+        metrics.count('Items', 2)
+        return 'done'
+
+    assert _Handler(handle)({}, None) == 'done'
+    assert len(lines) == 1
+
+    line = json.loads(lines[0])
+    assert line['_aws']['Timestamp'] == 1500
+    assert line['_aws']['CloudWatchMetrics'] == [{
+        'Namespace' : 'Wedding',
+        'Dimensions': [['Handler']],
+        'Metrics'   : [
+            {'Name': 'Render'   , 'Unit': 'Milliseconds'},
+            {'Name': 'Duration' , 'Unit': 'Milliseconds'},
+            {'Name': 'ColdStart', 'Unit': 'Count'       },
+            {'Name': 'Items'    , 'Unit': 'Count'       }
+        ]
+    }]
+    assert (line['Handler'], line['Render'], line['Duration'], line['Items']) == ('_Handler', 1.0, 3.0, 5)
+    assert line['ColdStart'] == 0
+    assert line['Calls'] == {'Render': 1, 'Duration': 1}
+
+
+def test_failed_invocation_counts_error(lines):
+    def handle(_):
+        raise ValueError('boom')
+
+    with pytest.raises(ValueError):
+        _Handler(handle)({}, None)
+
+    assert json.loads(lines[0])['Errors'] == 1
+    assert metrics.timer('Render') is metrics.timer('Decode')
+
+
+def test_nested_invocations_emit_once(lines):
+    inner = _Handler(lambda _: metrics.count('Inner'))
+    _Handler(lambda event: inner(event, None))({}, None)
+
+    assert len(lines) == 1
+    assert json.loads(lines[0])['Handler'] == '_Handler'
+    assert json.loads(lines[0])['Inner'] == 1
+
+
+def test_store_reports_requests_and_decoding(lines):
+    parties = party_store(FakeTable())
+    parties.put(create_party('does', guest('John', 'john', 'id1')))
+
+    _Handler(lambda _: (parties.get('does'), list(parties.get_all())))({}, None)
+
+    line = json.loads(lines[0])
+    assert line['Calls'] == {'DynamoDb.GetItem': 1, 'DynamoDb.Scan': 1, 'Decode': 2, 'Duration': 1}
+
+
+def test_no_op_when_not_configured():
+    assert _Handler(lambda _: metrics.count('Items') or 'done')({}, None) == 'done'
+    assert metrics.invocation('_Handler') is metrics.timer('Render') is metrics.timer('Decode')
+
+
+def test_reports_cold_start_and_warm_ups(lines, monkeypatch):
+    monkeypatch.setattr(lambda_resource, '_warm', False)
+    handler = _Handler(lambda _: 'done')
+
+    assert handler({'warmup': True}, None) == {'warmup': True, 'cold': True}
+    assert handler({}, None) == 'done'
+
+    first, second = map(json.loads, lines)
+    assert (first ['ColdStart'], first ['Warmups']) == (1, 1)
+    assert (second['ColdStart'], 'Warmups' in second) == (0, False)
@@ -0,0 +1,150 @@
+import random
+from datetime import datetime
+
+import pytest
+from marshmallow import ValidationError
+from marshmallow.fields import String, Boolean, Integer, DateTime
+from marshmallow.validate import Range
+
+from wedding.general.model import build, codec, required, optional
+
+
+Tag, TagSchema = build('Tag', {
+    'name' : required(String),
+    'color': optional(String, 'tagColor')
+})
+
+Item, ItemSchema = build('Item', {
+    'id'      : required(String),
+    'count'   : required(Integer, validate = Range(0, 100)),
+    'enabled' : optional(Boolean),
+    'created' : required(DateTime),
+    'label'   : optional(String, 'itemLabel', missing = 'none', allow_none = True),
+    'tags'    : required(TagSchema, many = True),
+    'primary' : optional(TagSchema, 'primaryTag')
+})
+
+compiled = codec(ItemSchema(strict = True))
+strict   = codec(ItemSchema(strict = True), compiled = False)
+
+
+def _text(rng: random.Random) -> str:
+    return ''.join(rng.choice('abcdé XYZ019') for _ in range(rng.randint(0, 8)))
+
+
+def _maybe(rng: random.Random, value):
+    return value if rng.random() < 0.7 else None
+
+
+def _tag(rng: random.Random) -> Tag:
+    return Tag(name = _text(rng), color = _maybe(rng, _text(rng)))
+
+
+def _item(rng: random.Random) -> Item:
+    return Item(
+        id      = _text(rng),
+        count   = rng.randint(0, 100),
+        enabled = _maybe(rng, rng.random() < 0.5),
+        created = datetime(2018, rng.randint(1, 12), rng.randint(1, 28), rng.randint(0, 23), rng.randint(0, 59)),
+        label   = _maybe(rng, _text(rng)),
+        tags    = [_tag(rng) for _ in range(rng.randint(0, 4))],
+        primary = _maybe(rng, _tag(rng))
+    )
+
+
+def _items():
+    rng = random.Random(2018)
+    return [_item(rng) for _ in range(200)]
+
+
+def test_compiled_encode_matches_marshmallow():
+    for item in _items():
+        assert compiled.encode(item) == strict.encode(item)
+
+
+def test_compiled_decode_matches_marshmallow():
+    for item in _items():
+        as_json = strict.encode(item)
+        assert compiled.decode(as_json) == strict.decode(as_json)
+
+
+def test_compiled_decode_applies_defaults_and_attribute_names():
+    rng = random.Random(7)
+    for item in _items():
+        as_json = strict.encode(item)
+        for key in ('enabled', 'itemLabel', 'primaryTag'):
+            if rng.random() < 0.5:
+                del as_json[key]
+        if rng.random() < 0.5:
+            as_json['tags'] = [{'name': tag['name']} for tag in as_json['tags']]
+        if 'itemLabel' in as_json and rng.random() < 0.5:
+            as_json['label'] = as_json.pop('itemLabel')
+
+        assert compiled.decode(as_json) == strict.decode(as_json)
+
+
+def test_trusted_decode_matches_validated_decode():
+    for item in _items():
+        as_json = strict.encode(item)
+        assert compiled.decode_trusted(as_json) == compiled.decode(as_json)
+
+
+def test_trusted_decode_skips_validation():
+    as_json = dict(strict.encode(_items()[0]), count = 101, id = None)
+
+    with pytest.raises(ValidationError):
+        compiled.decode(as_json)
+    decoded = compiled.decode_trusted(as_json)
+    assert (decoded.count, decoded.id) == (101, None)
+
+
+@pytest.mark.parametrize('change', [
+    {'count': 101},
+    {'count': 'many'},
+    {'id': 5},
+    {'id': None},
+    {'enabled': 'perhaps'},
+    {'created': 'yesterday'},
+    {'tags': {'name': 'tag'}},
+    {'primaryTag': 'tag'}
+])
+def test_compiled_decode_rejects_what_marshmallow_rejects(change):
+    as_json = dict(strict.encode(_items()[0]), **change)
+
+    with pytest.raises(ValidationError):
+        strict.decode(as_json)
+    with pytest.raises(ValidationError):
+        compiled.decode(as_json)
+
+
+def test_compiled_decode_rejects_missing_fields():
+    as_json = strict.encode(_items()[0])
+    del as_json['id']
+
+    with pytest.raises(ValidationError) as error:
+        compiled.decode(as_json)
+    assert error.value.messages == {'id': ['Missing data for required field.']}
+
+
+def test_compiled_decode_reports_nested_errors():
+    as_json = dict(strict.encode(_items()[0]), tags = [{'name': 'first'}, {'color': 'red'}])
+
+    with pytest.raises(ValidationError) as error:
+        compiled.decode(as_json)
+    assert error.value.messages == {'tags': {1: {'name': ['Missing data for required field.']}}}
+
+
+@pytest.mark.parametrize('names', [['id'], ['count', 'tags', 'itemLabel'], ['primaryTag', 'created', 'unknown']])
+def test_encode_partial(names):
+    for item in _items():
+        expected = {name: value for name, value in strict.encode(item).items() if name in names}
+
+        assert compiled.encode_partial(item, names) == expected
+        assert strict.encode_partial(item, names) == expected
+        assert compiled.reencode_partial(strict.encode(item), names) == expected
+
+
+def test_reencode_partial_applies_defaults():
+    as_json = {'id': 'item', 'count': 3}
+
+    assert compiled.reencode_partial(as_json, ['id', 'itemLabel', 'tags']) == {'id': 'item', 'itemLabel': 'none'}
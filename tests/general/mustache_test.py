@@ -0,0 +1,33 @@
+import pystache
+
+from wedding.general.mustache import TemplateRenderer
+
+
+template = '{{#guests}}<p>{{firstName}} & {{lastName}}</p>{{/guests}}{{^guests}}nobody{{/guests}}'
+context  = {
+    'guests': [
+        {'firstName': 'John', 'lastName': '<Doe>'},
+        {'firstName': 'Jane', 'lastName': 'Doe'}
+    ]
+}
+
+
+def test_render_matches_pystache():
+    renderer = TemplateRenderer()
+    assert renderer.render(template, context) == pystache.render(template, context)
+    assert renderer.render(template, {}) == pystache.render(template, {})
+
+
+def test_parses_once():
+    renderer = TemplateRenderer()
+    assert renderer.parse(template) is renderer.parse(''.join(list(template)))
+
+
+def test_evicts_least_recently_used():
+    renderer = TemplateRenderer(max_templates = 2)
+    first = renderer.parse('{{a}}')
+    renderer.parse('{{b}}')
+    renderer.parse('{{a}}')
+    renderer.parse('{{c}}')
+
+    assert renderer.parse('{{a}}') is first
@@ -0,0 +1,83 @@
+import cProfile
+import marshal
+import os
+import pstats
+
+import pytest
+
+from wedding.general import profiling
+from wedding.general.aws.rest import LambdaHandler, lambda_resource
+from wedding.general.profiling import Profiler, ProfileSink, ProfileTag, DirectoryProfileSink
+
+
+class _Handler(LambdaHandler):
+    def _handle(self, event):
+        return sum(range(event['n']))
+
+
+class _ListSink(ProfileSink):
+    def __init__(self) -> None:
+        self.profiles = []
+
+    def write(self, tag, stats):
+        self.profiles.append((tag, stats))
+
+
+@pytest.fixture
+def sink(monkeypatch):
+    sink = _ListSink()
+    monkeypatch.setattr(lambda_resource, '_warm', False)
+    yield sink
+    profiling.configure(None)
+
+
+def _profiled_functions(stats: pstats.Stats):
+    return {name for _, _, name in stats.stats}
+
+
+def test_samples_invocations(sink):
+    samples = iter([0.1, 0.9, 0.2])
+    profiling.configure(Profiler(sink, 0.5, sample = lambda: next(samples), now = lambda: 2.5))
+
+    for n in range(3):
+        assert _Handler()({'n': n}, None) == sum(range(n))
+
+    assert [tag for tag, _ in sink.profiles] == [ProfileTag('_Handler', True, 2.5), ProfileTag('_Handler', False, 2.5)]
+    assert all('_handle' in _profiled_functions(stats) for _, stats in sink.profiles)
+
+
+def test_failing_sink_does_not_fail_invocation(sink):
+    class Failing(ProfileSink):
+        def write(self, tag, stats):
+            raise IOError('disk full')
+
+    profiling.configure(Profiler(Failing(), 1.0))
+
+    assert _Handler()({'n': 3}, None) == 3
+
+
+def test_directory_sink(tmpdir):
+    stats = pstats.Stats(cProfile.Profile().runctx('sum(range(10))', {}, {}))
+    tag   = ProfileTag('RsvpHandler', False, 1538352000.123)
+
+    DirectoryProfileSink(str(tmpdir.join('profiles'))).write(tag, stats)
+
+    path = str(tmpdir.join('profiles', 'RsvpHandler-warm-1538352000123.pstats'))
+    assert os.path.exists(path)
+    assert pstats.Stats(path).stats == stats.stats
+    with open(path, 'rb') as profile:
+        assert marshal.loads(profile.read()) == marshal.loads(profiling.dumps(stats))
+
+
+def test_directory_sink_keeps_latest_profiles(tmpdir):
+    stats = pstats.Stats(cProfile.Profile().runctx('sum(range(10))', {}, {}))
+    sink  = DirectoryProfileSink(str(tmpdir), max_profiles = 2)
+
+    for timestamp in [1, 2, 3]:
+        sink.write(ProfileTag('RsvpHandler', False, timestamp), stats)
+
+    assert sorted(os.listdir(str(tmpdir))) == ['RsvpHandler-warm-2000.pstats', 'RsvpHandler-warm-3000.pstats']
+
+
+def test_not_profiled_when_not_configured(sink):
+    assert profiling.invocation('_Handler', True) is profiling.invocation('_Handler', False)
@@ -0,0 +1,227 @@
+import base64
+import gzip
+import json
+
+from toolz.dicttoolz import dissoc
+
+from tests.data_generators import create_party, guest
+from tests.general.aws.fake_table import FakeTable
+from wedding.general.filters import boolean
+from wedding.general.memory import InMemoryStore
+from wedding.general.resource import StoreBackedResource
+from wedding.model import Party, PartyCodec, party_store, RsvpStages
+
+
+parties = [
+    create_party(f'party{i}', guest('John', 'john', 'id1'))._replace(local = i < 2, rsvp_stage = RsvpStages[i])
+    for i in range(5)
+]
+filters = {'local': boolean, 'rsvpStage': str}
+
+
+def _memory_store():
+    return InMemoryStore(lambda party: party.id, PartyCodec.encode, parties)
+
+
+def _dynamo_store():
+    store = party_store(FakeTable(page_size = 100))
+    store.put_all(parties)
+    return store
+
+
+def _get(resource: StoreBackedResource[Party], query):
+    return resource({resource.METHOD_FIELD: 'GET', resource.QUERY_FIELD: query}, None)
+
+
+def _pages(resource: StoreBackedResource[Party], limit: int, **filters):
+    pages, query = [], dict(filters, **{resource.LIMIT_PARAMETER: str(limit)})
+    while query is not None:
+        body  = json.loads(_get(resource, query)['body'])
+        query = body['next'] and dict(query, **{resource.CURSOR_PARAMETER: body['next']})
+        pages.append([PartyCodec.decode(item) for item in body['items']])
+    return pages
+
+
+def test_get_many_pages():
+    for store in [_memory_store(), _dynamo_store()]:
+        resource = StoreBackedResource[Party](store, PartyCodec, filters)
+        pages    = _pages(resource, 2)
+
+        assert [len(page) for page in pages] == [2, 2, 1]
+        assert sorted(party for page in pages for party in page) == sorted(parties)
+
+
+def test_get_many_without_limit_returns_the_first_page():
+    for store in [_memory_store(), _dynamo_store()]:
+        resource = StoreBackedResource[Party](store, PartyCodec)
+        resource.MAX_LIMIT = 3
+        first    = json.loads(_get(resource, None)['body'])
+        rest     = json.loads(_get(resource, {resource.CURSOR_PARAMETER: first['next']})['body'])
+
+        assert len(first['items']) == 3
+        assert rest['next'] is None
+        assert sorted(PartyCodec.decode(item) for item in first['items'] + rest['items']) == sorted(parties)
+
+
+def test_get_many_rejects_bad_paging_parameters():
+    for store in [_memory_store(), _dynamo_store()]:
+        resource = StoreBackedResource[Party](store, PartyCodec, filters)
+
+        for query in [{'limit': 'ten'}, {'limit': '0'}, {'cursor': 'garbage'}, {'title': 'x'}, {'local': 'maybe'}]:
+            assert _get(resource, query)['statusCode'] == 400
+
+
+def test_get_many_filters():
+    for store in [_memory_store(), _dynamo_store()]:
+        resource = StoreBackedResource[Party](store, PartyCodec, filters)
+        body     = json.loads(_get(resource, {'local': 'true', 'rsvpStage': 'in:not_invited,email_opened'})['body'])
+
+        assert [PartyCodec.decode(item) for item in body['items']] == [parties[0]]
+
+
+def test_get_many_filters_pages():
+    for store in [_memory_store(), _dynamo_store()]:
+        resource = StoreBackedResource[Party](store, PartyCodec, filters)
+        pages    = _pages(resource, 2, local = 'false')
+
+        assert sorted(party for page in pages for party in page) == parties[2:]
+
+
+def test_get_fields():
+    for store in [_memory_store(), _dynamo_store()]:
+        resource = StoreBackedResource[Party](store, PartyCodec, filters)
+        one      = resource({
+            resource.METHOD_FIELD: 'GET',
+            resource.PATH_FIELD  : {'id': 'party1'},
+            resource.QUERY_FIELD : {'fields': 'title,rsvpStage'}
+        }, None)
+        many     = json.loads(_get(resource, {'fields': 'id,rsvpStage', 'local': 'true'})['body'])
+
+        assert json.loads(one['body']) == {'title': parties[1].title, 'rsvpStage': parties[1].rsvp_stage.shows}
+        assert sorted(many['items'], key = lambda item: item['id']) == [
+            {'id': party.id, 'rsvpStage': party.rsvp_stage.shows} for party in parties[:2]
+        ]
+
+
+def test_get_fields_rejects_unknown_fields():
+    resource = StoreBackedResource[Party](_memory_store(), PartyCodec, filters)
+
+    for fields in ['id,guestList', ',']:
+        assert _get(resource, {'fields': fields})['statusCode'] == 400
+
+
+def test_get_many_compressed():
+    many     = [create_party(f'party{i}', guest('John', 'john', f'id{i}')) for i in range(20)]
+    resource = StoreBackedResource[Party](InMemoryStore(lambda party: party.id, PartyCodec.encode, many), PartyCodec)
+
+    response = resource({
+        resource.METHOD_FIELD: 'GET',
+        'headers'            : {'accept-encoding': 'gzip, deflate, br;q=0'}
+    }, None)
+    body = json.loads(gzip.decompress(base64.b64decode(response['body'])))
+
+    assert response['isBase64Encoded']
+    assert response['headers']['Content-Encoding'] == 'gzip'
+    assert response['headers']['Vary'] == 'Accept-Encoding'
+    assert response['headers']['Access-Control-Allow-Origin'] == '*'
+    assert [PartyCodec.decode(item) for item in body['items']] == many
+
+
+def test_get_conditional():
+    store    = _memory_store()
+    resource = StoreBackedResource[Party](store, PartyCodec, filters)
+
+    def get(etag = None, **query):
+        return resource({
+            resource.METHOD_FIELD: 'GET',
+            resource.QUERY_FIELD : query,
+            'headers'            : {'If-None-Match': etag} if etag else None
+        }, None)
+
+    etag = get(local = 'true')['headers']['ETag']
+    assert get(etag, local = 'true')['statusCode'] == 304
+    assert get(etag, local = 'true')['body'] == ''
+    assert get(f'"other", W/{etag}', local = 'true')['statusCode'] == 304
+    assert get(etag, local = 'false')['statusCode'] == 200
+
+    store.put(parties[0]._replace(title = 'Changed'))
+    assert get(etag, local = 'true')['statusCode'] == 200
+
+
+def _post_lines(resource: StoreBackedResource[Party], *lines: str):
+    return resource({
+        resource.METHOD_FIELD: 'POST',
+        'headers'            : {'content-type': 'application/x-ndjson; charset=utf-8'},
+        'body'               : '\n'.join(lines)
+    }, None)
+
+
+def _empty_stores():
+    return [InMemoryStore(lambda party: party.id, PartyCodec.encode), party_store(FakeTable())]
+
+
+def test_post_lines():
+    for store in _empty_stores():
+        resource = StoreBackedResource(store, PartyCodec)
+
+        response = _post_lines(resource, *[json.dumps(PartyCodec.encode(party)) for party in parties[:2]], '')
+
+        assert response['statusCode'] == 201
+        assert json.loads(response['body']) == {'succeeded': ['party0', 'party1'], 'failed': []}
+        assert sorted(store.get_all(), key = lambda party: party.id) == parties[:2]
+
+
+def test_post_lines_skips_invalid_lines():
+    for store in _empty_stores():
+        resource = StoreBackedResource(store, PartyCodec)
+
+        response = _post_lines(
+            resource,
+            json.dumps(PartyCodec.encode(parties[0])),
+            '{"id": "party1", ',
+            '',
+            json.dumps(dissoc(PartyCodec.encode(parties[2]), 'title')),
+            json.dumps(PartyCodec.encode(parties[3])),
+            json.dumps(dict(PartyCodec.encode(parties[4]), rsvpStage = 3))
+        )
+        body = json.loads(response['body'])
+
+        assert response['statusCode'] == 207
+        assert body['succeeded'] == ['party0', 'party3']
+        assert [invalid['line'] for invalid in body['invalid']] == [2, 4, 6]
+        assert 'title' in body['invalid'][1]['error']
+        assert 'rsvpStage' in body['invalid'][2]['error']
+        assert sorted(party.id for party in store.get_all()) == ['party0', 'party3']
+
+
+def _delete(resource: StoreBackedResource[Party], query):
+    return resource({resource.METHOD_FIELD: 'DELETE', resource.QUERY_FIELD: query}, None)
+
+
+def test_delete_many():
+    for store in [_memory_store(), _dynamo_store()]:
+        resource = StoreBackedResource(store, PartyCodec, filters)
+
+        by_ids = _delete(resource, {'ids': 'party0,party4'})
+        assert by_ids['statusCode'] == 200
+        assert sorted(json.loads(by_ids['body'])['succeeded']) == ['party0', 'party4']
+
+        by_filter = _delete(resource, {'local': 'true'})
+        assert by_filter['statusCode'] == 200
+        assert sorted(party.id for party in store.get_all()) == ['party2', 'party3']
+
+
+def test_delete_many_requires_ids_or_filters():
+    store    = _memory_store()
+    resource = StoreBackedResource(store, PartyCodec, filters)
+
+    for query in [None, {'limit': '10'}, {'title': 'The Does'}]:
+        assert _delete(resource, query)['statusCode'] == 400
+    assert len(list(store.get_all())) == len(parties)
+
+
+def test_post_rejects_invalid_body():
+    resource = StoreBackedResource[Party](_memory_store(), PartyCodec, filters)
+    body     = json.dumps(dissoc(PartyCodec.encode(parties[0]), 'title'))
+
+    assert resource({resource.METHOD_FIELD: 'POST', 'body': body}, None)['statusCode'] == 400
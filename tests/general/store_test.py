@@ -0,0 +1,67 @@
+from collections import OrderedDict
+
+import pytest
+
+from wedding.general.filters import Filter
+from wedding.general.model import Json, JsonCodec
+from wedding.general.store import Store, WriteReport, ReadOnlyStore
+
+
+class _JsonStore(Store[str, Json]):
+    """A store that implements only the abstract methods of :obj:`Store`."""
+
+    def __init__(self, *values: Json) -> None:
+        self.values = OrderedDict((value['id'], value) for value in values)
+
+    def get(self, key: str):
+        return self.values.get(key)
+
+    def get_all(self):
+        return list(self.values.values())
+
+    def put(self, value: Json) -> None:
+        self.values[value['id']] = value
+
+    def put_all(self, values):
+        values = list(values)
+        for value in values:
+            self.put(value)
+        return WriteReport([value['id'] for value in values], [])
+
+    def delete(self, key: str) -> None:
+        self.values.pop(key, None)
+
+
+jane = {'id': 'jane', 'capacity': 3, 'available': True}
+john = {'id': 'john', 'capacity': 1, 'available': True}
+joan = {'id': 'joan', 'capacity': 4, 'available': False}
+
+
+def test_find_filters_every_value():
+    store = _JsonStore(jane, john, joan)
+
+    assert list(store.find([Filter('available', 'eq', True), Filter('capacity', 'ge', 2)])) == [jane]
+    assert list(store.find([Filter('id', 'begins_with', 'jo')])) == [john, joan]
+
+
+def test_find_rejects_values_that_are_not_json():
+    class TupleStore(_JsonStore):
+        def get_all(self):
+            return [tuple(value.items()) for value in super().get_all()]
+
+    with pytest.raises(TypeError):
+        list(TupleStore(jane).find([Filter('available', 'eq', True)]))
+
+
+def test_projections_are_read_only():
+    projected = _JsonStore(jane, john).project(['id'], JsonCodec[Json](lambda value: value, lambda value: value))
+
+    assert list(projected.find([Filter('id', 'eq', 'john')])) == [{'id': 'john'}]
+    for write in [
+        lambda: projected.put({'id': 'joan'}),
+        lambda: projected.put_all([{'id': 'joan'}]),
+        lambda: projected.delete('jane'),
+        lambda: projected.delete_all(['jane'])
+    ]:
+        with pytest.raises(ReadOnlyStore):
+            write()
@@ -0,0 +1,108 @@
+import os
+from typing import Optional
+
+import pytest
+
+from wedding.general.template import (
+    TemplateCache, DirectoryTemplateSource, TemplateCacheStats, TemplateSource, TemplateVersion
+)
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _write(directory, name: str, body: str, mtime: int) -> None:
+    path = directory.join(name)
+    path.write(body)
+    os.utime(str(path), (mtime, mtime))
+
+
+def test_caches_within_ttl(tmpdir):
+    clock = Clock()
+    cache = TemplateCache(DirectoryTemplateSource(str(tmpdir)), ttl = 10, clock = clock)
+    _write(tmpdir, 'page.html', 'first', 1000)
+
+    assert cache.get('page.html') == 'first'
+
+    _write(tmpdir, 'page.html', 'second', 2000)
+    clock.now = 9
+
+    assert cache.get('page.html') == 'first'
+    assert cache.stats == TemplateCacheStats(hits = 1, misses = 1, revalidations = 0, refreshes = 0)
+
+
+def test_revalidates_after_ttl(tmpdir):
+    clock = Clock()
+    cache = TemplateCache(DirectoryTemplateSource(str(tmpdir)), ttl = 10, clock = clock)
+    _write(tmpdir, 'page.html', 'first', 1000)
+    resolve = cache.resolver('page.html')
+
+    assert resolve() == 'first'
+
+    clock.now = 10
+    assert resolve() == 'first'
+
+    _write(tmpdir, 'page.html', 'second', 2000)
+    clock.now = 15
+    assert resolve() == 'first'
+
+    clock.now = 20
+    assert resolve() == 'second'
+    assert cache.stats == TemplateCacheStats(hits = 1, misses = 1, revalidations = 2, refreshes = 1)
+
+
+def test_never_revalidates_without_ttl(tmpdir):
+    clock = Clock()
+    cache = TemplateCache(DirectoryTemplateSource(str(tmpdir)), ttl = None, clock = clock)
+    _write(tmpdir, 'page.html', 'first', 1000)
+
+    assert cache.get('page.html') == 'first'
+
+    _write(tmpdir, 'page.html', 'second', 2000)
+    clock.now = 1e9
+
+    assert cache.get('page.html') == 'first'
+    assert cache.stats.revalidations == 0
+
+
+class FlakySource(TemplateSource):
+    """A source that serves one version of every template, then fails."""
+
+    def __init__(self) -> None:
+        self.fetches = 0
+
+    def fetch(self, key: str, current: Optional[TemplateVersion]) -> Optional[TemplateVersion]:
+        self.fetches += 1
+        if self.fetches > 1:
+            raise IOError(f'{key} is unavailable')
+        return TemplateVersion(body = f'{key} body', etag = '"1"', last_modified = None)
+
+
+def test_serves_cached_template_when_revalidation_fails():
+    clock  = Clock()
+    source = FlakySource()
+    cache  = TemplateCache(source, ttl = 10, clock = clock)
+
+    assert cache.get('page.html') == 'page.html body'
+
+    clock.now = 10
+    assert cache.get('page.html') == 'page.html body'
+    assert source.fetches == 2
+
+    clock.now = 15
+    assert cache.get('page.html') == 'page.html body'
+    assert source.fetches == 2
+    assert cache.stats == TemplateCacheStats(hits = 1, misses = 1, revalidations = 1, refreshes = 0)
+
+
+def test_raises_when_uncached_template_cannot_be_fetched():
+    source = FlakySource()
+    source.fetches = 1
+
+    with pytest.raises(IOError):
+        TemplateCache(source, ttl = 10, clock = Clock()).get('page.html')
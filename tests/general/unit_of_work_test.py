@@ -0,0 +1,79 @@
+from tests.data_generators import create_party, guest
+from tests.general.aws.fake_table import FakeTable
+from wedding.model import party_store, PartyUnitOfWork, CardClicked, EmailOpened
+
+
+does   = create_party('does'  , guest('John', 'john', 'id1'))
+smiths = create_party('smiths', guest('Jane', 'jane', 'id2'))
+
+
+def _table() -> FakeTable:
+    table   = FakeTable()
+    parties = party_store(table)
+    parties.put(does)
+    parties.put(smiths)
+    table.requests.clear()
+    return table
+
+
+def _operations(table: FakeTable):
+    return [operation for operation, _ in table.requests]
+
+
+def test_reads_each_key_once():
+    table = _table()
+    with PartyUnitOfWork(party_store(table)) as parties:
+        assert parties.get(does.id) == does
+        assert parties.get(does.id) == does
+        assert parties.get('nobody') is None
+        assert parties.get('nobody') is None
+        assert sorted(p.id for p in parties.get_many([does.id, smiths.id])) == [does.id, smiths.id]
+
+    assert _operations(table) == ['GetItem', 'GetItem', 'BatchGetItem']
+
+
+def test_queues_writes_until_flush():
+    table = _table()
+    with PartyUnitOfWork(party_store(table)) as parties:
+        renamed = parties.modify(does.id, lambda party: party._replace(title = 'The Does'))
+        renamed = parties.modify(does.id, lambda party: party._replace(local = False))
+        parties.delete(smiths.id)
+
+        assert parties.get(does.id) == renamed
+        assert parties.get(smiths.id) is None
+        assert _operations(table) == ['GetItem']
+
+    assert _operations(table) == ['GetItem', 'UpdateItem', 'DeleteItem']
+    assert party_store(table).get(does.id) == renamed
+    assert party_store(table).get(smiths.id) is None
+
+
+def test_reapplies_changes_after_concurrent_write():
+    table = _table()
+    with PartyUnitOfWork(party_store(table)) as parties:
+        parties.modify(does.id, lambda party: party._replace(title = party.title + '!'))
+        party_store(table).modify(does.id, lambda party: party._replace(title = 'Someone Else'))
+
+    assert party_store(table).get(does.id).title == 'Someone Else!'
+
+
+def test_advance():
+    table = _table()
+    with PartyUnitOfWork(party_store(table)) as parties:
+        assert parties.advance(does.id, CardClicked).rsvp_stage == CardClicked
+        assert parties.advance(does.id, EmailOpened).rsvp_stage == CardClicked
+        assert parties.get(does.id).rsvp_stage == CardClicked
+
+    assert _operations(table) == ['UpdateItem']
+
+
+def test_does_not_flush_on_error():
+    table = _table()
+    try:
+        with PartyUnitOfWork(party_store(table)) as parties:
+            parties.delete(does.id)
+            raise ValueError()
+    except ValueError:
+        pass
+
+    assert party_store(table).get(does.id) == does
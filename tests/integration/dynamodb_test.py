@@ -11,6 +11,7 @@ from tests.data_generators import create_party, guest
 table = boto3.resource('dynamodb').Table('Parties')
 store = DynamoDbStore[str, Party](
     table,
+    lambda party: party.id,
     JsonEncoder[str](lambda i: {'id': i}),
     PartyCodec
 )
@@ -0,0 +1,53 @@
+from tests.data_generators import create_party, guest
+from tests.general.aws.fake_table import FakeTable
+from wedding.invitation import InvitationHandler, EnvelopeImageHandler
+from wedding.model import party_store, CardClicked, EmailOpened
+
+
+party = create_party('does', guest('John', 'john', 'id1'))
+
+
+def _parties(table: FakeTable):
+    parties = party_store(table)
+    parties.put(party)
+    table.requests.clear()
+    return parties
+
+
+def test_invitation_advances_and_renders_in_one_request():
+    table   = FakeTable()
+    handler = InvitationHandler(lambda: '{{partyId}}/{{guestId}}', '/500.html', _parties(table))
+
+    response = handler({'partyId': party.id, 'guestId': 'id1'}, None)
+
+    assert response['statusCode'] == 200
+    assert response['body'] == 'does/id1'
+    assert [operation for operation, _ in table.requests] == ['UpdateItem']
+    assert party_store(table).get(party.id).rsvp_stage == CardClicked
+
+
+def test_invitation_unknown_party():
+    handler = InvitationHandler(lambda: '', '/500.html', _parties(FakeTable()))
+
+    assert handler({'partyId': 'nobody', 'guestId': 'id1'}, None)['statusCode'] == 302
+
+
+def test_envelope():
+    table   = FakeTable()
+    handler = EnvelopeImageHandler('http://envelopes', _parties(table))
+
+    assert handler({'partyId': 'does.png'}, None) == {'location': 'http://envelopes/does.png'}
+    assert party_store(table).get(party.id).rsvp_stage == EmailOpened
+
+
+def test_invitation_not_modified_still_advances():
+    table   = FakeTable()
+    handler = InvitationHandler(lambda: '{{partyId}}/{{guestId}}', '/500.html', _parties(table))
+    event   = {'partyId': party.id, 'guestId': 'id1'}
+
+    etag     = handler(event, None)['headers']['ETag']
+    response = handler(dict(event, headers = {'If-None-Match': etag}), None)
+
+    assert (response['statusCode'], response['body']) == (304, '')
+    assert handler(dict(event, guestId = 'id2', headers = {'If-None-Match': etag}), None)['statusCode'] == 200
+    assert [operation for operation, _ in table.requests].count('UpdateItem') == 3
@@ -1,4 +1,7 @@
+from botocore.exceptions import ParamValidationError
+
 from tests.data_generators import guest, create_party
+from tests.general.aws.fake_table import FakeTable
 from wedding.model import *
 
 
@@ -58,9 +61,7 @@ def test_set_new_guest():
 
     with_jerry = set_guest(jerry)(party)
 
-    assert jerry in with_jerry.guests
-    assert john  in with_jerry.guests
-    assert jane  in with_jerry.guests
+    assert with_jerry.guests == [john, jane, jerry]
 
 
 def test_modify_guest():
@@ -107,3 +108,88 @@ def test_advance_stage_party():
     _test(EmailOpened  , [NotInvited , EmailSent]  , [CardClicked, RsvpSubmitted                ])
     _test(CardClicked  , [NotInvited , EmailSent   , EmailOpened], [RsvpSubmitted               ])
     _test(RsvpSubmitted, [NotInvited , EmailSent   , EmailOpened , CardClicked]  ,             [])
+
+
+def test_dynamodb_advance():
+    table  = FakeTable()
+    store  = party_store(table)
+    store.put(party._replace(rsvp_stage = EmailOpened))
+    table.requests.clear()
+
+    assert store.advance(party.id, CardClicked).rsvp_stage == CardClicked
+    assert [operation for operation, _ in table.requests] == ['UpdateItem']
+
+    table.requests.clear()
+    assert store.advance(party.id, EmailSent) == party._replace(rsvp_stage = CardClicked)
+    assert [operation for operation, _ in table.requests] == ['UpdateItem']
+
+    assert store.get(party.id).rsvp_stage == CardClicked
+    assert store.advance('nobody', CardClicked) is None
+    assert 'nobody' not in table.items
+
+
+class _OldSdkTable(FakeTable):
+    def update_item(self, **args):
+        if 'ReturnValuesOnConditionCheckFailure' in args:
+            raise ParamValidationError(report = 'Unknown parameter in input: "ReturnValuesOnConditionCheckFailure"')
+        return super().update_item(**args)
+
+
+def test_dynamodb_advance_with_sdk_without_return_values_on_failure():
+    table = _OldSdkTable()
+    store = party_store(table)
+    store.put(party._replace(rsvp_stage = CardClicked))
+    table.requests.clear()
+
+    assert store.advance(party.id, EmailSent).rsvp_stage == CardClicked
+    assert store.advance(party.id, RsvpSubmitted).rsvp_stage == RsvpSubmitted
+    assert [operation for operation, _ in table.requests] == ['UpdateItem', 'GetItem', 'UpdateItem']
+
+
+def test_guests_by_id():
+    assert list(guests_by_id(party).items()) == [(john.id, john), (jane.id, jane)]
+
+
+def test_modify_guests():
+    family = create_party('family', john, jane, jerry)
+    modified = modify_guests(
+        {
+            jane.id : lambda g: g._replace(attending = True),
+            jerry.id: lambda g: g._replace(first_name = 'Jer'),
+            'nobody': lambda g: g._replace(first_name = 'Nobody')
+        },
+        family
+    )
+
+    assert modified.guests == [john, jane._replace(attending = True), jerry._replace(first_name = 'Jer')]
+
+
+def test_modify_every_guest():
+    family   = create_party('family', john, jane, jerry)
+    modified = modify_guests(lambda g: g._replace(attending = g.id != jane.id), family)
+
+    assert modified.guests == [
+        john._replace(attending = True), jane._replace(attending = False), jerry._replace(attending = True)
+    ]
+
+
+def test_set_existing_guest_keeps_order():
+    renamed = john._replace(first_name = 'Joe')
+    assert set_guest(renamed)(party).guests == [renamed, jane]
+
+
+def test_compiled_party_codec_matches_marshmallow():
+    strict  = codec(PartySchema(strict=True), compiled=False)
+    parties = [
+        create_party('party{}'.format(i), *[guest('Guest', maybe_username, 'id{}'.format(j)) for j in range(i % 4)])
+        ._replace(rsvp_stage = stage)
+        for i, (maybe_username, stage) in enumerate(
+            (maybe_username, stage) for maybe_username in ['guest', None] for stage in RsvpStages
+        )
+    ]
+
+    for p in parties:
+        as_json = strict.encode(p)
+        assert PartyCodec.encode(p) == as_json
+        assert PartyCodec.decode(as_json) == strict.decode(as_json) == p
+        assert PartyCodec.decode(dict(as_json, rsvpStage = p.rsvp_stage.shows.upper())) == p
@@ -1,4 +1,11 @@
-from wedding.rsvp import RsvpFormData, RideShareFormData
+import base64
+import gzip
+from logging import getLogger
+
+from tests.data_generators import create_party, guest
+from tests.general.aws.fake_table import FakeTable
+from wedding.model import party_store, modify_guest
+from wedding.rsvp import RsvpFormData, RideShareFormData, RsvpHandler, ThankYouHandler
 
 
 expected_party     = 'someparty'
@@ -28,3 +35,48 @@ def test_rideshare_form_parse():
     assert form.rideshare == expected_rideshare
     assert form.party_id == expected_party
     assert form.guest_id == expected_guest
+
+
+def test_thank_you_page_is_compressed_once_per_template():
+    templates = ['{{homepageUrl}}' + 'x' * 2000]
+    handler   = ThankYouHandler(lambda: templates[-1], '/home')
+    event     = {'headers': {'Accept-Encoding': 'gzip'}}
+
+    first = handler(event, None)
+    assert first['isBase64Encoded']
+    assert gzip.decompress(base64.b64decode(first['body'])).decode('utf-8') == '/home' + 'x' * 2000
+    assert handler(event, None)['body'] is first['body']
+
+    templates.append('{{homepageUrl}}' + 'y' * 2000)
+    assert handler(event, None)['body'] != first['body']
+    assert handler({'firstName': 'John'}, None)['body'] == '/home' + 'y' * 2000
+
+
+def test_rsvp_page_not_modified_until_party_changes():
+    table   = FakeTable()
+    parties = party_store(table)
+    parties.put(create_party('does', guest('John', 'john', 'id1')))
+    handler = RsvpHandler(lambda: '{{#guests}}{{firstName}}{{/guests}}', '', '', '/500.html', parties, getLogger())
+    event   = {'partyId': 'does', 'guestId': 'id1', 'httpMethod': 'GET'}
+
+    first = handler(event, None)
+    etag  = first['headers']['ETag']
+    assert first['body'] == 'John'
+    assert handler(dict(event, headers = {'If-None-Match': etag}), None)['statusCode'] == 304
+
+    parties.modify('does', modify_guest('id1', lambda g: g._replace(first_name = 'Jon')))
+    assert handler(dict(event, headers = {'If-None-Match': etag}), None)['body'] == 'Jon'
+
+
+def test_warm_up_prefetches_template_without_handling():
+    fetched = []
+    table   = FakeTable()
+    handler = RsvpHandler(lambda: fetched.append('rsvp') or '', '', '', '/500.html', party_store(table), getLogger())
+    warmup  = {'source': 'aws.events', 'detail-type': 'Scheduled Event'}
+
+    assert handler(warmup, None)['warmup']
+    assert fetched == []
+
+    assert handler({'warmup': True, 'prefetch': True}, None)['warmup']
+    assert fetched == ['rsvp']
+    assert table.requests == []
@@ -1,60 +1,641 @@
-from typing import TypeVar, Optional, Iterable
+import base64
+import binascii
+import json
+import random
+import threading
+import time
+from collections import deque, OrderedDict
+from queue import Queue, Full
+from concurrent.futures import ThreadPoolExecutor
+from functools import reduce
+from operator import and_
+from typing import TypeVar, Optional, Iterable, Iterator, Tuple, Dict, Callable, Sequence, List
 
-from botocore.exceptions import ValidationError, ClientError
+from boto3.dynamodb.conditions import Attr, Key, ConditionBase
+from boto3.dynamodb.types import TypeSerializer, TypeDeserializer
+from botocore.exceptions import ClientError, ParamValidationError
+from marshmallow.exceptions import MarshmallowError
+from toolz.dicttoolz import merge, dissoc
+from toolz.itertoolz import partition_all, unique, concat
 
-from wedding.general.model import JsonEncoder, JsonCodec
-from wedding.general.store import Store
+from wedding.general import metrics
+from wedding.general.filters import Filter
+from wedding.general.model import JsonEncoder, JsonCodec, Json
+from wedding.general.store import Store, WriteReport, Page, InvalidCursor, ReadOnlyStore
 from wedding.general.functional import option
 
 K = TypeVar('K')
 V = TypeVar('V')
 T = TypeVar('T')
+R = TypeVar('R')
+
+
+_END_OF_SEGMENT = object()
+
+
+def _bounded_map(f: Callable[[T], R], ts: Iterable[T], workers: int) -> Iterator[R]:
+    """Lazily map `f` over `ts`, using up to `workers` threads, yielding results in order.
+
+    At most `workers` calls are in flight at a time, so `ts` is consumed only as fast as results are.
+    """
+    if workers <= 1:
+        yield from map(f, ts)
+        return
+
+    with ThreadPoolExecutor(max_workers = workers) as executor:
+        pending = deque()
+        for t in ts:
+            pending.append(executor.submit(f, t))
+            if len(pending) >= workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _update_expression(values  : Json,
+                       removals: Sequence[str]) -> Tuple[str, Dict[str, str], Json]:
+    # boto3 generates '#n<i>' and ':v<i>' placeholders for condition objects, so use different prefixes here
+    names        = merge(
+        {f'#u{i}': name for i, name in enumerate(values.keys())},
+        {f'#r{i}': name for i, name in enumerate(removals     )}
+    )
+    placeholders = {f':u{i}': value for i, value in enumerate(values.values())}
+    clauses      = [
+        f'SET {", ".join(f"#u{i} = :u{i}" for i in range(len(values)))}' if values   else None,
+        f'REMOVE {", ".join(f"#r{i}" for i in range(len(removals)))}'    if removals else None
+    ]
+    return ' '.join(filter(None, clauses)), names, placeholders
+
+
+def _unchanged(name: str, item: Json) -> ConditionBase:
+    return (
+        Attr(name).not_exists()                                     if name not in item   else
+        Attr(name).not_exists() | Attr(name).attribute_type('NULL') if item[name] is None else
+        Attr(name).eq(item[name])
+    )
+
+
+def _encode_cursor(key: Json) -> str:
+    typed = {name: TypeSerializer().serialize(value) for name, value in key.items()}
+    return base64.urlsafe_b64encode(json.dumps(typed, sort_keys = True).encode('utf-8')).decode('ascii')
+
+
+def _decode_cursor(cursor: str, key_names: Sequence[str]) -> Json:
+    try:
+        typed = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+        key   = {name: TypeDeserializer().deserialize(value) for name, value in typed.items()}
+    except (binascii.Error, UnicodeError, ValueError, TypeError, AttributeError, KeyError):
+        raise InvalidCursor(cursor)
+    # The keys of pages read from an index also hold the index's key attributes
+    if not set(key_names) <= set(key):
+        raise InvalidCursor(cursor)
+    return key
+
+
+_FILTER_CONDITIONS = {
+    'eq'         : lambda attr, value: attr.eq(value),
+    'ne'         : lambda attr, value: attr.ne(value),
+    'lt'         : lambda attr, value: attr.lt(value),
+    'le'         : lambda attr, value: attr.lte(value),
+    'gt'         : lambda attr, value: attr.gt(value),
+    'ge'         : lambda attr, value: attr.gte(value),
+    'in'         : lambda attr, value: attr.is_in(value),
+    'begins_with': lambda attr, value: attr.begins_with(value)
+}
+_KEY_CONDITIONS = dissoc(_FILTER_CONDITIONS, 'ne', 'in')
+
+
+def _filter_expression(filters: Sequence[Filter]) -> ConditionBase:
+    return reduce(and_, [_FILTER_CONDITIONS[f.operator](Attr(f.name), f.value) for f in filters])
+
+
+def _read_only(_: Json) -> Json:
+    raise ReadOnlyStore('Projected stores are read-only')
+
+
+def _error_code(exc: ClientError) -> Optional[str]:
+    return exc.response.get('Error', {}).get('Code')
+
+
+def _is_conditional_check_failure(exc: ClientError) -> bool:
+    return _error_code(exc) == 'ConditionalCheckFailedException'
+
+
+def _merge_reports(reports: Iterable[WriteReport]) -> WriteReport:
+    succeeded, failed = [], []
+    for report in reports:
+        succeeded.extend(report.succeeded)
+        failed   .extend(report.failed   )
+    return WriteReport(succeeded, failed)
 
 
 class DynamoDbStore(Store[K, V]):
     """Data-store that uses AWS Dynamo DB."""
 
+    MODIFY_ATTEMPTS  = 5
+    BATCH_GET_SIZE   = 100
+    BATCH_WRITE_SIZE = 25
+    BATCH_ATTEMPTS   = 8
+    BACKOFF_BASE     = 0.05
+    BACKOFF_CAP      = 2.0
+    SCAN_PREFETCH    = 2
+    RETRYABLE_ERRORS = frozenset([
+        'ProvisionedThroughputExceededException',
+        'ThrottlingException',
+        'RequestLimitExceeded',
+        'InternalServerError'
+    ])
+
     def __init__(self,
-                 dynamo_table                ,
-                 key_encoder : JsonEncoder[K],
-                 value_codec : JsonCodec  [V]) -> None:
-        self.__table      = dynamo_table
-        self.__encode_key = key_encoder
-        self.__val        = value_codec
+                 dynamo_table                     ,
+                 key_of       : Callable[[V], K],
+                 key_encoder  : JsonEncoder[K]   ,
+                 value_codec  : JsonCodec  [V]   ,
+                 workers      : int                     = 1,
+                 scan_segments: Optional[int]           = None,
+                 trusted      : bool                    = False,
+                 projection   : Optional[Sequence[str]] = None) -> None:
+        """Create a new instance of the :obj:`DynamoDbStore` class.
+
+        Args:
+            dynamo_table: The boto3 DynamoDB `Table` resource to store values in.
+            key_of: Function that gets the key of a value, to report the keys of the values :meth:`put_all` writes.
+            key_encoder: Encodes keys into DynamoDB primary keys.
+            value_codec: Encodes and decodes values to and from DynamoDB items.
+            workers: The number of threads used to issue the requests of batch operations concurrently.
+                With more than one worker, :meth:`get_all` performs a parallel scan.
+            scan_segments: The number of segments a parallel scan divides the table into. Defaults to `workers`.
+            trusted: Whether items read from the table are decoded with :meth:`JsonCodec.decode_trusted`. Only use this
+                when everything that writes to the table encodes items with `value_codec`.
+            projection: The names of the only attributes to read, for stores made by :meth:`project`.
+        """
+        self.__table         = dynamo_table
+        self.__key_of        = key_of
+        self.__encode_key    = key_encoder
+        self.__val           = value_codec
+        self.__decoder       = value_codec.decode_trusted if trusted else value_codec.decode
+        self.__workers       = workers
+        self.__scan_segments = scan_segments or workers
+        self.__key_names     = None
+        self.__indexes       = None
+        self.__projection    = projection
+        self.__returns_old   = True
+
+    def __backoff(self, attempt: int) -> None:
+        time.sleep(random.uniform(0, min(self.BACKOFF_CAP, self.BACKOFF_BASE * 2 ** attempt)))
+
+    @staticmethod
+    def __request(operation: str, send: Callable[..., Json], **args) -> Json:
+        with metrics.timer(f'DynamoDb.{operation}'):
+            return send(**args)
+
+    def __decode(self, item: Json) -> V:
+        with metrics.timer('Decode'):
+            return self.__decoder(item)
+
+    def __decode_all(self, items: List[Json]) -> List[V]:
+        with metrics.timer('Decode'):
+            return [self.__decoder(item) for item in items]
+
+    def __projection_args(self) -> Json:
+        # boto3 adds the names of condition objects to the request's ExpressionAttributeNames, so always build new ones
+        if self.__projection is None:
+            return {}
+        return {
+            'ProjectionExpression'    : ', '.join(f'#p{i}' for i in range(len(self.__projection))),
+            'ExpressionAttributeNames': {f'#p{i}': name for i, name in enumerate(self.__projection)}
+        }
+
+    def __get_item(self, key: K) -> Optional[Json]:
+        return self.__request(
+            'GetItem',
+            self.__table.get_item,
+            Key = self.__encode_key(key),
+            **self.__projection_args()
+        ).get('Item')
 
     def get(self, key: K) -> Optional[V]:
-        return option.fmap(self.__val.decode)(
-            self.__table.get_item(Key = self.__encode_key(key)).get('Item')
+        return option.fmap(self.__decode)(self.__get_item(key))
+
+    def __batch_get(self, keys: List[Json]) -> List[V]:
+        table_name = self.__table.name
+        request    = {table_name: merge({'Keys': keys}, self.__projection_args())}
+        items      = []
+
+        for attempt in range(self.BATCH_ATTEMPTS):
+            if attempt > 0:
+                self.__backoff(attempt)
+
+            response = self.__request('BatchGetItem', self.__table.meta.client.batch_get_item, RequestItems = request)
+            items.extend(response.get('Responses', {}).get(table_name, []))
+            request  = response.get('UnprocessedKeys')
+
+            if not request:
+                return self.__decode_all(items)
+
+        raise RuntimeError(
+            f'DynamoDB left {len(request[table_name]["Keys"])} keys unprocessed '
+            f'after {self.BATCH_ATTEMPTS} attempts: {request[table_name]["Keys"]}'
         )
 
-    def get_all(self) -> Iterable[V]:
+    def get_many(self, keys: Iterable[K]) -> Iterable[V]:
+        """Get the values with the given keys using `BatchGetItem`, 100 keys per request.
+
+        Values are yielded a batch at a time, and batches are requested concurrently when the store has more than
+        one worker. Keys that DynamoDB leaves unprocessed are retried with exponential backoff.
+        """
+        batches = (
+            [self.__encode_key(key) for key in batch]
+            for batch in partition_all(self.BATCH_GET_SIZE, unique(keys))
+        )
+        return concat(_bounded_map(self.__batch_get, batches, self.__workers))
+
+    def __read_page(self, read: Callable[..., Json], **read_args) -> Json:
+        return self.__request('Query' if 'KeyConditionExpression' in read_args else 'Scan', read, **read_args)
+
+    def __pages(self, read: Callable[..., Json], **read_args) -> Iterator[List[Json]]:
         get_more = True
         maybe_last_key = None
 
         while get_more:
             response = option.cata(
-                lambda last_key: self.__table.scan(ExclusiveStartKey = last_key),
-                self.__table.scan
+                lambda last_key: self.__read_page(read, ExclusiveStartKey = last_key, **read_args),
+                lambda: self.__read_page(read, **read_args)
             )(maybe_last_key)
 
             maybe_last_key = response.get('LastEvaluatedKey')
             get_more = maybe_last_key is not None
 
-            for item in map(self.__val.decode, response.get('Items', [])):
+            yield response.get('Items', [])
+
+    def __parallel_scan_pages(self, **scan_args) -> Iterator[List[Json]]:
+        total   = self.__scan_segments
+        # Every segment feeds one shared queue, so pages are yielded as soon as any segment reads them
+        pages   = Queue(maxsize = self.SCAN_PREFETCH * self.__workers)
+        stopped = threading.Event()
+
+        def offer(page) -> bool:
+            while not stopped.is_set():
+                try:
+                    pages.put(page, timeout = 0.1)
+                    return True
+                except Full:
+                    pass
+            return False
+
+        def scan_segment(segment: int) -> None:
+            if stopped.is_set():
+                return
+            try:
+                for page in self.__pages(self.__table.scan, Segment = segment, TotalSegments = total, **scan_args):
+                    if not offer(page):
+                        return
+                offer(_END_OF_SEGMENT)
+            except Exception as exc:
+                offer(exc)
+
+        with ThreadPoolExecutor(max_workers = self.__workers) as executor:
+            for segment in range(total):
+                executor.submit(scan_segment, segment)
+            try:
+                finished = 0
+                while finished < total:
+                    page = pages.get()
+                    if page is _END_OF_SEGMENT:
+                        finished += 1
+                    elif isinstance(page, Exception):
+                        raise page
+                    else:
+                        yield page
+            finally:
+                stopped.set()
+
+    def __key_schemas(self) -> List[Tuple[Optional[str], Dict[str, str]]]:
+        """The key schema of the table and of each index that projects every attribute, by index name."""
+        if self.__indexes is None:
+            table   = self.__table
+            indexes = [
+                index
+                for index in concat([table.global_secondary_indexes or [], table.local_secondary_indexes or []])
+                if index.get('Projection', {}).get('ProjectionType') == 'ALL'
+            ]
+            self.__indexes = [
+                (name, {key['KeyType']: key['AttributeName'] for key in key_schema})
+                for name, key_schema in
+                [(None, self.__table.key_schema)] + [(index['IndexName'], index['KeySchema']) for index in indexes]
+            ]
+        return self.__indexes
+
+    def __read(self, filters: Sequence[Filter]) -> Tuple[Callable[..., Json], Json]:
+        """Choose how to read the values that satisfy `filters`.
+
+        If the table or an index has a hash key that a filter compares for equality, the values are read with a
+        `Query`, which also uses a filter on the range key where it can. Otherwise they are read with a `Scan`. Any
+        remaining filters become the `FilterExpression`.
+        """
+        for index_name, keys in self.__key_schemas():
+            hash_filter = next((f for f in filters if f.name == keys['HASH'] and f.operator == 'eq'), None)
+            if hash_filter is None:
+                continue
+
+            key_condition = Key(hash_filter.name).eq(hash_filter.value)
+            rest          = [f for f in filters if f is not hash_filter]
+            range_filter  = next(
+                (f for f in rest if f.name == keys.get('RANGE') and f.operator in _KEY_CONDITIONS),
+                None
+            )
+            if range_filter is not None:
+                key_condition &= _KEY_CONDITIONS[range_filter.operator](Key(range_filter.name), range_filter.value)
+                rest           = [f for f in rest if f is not range_filter]
+
+            return self.__table.query, merge(
+                {'KeyConditionExpression': key_condition},
+                {'IndexName': index_name} if index_name is not None else {},
+                {'FilterExpression': _filter_expression(rest)} if rest else {},
+                self.__projection_args()
+            )
+
+        return self.__table.scan, merge(
+            {'FilterExpression': _filter_expression(filters)} if filters else {},
+            self.__projection_args()
+        )
+
+    def get_all(self) -> Iterable[V]:
+        """Get every value in the table.
+
+        With more than one worker the table is read with a parallel scan, and values are yielded in no particular
+        order: each page is yielded as soon as any segment has read it. Pages are buffered in a queue bounded to
+        :attr:`SCAN_PREFETCH` pages per worker, so a slow consumer pauses the scan instead of the whole table being
+        buffered.
+        """
+        return self.find(())
+
+    def find(self, filters: Sequence[Filter]) -> Iterable[V]:
+        """Get every value that satisfies `filters`, evaluated by DynamoDB.
+
+        The values are read with a `Query` where an index allows it, and otherwise with a `Scan` that is parallel
+        when the store has more than one worker; see :meth:`get_all`.
+        """
+        read, read_args = self.__read(filters)
+        parallel        = 'KeyConditionExpression' not in read_args and self.__scan_segments > 1
+        pages           = (
+            self.__parallel_scan_pages(**read_args) if parallel else
+            self.__pages(read, **read_args)
+        )
+        for page in pages:
+            for item in self.__decode_all(page):
                 yield item
 
-    def put(self, value: V) -> None:
-        self.__table.put_item(Item = self.__val.encode(value))
+    def get_page(self,
+                 limit  : Optional[int]    = None,
+                 cursor : Optional[str]    = None,
+                 filters: Sequence[Filter] = ()) -> Page:
+        """Get one page of the values that satisfy `filters` with a single `Scan` or `Query` request.
 
-    def put_all(self, values: Iterable[V]) -> None:
+        `limit` becomes the request's `Limit` and `cursor` encodes its `ExclusiveStartKey`, so reading a page costs the
+        same however far into the table it is. DynamoDB applies `limit` before it applies filters, and can end a page
+        early, so a page may hold fewer than `limit` values even if it is not the last.
+        """
+        read, read_args = self.__read(filters)
+        read_args = merge(
+            read_args,
+            {'Limit': limit} if limit is not None else {},
+            {'ExclusiveStartKey': _decode_cursor(cursor, self.__key_attribute_names())} if cursor is not None else {}
+        )
         try:
-            with self.__table.batch_writer() as batch:
-                for v in values:
-                    batch.put_item(Item = self.__val.encode(v))
-        except ValidationError as exc:
-            raise RuntimeError(f'DynamoDB failed to put {list(values)}: {str(exc)}')
+            response = self.__read_page(read, **read_args)
         except ClientError as exc:
-            raise RuntimeError(f'DynamoDB failed to put {list(values)}: {str(exc)}')
+            if cursor is not None and _error_code(exc) == 'ValidationException':
+                raise InvalidCursor(cursor)
+            raise
+
+        return Page(
+            self.__decode_all(response.get('Items', [])),
+            option.fmap(_encode_cursor)(response.get('LastEvaluatedKey'))
+        )
+
+    def project(self, names: Sequence[str], codec: JsonCodec[V]) -> 'DynamoDbStore[K, Json]':
+        """Get a read-only view of this store that reads only the attributes named `names`.
+
+        Every read of the view sends `names` as a `ProjectionExpression`, so DynamoDB returns, and charges for, only
+        those attributes. Items are converted with :meth:`JsonCodec.reencode_partial`.
+        """
+        return DynamoDbStore[K, Json](
+            self.__table,
+            _read_only,
+            self.__encode_key,
+            JsonCodec[Json](_read_only, lambda item: codec.reencode_partial(item, names)),
+            self.__workers,
+            self.__scan_segments,
+            projection = names
+        )
+
+    def __update_item(self, return_old: bool, **args) -> Json:
+        if return_old and self.__returns_old:
+            try:
+                return self.__request(
+                    'UpdateItem',
+                    self.__table.update_item,
+                    ReturnValuesOnConditionCheckFailure = 'ALL_OLD',
+                    **args
+                )
+            except ParamValidationError:
+                # SDKs released before DynamoDB supported the parameter reject it without sending the request
+                self.__returns_old = False
+        return self.__request('UpdateItem', self.__table.update_item, **args)
+
+    def __failed_update(self, key: K, exc: ClientError, return_current: bool) -> Optional[V]:
+        if not return_current:
+            return None
+        if not self.__returns_old:
+            return self.get(key)
+        # The item of a failed request is not deserialized by the Table resource
+        return option.fmap(
+            lambda item: self.__decode({name: TypeDeserializer().deserialize(value) for name, value in item.items()})
+        )(exc.response.get('Item'))
+
+    def update(self,
+               key           : K,
+               values        : Json,
+               condition     : Optional[ConditionBase] = None,
+               removals      : Sequence[str]           = (),
+               return_current: bool                    = False) -> Optional[V]:
+        """Set attributes of an existing item with a single conditional `UpdateItem` request.
+
+        Args:
+            key: The key of the item to update.
+            values: Encoded attribute values to set, keyed by attribute name.
+            condition: An optional condition the stored item must satisfy for the update to be applied.
+            removals: Names of attributes to remove from the item.
+            return_current: Whether to return the stored value, rather than `None`, if `condition` is not satisfied.
+                DynamoDB returns it with the failed request, so it is not read with another request.
+
+        Returns:
+            The updated value, or `None` if no item with key `key` exists or if `condition` was not satisfied,
+            in which case nothing is written.
+        """
+        encoded_key = self.__encode_key(key)
+        expression, names, placeholders = _update_expression(values, removals)
+
+        try:
+            response = self.__update_item(
+                return_current,
+                Key                       = encoded_key,
+                UpdateExpression          = expression,
+                ConditionExpression       = reduce(
+                    lambda a, b: a & b,
+                    [Attr(name).exists() for name in encoded_key] + ([condition] if condition else [])
+                ),
+                ExpressionAttributeNames  = names,
+                ReturnValues              = 'ALL_NEW',
+                **({'ExpressionAttributeValues': placeholders} if placeholders else {})
+            )
+        except ClientError as exc:
+            if _is_conditional_check_failure(exc):
+                return self.__failed_update(key, exc, return_current)
+            raise
+
+        return self.__decode(response['Attributes'])
+
+    def __write_changes(self, key: K, item: Json, old: Json, new: Json) -> bool:
+        changed = {name: value for name, value in new.items() if name not in old or old[name] != value}
+        removed = [name for name in old if name not in new]
+
+        if not changed and not removed:
+            return True
+        if any(name in changed for name in self.__encode_key(key)):
+            self.__request('PutItem', self.__table.put_item, Item = new)
+            return True
+
+        return self.update(
+            key,
+            changed,
+            reduce(lambda a, b: a & b, [_unchanged(name, item) for name in list(changed) + removed]),
+            removed
+        ) is not None
+
+    def replace(self, key: K, expected: V, value: V) -> bool:
+        """Replace a stored value by writing only the attributes that differ from `expected`.
+
+        Nothing is read. The write is conditioned on the changed attributes still holding the values of `expected`,
+        and nothing is written if no attribute changed.
+        """
+        old = self.__val.encode(expected)
+        return self.__write_changes(key, old, old, self.__val.encode(value))
+
+    def modify(self, key: K, transform: Callable[[V], V]) -> Optional[V]:
+        """Transform a stored value, writing back only the attributes that changed.
+
+        The encoded value before and after `transform` is compared attribute by attribute. Nothing is written if no
+        attribute changed. Otherwise only the changed attributes are written, on the condition that they still hold
+        the values that were read; if another writer changed them in the meantime the whole modification is retried.
+        """
+        for _ in range(self.MODIFY_ATTEMPTS):
+            item = self.__get_item(key)
+            if item is None:
+                return None
+
+            before = self.__decode(item)
+            after  = transform(before)
+
+            if self.__write_changes(key, item, self.__val.encode(before), self.__val.encode(after)):
+                return after
+
+        raise RuntimeError(f'DynamoDB item {key} was modified concurrently {self.MODIFY_ATTEMPTS} times in a row')
+
+    def put(self, value: V) -> None:
+        self.__request('PutItem', self.__table.put_item, Item = self.__val.encode(value))
+
+    def warm(self) -> None:
+        """Read the table's description, which opens a connection to DynamoDB and caches the key schema."""
+        self.__key_attribute_names()
+        self.__key_schemas()
+
+    def __key_attribute_names(self) -> List[str]:
+        if self.__key_names is None:
+            self.__key_names = [key['AttributeName'] for key in self.__table.key_schema]
+        return self.__key_names
+
+    def __request_key(self, request: Json) -> Json:
+        item = request['PutRequest']['Item'] if 'PutRequest' in request else request['DeleteRequest']['Key']
+        return {name: item[name] for name in self.__key_attribute_names()}
+
+    def __write_batch(self, requests: List[Tuple[K, Json]]) -> WriteReport:
+        table_name = self.__table.name
+        frozen_key = lambda request: tuple(sorted(self.__request_key(request).items()))
+        # BatchWriteItem rejects batches that touch a key twice, so only the last request for each key is sent
+        pending    = OrderedDict((frozen_key(request), (key, request)) for key, request in requests)
+        succeeded  = []
+        error      = f'unprocessed after {self.BATCH_ATTEMPTS} attempts'
+
+        for attempt in range(self.BATCH_ATTEMPTS):
+            if not pending:
+                break
+            if attempt > 0:
+                self.__backoff(attempt)
+
+            try:
+                response = self.__request(
+                    'BatchWriteItem',
+                    self.__table.meta.client.batch_write_item,
+                    RequestItems = {table_name: [request for _, request in pending.values()]}
+                )
+            except ClientError as exc:
+                error = str(exc)
+                if _error_code(exc) in self.RETRYABLE_ERRORS:
+                    continue
+                break
+
+            unprocessed = OrderedDict(
+                (frozen, pending[frozen])
+                for frozen in map(frozen_key, response.get('UnprocessedItems', {}).get(table_name, []))
+            )
+            succeeded.extend(key for frozen, (key, _) in pending.items() if frozen not in unprocessed)
+            pending = unprocessed
+
+        return WriteReport(succeeded, [(key, error) for key, _ in pending.values()])
+
+    def __put_batch(self, values: Sequence[V]) -> WriteReport:
+        requests, failed = [], []
+        for value in values:
+            key = self.__key_of(value)
+            try:
+                requests.append((key, {'PutRequest': {'Item': self.__val.encode(value)}}))
+            except MarshmallowError as exc:
+                failed.append((key, f'failed to encode {value}: {exc}'))
+
+        report = self.__write_batch(requests)
+        return WriteReport(report.succeeded, failed + report.failed)
+
+    def put_all(self, values: Iterable[V]) -> WriteReport:
+        """Put many values using `BatchWriteItem`, 25 values per request.
+
+        Values are encoded lazily, as their batch is sent. Batches are sent concurrently when the store has more than
+        one worker, and at most one batch per worker is held in memory at a time. Items that DynamoDB leaves
+        unprocessed, and batches that are throttled, are resubmitted with jittered exponential backoff.
+
+        Returns:
+            A report of the keys of the values that were and were not written.
+        """
+        return _merge_reports(
+            _bounded_map(self.__put_batch, partition_all(self.BATCH_WRITE_SIZE, values), self.__workers)
+        )
 
     def delete(self, key: K) -> None:
-        self.__table.delete_item(Key = self.__encode_key(key))
+        self.__request('DeleteItem', self.__table.delete_item, Key = self.__encode_key(key))
+
+    def __delete_batch(self, keys: Sequence[K]) -> WriteReport:
+        return self.__write_batch([(key, {'DeleteRequest': {'Key': self.__encode_key(key)}}) for key in keys])
+
+    def delete_all(self, keys: Iterable[K]) -> WriteReport:
+        """Delete many values using `BatchWriteItem`, 25 keys per request.
+
+        Batches are sent like those of :meth:`put_all`: concurrently when the store has more than one worker, and
+        resubmitting unprocessed and throttled requests with jittered exponential backoff.
+
+        Returns:
+            A report of the keys that were and were not deleted.
+        """
+        return _merge_reports(
+            _bounded_map(self.__delete_batch, partition_all(self.BATCH_WRITE_SIZE, keys), self.__workers)
+        )
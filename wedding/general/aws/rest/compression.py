@@ -0,0 +1,75 @@
+import zlib
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Any
+
+from wedding.general.aws.rest import headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+MIN_SIZE = 1024
+"""Bodies smaller than this many bytes are sent uncompressed; the saving would not pay for the CPU time."""
+
+
+def _gzip(data: bytes) -> bytes:
+    # zlib writes a gzip header with a zero timestamp, so equal bodies always compress to equal bytes
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+ENCODERS: Dict[str, Callable[[bytes], bytes]] = OrderedDict(
+    ([('br', lambda data: brotli.compress(data, quality = 5))] if brotli is not None else []) +
+    [('gzip', _gzip)]
+)
+"""The content codings responses can be compressed with, in order of preference."""
+
+
+def _quality(parameters: str) -> float:
+    for parameter in parameters.split(';'):
+        name, _, value = parameter.partition('=')
+        if name.strip().lower() == 'q':
+            try:
+                return float(value)
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """Choose the content coding to compress a response with.
+
+    Args:
+        accept_encoding: The value of the request's `Accept-Encoding` header.
+
+    Returns:
+        The most preferred coding in :data:`ENCODERS` that the client accepts, or `None` if the client accepts none of
+        them.
+    """
+    if not accept_encoding:
+        return None
+
+    qualities = {}
+    for element in accept_encoding.split(','):
+        coding, _, parameters = element.partition(';')
+        qualities[coding.strip().lower()] = _quality(parameters)
+
+    wildcard = qualities.get('*', 0.0)
+    accepted = [
+        (quality, coding)
+        for coding, quality in ((coding, qualities.get(coding, wildcard)) for coding in ENCODERS)
+        if quality > 0
+    ]
+    return max(accepted, key = lambda accepted: accepted[0])[1] if accepted else None
+
+
+def accept_encoding(event: Dict[str, Any]) -> Optional[str]:
+    """Get the `Accept-Encoding` header of an API Gateway request."""
+    return headers.get(event, 'Accept-Encoding')
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compress `data` with one of the :data:`ENCODERS`."""
+    return ENCODERS[encoding](data)
@@ -0,0 +1,62 @@
+import hashlib
+from typing import Dict, Any, Optional, List
+
+from wedding.general.aws.rest import compression, headers
+
+
+def strong(*parts: str) -> str:
+    """Create a strong entity tag from the content of a response, or from whatever the content is derived from."""
+    return '"' + hashlib.sha1('\0'.join(parts).encode('utf-8')).hexdigest() + '"'
+
+
+def encoded(etag: str, encoding: str) -> str:
+    """The entity tag of a response body compressed with a content coding, which must differ from the uncompressed
+    body's tag."""
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def if_none_match(event: Dict[str, Any]) -> Optional[str]:
+    """Get the `If-None-Match` header of an API Gateway request."""
+    return headers.get(event, 'If-None-Match')
+
+
+def parse(if_none_match: Optional[str]) -> List[str]:
+    """The entity tags listed by an `If-None-Match` header, or `*`.
+
+    If-None-Match uses the weak comparison, so weak tags are returned as the strong tags with the same value.
+    """
+    tags = [tag.strip() for tag in (if_none_match or '').split(',') if tag.strip()]
+    return [tag[2:] if tag.startswith('W/') else tag for tag in tags]
+
+
+def matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an `If-None-Match` header matches a response's entity tag, in either its uncompressed or any of its
+    compressed forms.
+
+    Args:
+        if_none_match: The value of the request's `If-None-Match` header.
+        etag: The strong entity tag of the uncompressed response.
+    """
+    tags = parse(if_none_match)
+    if '*' in tags:
+        return True
+
+    current = {etag} | {encoded(etag, encoding) for encoding in compression.ENCODERS}
+    return any(tag in current for tag in tags)
+
+
+class Fingerprint:
+    """The entity tag of the latest version of a string that rarely changes, such as a cached template.
+
+    The string is only hashed again when it changes.
+    """
+
+    def __init__(self) -> None:
+        self.__text: Optional[str] = None
+        self.__etag: Optional[str] = None
+
+    def __call__(self, text: str) -> str:
+        if text is not self.__text and text != self.__text:
+            self.__text = text
+            self.__etag = strong(text)
+        return self.__etag
@@ -0,0 +1,16 @@
+from typing import Dict, Any, Optional
+
+
+def get(event: Dict[str, Any], name: str) -> Optional[str]:
+    """Get a header of an API Gateway request, whose header names may be in any case.
+
+    Args:
+        event: The API Gateway event.
+        name: The name of the header.
+
+    Returns:
+        The value of the header, or `None` if the request does not have it.
+    """
+    lowered = name.lower()
+    headers = event.get('headers') or {}
+    return next((value for key, value in headers.items() if key.lower() == lowered), None)
@@ -1,4 +1,3 @@
-import json
 from abc import ABC, abstractmethod
 from typing import Generic, TypeVar, Union, Optional, Iterable
 
@@ -7,25 +6,67 @@ from toolz.functoolz import excepts, partial, compose
 from toolz.dicttoolz import merge
 from toolz.itertoolz import isiterable
 
-from wedding.general.aws.rest.responses import HttpResponse, MethodNotAllowed, NotFound, BadRequest, InternalServerError
+from wedding.general.aws.rest import compression, etags, ndjson
+from wedding.general.aws.rest.responses import HttpResponse, MethodNotAllowed, NotFound, BadRequest, \
+    InternalServerError, conditional
+from wedding.general import fastjson, metrics, profiling
 from wedding.general.model import JsonCodec, Json
+from wedding.general.store import Page
 from wedding.general.functional import option
 
 
 _A = TypeVar('_A')
 
+_warm: bool = False
+
 
 class LambdaHandler(ABC):
+    """A Lambda function handler.
+
+    Besides the events of its function, every handler accepts warm-up events, sent on a schedule to keep containers
+    warm or ahead of a burst of traffic to start them. A warm-up event is a scheduled CloudWatch event or an event
+    with a true `warmup` field. It returns at once without touching the business handler, unless it also has a true
+    `prefetch` field, in which case the handler first prepares for requests with :meth:`_warm`.
+    """
+
     METHOD_FIELD = 'httpMethod'
     QUERY_FIELD = 'queryStringParameters'
     PATH_FIELD = 'pathParameters'
+    WARMUP_FIELD = 'warmup'
+    PREFETCH_FIELD = 'prefetch'
 
     @abstractmethod
     def _handle(self, event):
         pass
 
+    def _warm(self) -> None:
+        """Prepare for requests, e.g. by fetching templates and opening store connections."""
+        pass
+
+    @classmethod
+    def _is_warmup(cls, event) -> bool:
+        return bool(event.get(cls.WARMUP_FIELD)) or (
+            event.get('source') == 'aws.events' and event.get('detail-type') == 'Scheduled Event'
+        )
+
+    @staticmethod
+    def _cold_start() -> bool:
+        """Whether this is the first invocation of any handler in this Lambda container."""
+        global _warm
+        cold, _warm = not _warm, True
+        return cold
+
+    def __warm_up(self, event, cold: bool):
+        metrics.count('Warmups')
+        if event.get(self.PREFETCH_FIELD):
+            self._warm()
+        return {self.WARMUP_FIELD: True, 'cold': cold}
+
     def __call__(self, event, context):
-        return self._handle(event)
+        name = type(self).__name__
+        cold = self._cold_start()
+        with profiling.invocation(name, cold), metrics.invocation(name, cold):
+            return self.__warm_up(event, cold) if self._is_warmup(event) else self._handle(event)
 
 
 class RestResource(Generic[_A], LambdaHandler):
@@ -33,7 +74,7 @@ class RestResource(Generic[_A], LambdaHandler):
         self.__codec = codec
 
     def __payload(self, event):
-        body = json.loads(event['body'])
+        body = fastjson.loads(event['body'])
         return option.cata(
             partial(compose(list, map), self.__codec.decode),
             lambda: self.__codec.decode(body)
@@ -47,9 +88,11 @@ class RestResource(Generic[_A], LambdaHandler):
 
         if method == 'GET':
             return option.cata(
-                self._get,
+                lambda key: self._get(key, query),
                 lambda: self._get_many(query)
             )(maybe_id)
+        elif method == 'POST' and ndjson.is_ndjson(event):
+            return self._post_lines(ndjson.Lines(event['body'] or '', self.__codec.decode))
         elif method == 'POST':
             body = self.__payload(event)
             return (
@@ -91,6 +134,14 @@ class RestResource(Generic[_A], LambdaHandler):
         fields = getattr(x_type, '_fields', None)
         return isinstance(fields, tuple) and all(type(n) == str for n in fields)
 
+    @staticmethod
+    def __ok(event, body: str) -> HttpResponse:
+        return conditional(etags.if_none_match(event), etags.strong(body), lambda: body)
+
+    def __encode(self, item: Union[_A, Json]) -> Json:
+        # Values read with a projection are already partial JSON
+        return item if isinstance(item, dict) else self.__codec.encode(item)
+
     def _handle(self, event):
         safe_route = compose(
             self.__handler(Exception       , self.__internal_error),
@@ -99,23 +150,26 @@ class RestResource(Generic[_A], LambdaHandler):
 
         result = safe_route(event)
 
-        response = (
-            result.as_json() if isinstance(result, HttpResponse) else
-            {
-                'statusCode': 200,
-                'body': json.dumps(
-                    { 'items': [self.__codec.encode(item) for item in result] } if self.__multiple_items(result) else
-                    self.__codec.encode(result)
+        if not isinstance(result, HttpResponse):
+            with metrics.timer('Encode'):
+                result = self.__ok(
+                    event,
+                    fastjson.dumps(
+                        { 'items': [self.__encode(item) for item in result.items], 'next': result.cursor }
+                        if isinstance(result, Page) else
+                        { 'items': [self.__encode(item) for item in result] } if self.__multiple_items(result) else
+                        self.__encode(result)
+                    )
                 )
-            }
-        )
 
-        return merge(response, {'isBase64Encoded': False, 'headers': {'Access-Control-Allow-Origin': "*"}})
+        response = result.as_json(compression.accept_encoding(event))
+
+        return merge(response, {'headers': merge(response.get('headers', {}), {'Access-Control-Allow-Origin': "*"})})
 
-    def _get(self, key: str) -> Union[Optional[_A], HttpResponse]:
+    def _get(self, key: str, query: Json) -> Union[Optional[_A], Json, HttpResponse]:
         return NotFound()
 
-    def _get_many(self, query: Json) -> Union[Iterable[_A], HttpResponse]:
+    def _get_many(self, query: Json) -> Union[Iterable[_A], Iterable[Json], Page, HttpResponse]:
         return NotFound()
 
     def _post(self, a: _A) -> HttpResponse:
@@ -124,6 +178,10 @@ class RestResource(Generic[_A], LambdaHandler):
     def _post_many(self, a: Iterable[_A]) -> HttpResponse:
         return MethodNotAllowed()
 
+    def _post_lines(self, lines: ndjson.Lines[_A]) -> HttpResponse:
+        """Handle a POST of newline-delimited JSON, whose lines are decoded as they are iterated."""
+        return MethodNotAllowed()
+
     def _delete(self, key: str) -> HttpResponse:
         return MethodNotAllowed()
 
@@ -0,0 +1,66 @@
+import io
+from collections import namedtuple
+from typing import Any, Callable, Dict, Generic, Iterator, List, TypeVar
+
+from marshmallow.exceptions import MarshmallowError
+
+from wedding.general import fastjson
+from wedding.general.aws.rest import headers
+from wedding.general.model import Json
+
+
+_A = TypeVar('_A')
+
+
+CONTENT_TYPES = frozenset(['application/x-ndjson', 'application/ndjson', 'application/jsonl', 'application/x-jsonlines'])
+"""Media types of newline-delimited JSON: one JSON value per line."""
+
+
+LineError = namedtuple('LineError', ['line', 'error'])
+"""A line of a newline-delimited JSON body that could not be decoded.
+
+Attributes:
+    line: The number of the line, counting from 1.
+    error: Why the line could not be decoded.
+"""
+
+
+def is_ndjson(event: Dict[str, Any]) -> bool:
+    """Whether the body of an API Gateway request is newline-delimited JSON, according to its `Content-Type`."""
+    content_type = headers.get(event, 'Content-Type') or ''
+    return content_type.partition(';')[0].strip().lower() in CONTENT_TYPES
+
+
+class Lines(Generic[_A]):
+    """The values of a newline-delimited JSON body, decoded one line at a time as they are iterated.
+
+    Blank lines are skipped. Lines that are not valid JSON, or that `decode` rejects, are skipped too, and recorded in
+    :attr:`errors`, so a few bad lines do not stop the rest from being read. Only one line is decoded at a time, so
+    the values can be written as they are read.
+    """
+
+    def __init__(self, body: str, decode: Callable[[Json], _A]) -> None:
+        """Create a new instance of the :obj:`Lines` class.
+
+        Args:
+            body: The newline-delimited JSON.
+            decode: Function that decodes and validates the JSON value of a line. Raises a :obj:`MarshmallowError` if
+                the value is invalid.
+        """
+        self.__body  : str                  = body
+        self.__decode: Callable[[Json], _A] = decode
+        self.__errors: List[LineError]      = []
+
+    @property
+    def errors(self) -> List[LineError]:
+        """The lines skipped so far because they could not be decoded."""
+        return self.__errors
+
+    def __iter__(self) -> Iterator[_A]:
+        for number, line in enumerate(io.StringIO(self.__body), 1):
+            if not line.strip():
+                continue
+            try:
+                yield self.__decode(fastjson.loads(line))
+            except (ValueError, MarshmallowError) as error:
+                self.__errors.append(LineError(number, str(error)))
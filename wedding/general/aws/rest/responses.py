@@ -1,12 +1,22 @@
-from typing import Dict, Any, Optional
+import base64
+from typing import Dict, Any, Optional, Iterable, Callable
 from abc import abstractmethod, ABC
 
+from toolz.dicttoolz import merge
+
+from wedding.general import fastjson
+from wedding.general.aws.rest import compression, etags
 from wedding.general.functional import option
 
 
 class HttpResponse(ABC):
-    def __init__(self, body: Optional[str] = None) -> None:
+    compressible = True
+    """Whether the body may be compressed. API Gateway reads the body of some responses as plain text."""
+
+    def __init__(self, body: Optional[str] = None, etag: Optional[str] = None) -> None:
         self.__body = body or ''
+        self.__etag = etag
+        self.__compressed: Dict[str, Optional[str]] = {}
 
     @property
     @abstractmethod
@@ -17,12 +27,59 @@ class HttpResponse(ABC):
     def body(self) -> Optional[str]:
         return self.__body
 
-    def as_json(self) -> Dict[str, Any]:
-        return {
-            'statusCode': self.status_code,
-            'body': self.body,
-            'isBase64Encoded': False
-        }
+    @property
+    def etag(self) -> Optional[str]:
+        """The strong entity tag of the uncompressed body, if the response has one."""
+        return self.__etag
+
+    def __compress(self, encoding: str) -> Optional[str]:
+        if encoding not in self.__compressed:
+            data       = self.body.encode('utf-8')
+            compressed = compression.compress(data, encoding) if len(data) >= compression.MIN_SIZE else data
+            self.__compressed[encoding] = (
+                base64.b64encode(compressed).decode('ascii') if len(compressed) < len(data) else None
+            )
+        return self.__compressed[encoding]
+
+    def precompress(self, encodings: Iterable[str] = tuple(compression.ENCODERS)) -> 'HttpResponse':
+        """Compress the body ahead of time, so that a response that is kept and sent many times is only compressed
+        once per encoding.
+
+        Args:
+            encodings: The content codings to compress the body with.
+
+        Returns:
+            This response.
+        """
+        if self.compressible:
+            for encoding in encodings:
+                self.__compress(encoding)
+        return self
+
+    def as_json(self, accept_encoding: Optional[str] = None) -> Dict[str, Any]:
+        """Get the response in the form returned by Lambda functions behind API Gateway.
+
+        Args:
+            accept_encoding: The request's `Accept-Encoding` header. The body is compressed with the preferred coding
+                the client accepts, unless it is smaller than :data:`compression.MIN_SIZE` bytes or compression does
+                not make it smaller.
+        """
+        encoding = compression.negotiate(accept_encoding) if self.compressible else None
+        body     = self.__compress(encoding) if encoding is not None else None
+
+        headers = merge(
+            {'Content-Encoding': encoding, 'Vary': 'Accept-Encoding'} if body is not None else {},
+            {'ETag': self.etag if body is None else etags.encoded(self.etag, encoding)} if self.etag is not None else {}
+        )
+
+        return merge(
+            {
+                'statusCode': self.status_code,
+                'body': body if body is not None else self.body,
+                'isBase64Encoded': body is not None
+            },
+            {'headers': headers} if headers else {}
+        )
 
 
 class Ok(HttpResponse):
@@ -37,12 +94,50 @@ class Created(HttpResponse):
         return 201
 
 
+class MultiStatus(HttpResponse):
+    @property
+    def status_code(self):
+        return 207
+
+
 class NoContent(HttpResponse):
     @property
     def status_code(self):
         return 204
 
 
+class NotModified(HttpResponse):
+    # A 304 has no body
+    compressible = False
+
+    def __init__(self, etag: str, if_none_match: Optional[str] = None) -> None:
+        """Create a new instance of the :obj:`NotModified` class.
+
+        Args:
+            etag: The strong entity tag of the uncompressed content.
+            if_none_match: The request's `If-None-Match` header.
+        """
+        super().__init__(etag = etag)
+        self.__cached = etags.parse(if_none_match)
+
+    @property
+    def status_code(self):
+        return 304
+
+    def as_json(self, accept_encoding: Optional[str] = None) -> Dict[str, Any]:
+        """Get the response in the form returned by Lambda functions behind API Gateway.
+
+        The response has the entity tag a `200` would have had: that of the body compressed with the preferred coding
+        the client accepts, unless the client holds the uncompressed body, which is sent when compression does not
+        make it smaller.
+        """
+        response = super().as_json()
+        encoding = compression.negotiate(accept_encoding)
+        if encoding is None or self.etag in self.__cached:
+            return response
+        return merge(response, {'headers': {'ETag': etags.encoded(self.etag, encoding), 'Vary': 'Accept-Encoding'}})
+
+
 class MethodNotAllowed(HttpResponse):
     @property
     def status_code(self):
@@ -58,7 +153,7 @@ class NotFound(HttpResponse):
 class BadRequest(HttpResponse):
     @property
     def status_code(self):
-        return 405
+        return 400
 
 
 class InternalServerError(HttpResponse):
@@ -69,16 +164,33 @@ class InternalServerError(HttpResponse):
     def __init__(self, message: Optional[str]) -> None:
         super().__init__(
             option.cata(
-                '{{ "message": "{}" }}'.format,
+                lambda message: fastjson.dumps({'message': message}),
                 lambda: ''
             )(message)
         )
 
 
 class TemporaryRedirect(HttpResponse):
+    # API Gateway maps the body to the Location header
+    compressible = False
+
     def __init__(self, to_url: str) -> None:
         super().__init__(to_url)
 
     @property
     def status_code(self):
         return 302
+
+
+def conditional(if_none_match: Optional[str], etag: str, render: Callable[[], str]) -> HttpResponse:
+    """Respond to a conditional GET.
+
+    Args:
+        if_none_match: The request's `If-None-Match` header.
+        etag: The strong entity tag of the current content.
+        render: Function that renders the current content. It is not called if the client already has it.
+
+    Returns:
+        :obj:`NotModified` if `if_none_match` matches `etag`, otherwise :obj:`Ok` with the rendered content.
+    """
+    return NotModified(etag, if_none_match) if etags.matches(if_none_match, etag) else Ok(render(), etag)
@@ -0,0 +1,83 @@
+import re
+from typing import Any, Callable, Dict, List, Mapping, Optional, Pattern, Tuple
+
+from toolz.itertoolz import unique
+
+from wedding.general.aws.rest.lambda_resource import LambdaHandler
+from wedding.general.aws.rest.responses import NotFound, MethodNotAllowed
+
+
+Handler = Callable[[Dict[str, Any], Any], Any]
+
+
+def _pattern(resource: str) -> Pattern:
+    """A regular expression matching the paths of a resource such as `/parties/{id}`."""
+    return re.compile(
+        '^' + ''.join(
+            '[^/]+' if part.startswith('{') else re.escape(part)
+            for part in re.split(r'(\{[^}]+\})', resource)
+            if part
+        ) + '$'
+    )
+
+
+class Router(LambdaHandler):
+    """A single Lambda handler that dispatches API Gateway events to the handler of their resource.
+
+    Deploying every endpoint as one Lambda function lets them share warm containers, caches and clients. Events are
+    routed by their `resource` field, which proxy integrations set to the resource template, e.g. `/parties/{id}`;
+    the mapping templates of other integrations can set it with `"resource": "$context.resourcePath"`. Events without
+    a `resource` are routed by matching their `path` against the resource templates. Warm-up events are passed to
+    every handler, so that one event warms up, and optionally prefetches for, every endpoint of the container.
+    """
+
+    RESOURCE_FIELD     = 'resource'
+    REQUEST_PATH_FIELD = 'path'
+
+    def __init__(self, routes: Mapping[str, Handler]) -> None:
+        """Create a new instance of the :obj:`Router` class.
+
+        Args:
+            routes: The handler of each route. A route is a resource template, such as `/parties/{id}`, optionally
+                preceded by an HTTP method and a space, such as `POST /rsvp`. Routes with a method take precedence
+                over routes without one. Handlers are called with the event and context the router was called with.
+        """
+        self.__routes: Dict[Tuple[Optional[str], str], Handler] = {}
+        self.__paths : List[Tuple[Pattern, str]]                = []
+
+        for route, handler in routes.items():
+            method, _, resource = route.rpartition(' ')
+            if not any(known == resource for _, known in self.__paths):
+                self.__paths.append((_pattern(resource), resource))
+            self.__routes[(method.upper() or None, resource)] = handler
+
+    def __resource(self, event) -> Optional[str]:
+        resource = event.get(self.RESOURCE_FIELD)
+        if resource is not None or self.REQUEST_PATH_FIELD not in event:
+            return resource
+        path = event[self.REQUEST_PATH_FIELD]
+        return next((resource for pattern, resource in self.__paths if pattern.match(path)), None)
+
+    def route(self, event) -> Optional[Handler]:
+        """The handler of an event, or `None` if no route matches it."""
+        resource = self.__resource(event)
+        method   = (event.get(self.METHOD_FIELD) or '').upper()
+        return self.__routes.get((method, resource)) or self.__routes.get((None, resource))
+
+    def __unrouted(self, event):
+        resource = self.__resource(event)
+        return (MethodNotAllowed() if any(known == resource for _, known in self.__paths) else NotFound()).as_json()
+
+    def __warm_up(self, event, context):
+        warmed = [handler(event, context) for handler in unique(self.__routes.values(), key = id)]
+        return {self.WARMUP_FIELD: True, 'cold': any(handler['cold'] for handler in warmed)}
+
+    def __call__(self, event, context):
+        # The routed handler measures and profiles its own invocation, under its own name
+        if self._is_warmup(event):
+            return self.__warm_up(event, context)
+        handler = self.route(event)
+        return handler(event, context) if handler is not None else self.__unrouted(event)
+
+    def _handle(self, event):
+        return self(event, None)
@@ -0,0 +1,73 @@
+from typing import Optional, TYPE_CHECKING
+
+from botocore.exceptions import ClientError
+
+from wedding.general.profiling import ProfileSink, ProfileTag, profile_name, dumps
+from wedding.general.template import TemplateSource, TemplateVersion
+
+if TYPE_CHECKING:
+    import pstats
+
+
+class S3TemplateSource(TemplateSource):
+    """Template source that reads templates from an S3 bucket.
+
+    Cached templates are revalidated with conditional GETs, so an unchanged template costs a `304 Not Modified`
+    response instead of a download.
+    """
+
+    NOT_MODIFIED_CODES = frozenset(['304', 'NotModified'])
+
+    def __init__(self,
+                 bucket,
+                 prefix: str = '') -> None:
+        """Create a new instance of the :obj:`S3TemplateSource` class.
+
+        Args:
+            bucket: The boto3 `Bucket` resource that contains the templates.
+            prefix: Prefix prepended to every template key, e.g. `templates/`.
+        """
+        self.__bucket = bucket
+        self.__prefix = prefix
+
+    @staticmethod
+    def __conditions(current: Optional[TemplateVersion]):
+        return (
+            {}                                         if current is None                   else
+            {'IfNoneMatch'    : current.etag         } if current.etag is not None          else
+            {'IfModifiedSince': current.last_modified} if current.last_modified is not None else
+            {}
+        )
+
+    def fetch(self, key: str, current: Optional[TemplateVersion]) -> Optional[TemplateVersion]:
+        try:
+            response = self.__bucket.Object(self.__prefix + key).get(**self.__conditions(current))
+        except ClientError as exc:
+            if exc.response.get('Error', {}).get('Code') in self.NOT_MODIFIED_CODES:
+                return None
+            raise
+
+        return TemplateVersion(
+            body          = response['Body'].read().decode('utf-8'),
+            etag          = response.get('ETag'),
+            last_modified = response.get('LastModified')
+        )
+
+
+class S3ProfileSink(ProfileSink):
+    """Profile sink that uploads each profile to an S3 bucket, in :mod:`pstats` format."""
+
+    def __init__(self,
+                 bucket,
+                 prefix: str = '') -> None:
+        """Create a new instance of the :obj:`S3ProfileSink` class.
+
+        Args:
+            bucket: The boto3 `Bucket` resource to upload profiles to.
+            prefix: Prefix prepended to the key of every profile, e.g. `profiles/`.
+        """
+        self.__bucket = bucket
+        self.__prefix = prefix
+
+    def write(self, tag: ProfileTag, stats: 'pstats.Stats') -> None:
+        self.__bucket.put_object(Key = self.__prefix + profile_name(tag), Body = dumps(stats))
@@ -0,0 +1,199 @@
+import time
+from collections import namedtuple, OrderedDict
+from typing import TypeVar, Callable, Optional, Iterable, Dict, Sequence, Tuple
+
+from wedding.general.filters import Filter
+from wedding.general.model import JsonCodec, Json
+from wedding.general.store import Store, WriteReport, Page
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+
+class CacheStats(namedtuple('CacheStats', ['hits', 'misses', 'evictions'])):
+    """Counters describing how a :obj:`CachingStore` has served reads."""
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class CachingStore(Store[K, V]):
+    """A read-through, write-through cache in front of another store.
+
+    Values are kept in a bounded least-recently-used cache, and each entry expires a fixed time after it was cached.
+    A cache created at module level is shared by every warm invocation of a Lambda function. Writes made through the
+    cache update or invalidate the affected entries, but writes made by other Lambda containers are only seen once
+    the cached entries expire.
+    """
+
+    def __init__(self,
+                 store       : Store[K, V],
+                 key_of      : Callable[[V], K],
+                 max_size    : int                 = 1024,
+                 ttl         : float               = 30.0,
+                 negative_ttl: float               = 0.0,
+                 clock       : Callable[[], float] = time.monotonic) -> None:
+        """Create a new instance of the :obj:`CachingStore` class.
+
+        Args:
+            store: The store to cache values from.
+            key_of: Function that gets the key of a value.
+            max_size: The maximum number of entries to cache.
+            ttl: Number of seconds a value is cached for.
+            negative_ttl: Number of seconds the absence of a value is cached for. Use `0` to not cache absences.
+            clock: Function returning the current time in seconds.
+        """
+        self._store        : Store[K, V]                        = store
+        self.__key_of      : Callable[[V], K]                   = key_of
+        self.__max_size    : int                                = max_size
+        self.__ttl         : float                              = ttl
+        self.__negative_ttl: float                              = negative_ttl
+        self.__clock       : Callable[[], float]                = clock
+        self.__entries     : Dict[K, Tuple[Optional[V], float]] = OrderedDict()
+
+        self.__hits      = 0
+        self.__misses    = 0
+        self.__evictions = 0
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits      = self.__hits,
+            misses    = self.__misses,
+            evictions = self.__evictions
+        )
+
+    def _cache(self, key: K, value: Optional[V]) -> None:
+        """Cache a value, or the absence of one, that was read from or written to the underlying store."""
+        ttl = self.__ttl if value is not None else self.__negative_ttl
+        if ttl <= 0:
+            self._invalidate(key)
+            return
+
+        self.__entries[key] = (value, self.__clock() + ttl)
+        self.__entries.move_to_end(key)
+        if len(self.__entries) > self.__max_size:
+            self.__entries.popitem(last = False)
+            self.__evictions += 1
+
+    def _invalidate(self, key: K) -> None:
+        self.__entries.pop(key, None)
+
+    def __lookup(self, key: K) -> Tuple[bool, Optional[V]]:
+        entry = self.__entries.get(key)
+        if entry is None:
+            self.__misses += 1
+            return False, None
+
+        value, expires = entry
+        if self.__clock() >= expires:
+            del self.__entries[key]
+            self.__misses += 1
+            return False, None
+
+        self.__entries.move_to_end(key)
+        self.__hits += 1
+        return True, value
+
+    def get(self, key: K) -> Optional[V]:
+        cached, value = self.__lookup(key)
+        if not cached:
+            value = self._store.get(key)
+            self._cache(key, value)
+        return value
+
+    def get_many(self, keys: Iterable[K]) -> Iterable[V]:
+        missing = []
+        for key in keys:
+            cached, value = self.__lookup(key)
+            if not cached:
+                missing.append(key)
+            elif value is not None:
+                yield value
+
+        found = set()
+        for value in self._store.get_many(missing):
+            key = self.__key_of(value)
+            found.add(key)
+            self._cache(key, value)
+            yield value
+
+        for key in missing:
+            if key not in found:
+                self._cache(key, None)
+
+    def get_all(self) -> Iterable[V]:
+        return self._store.get_all()
+
+    def find(self, filters: Sequence[Filter]) -> Iterable[V]:
+        return self._store.find(filters)
+
+    def get_page(self,
+                 limit  : Optional[int]    = None,
+                 cursor : Optional[str]    = None,
+                 filters: Sequence[Filter] = ()) -> Page:
+        return self._store.get_page(limit, cursor, filters)
+
+    def project(self, names: Sequence[str], codec: JsonCodec[V]) -> Store[K, Json]:
+        """Get a read-only view of the underlying store that reads only some attributes. The view is not cached."""
+        return self._store.project(names, codec)
+
+    def warm(self) -> None:
+        self._store.warm()
+
+    def put(self, value: V) -> None:
+        self._store.put(value)
+        self._cache(self.__key_of(value), value)
+
+    def put_all(self, values: Iterable[V]) -> WriteReport:
+        keys = []
+
+        def track(value: V) -> V:
+            keys.append(self.__key_of(value))
+            return value
+
+        try:
+            return self._store.put_all(map(track, values))
+        finally:
+            for key in keys:
+                self._invalidate(key)
+
+    def delete(self, key: K) -> None:
+        self._store.delete(key)
+        self._cache(key, None)
+
+    def delete_all(self, keys: Iterable[K]) -> WriteReport:
+        deleted = []
+
+        def track(key: K) -> K:
+            deleted.append(key)
+            return key
+
+        try:
+            return self._store.delete_all(map(track, keys))
+        finally:
+            for key in deleted:
+                self._invalidate(key)
+
+    def replace(self, key: K, expected: V, value: V) -> bool:
+        try:
+            replaced = self._store.replace(key, expected, value)
+        except Exception:
+            self._invalidate(key)
+            raise
+        if replaced:
+            self._cache(key, value)
+        else:
+            self._invalidate(key)
+        return replaced
+
+    def modify(self, key: K, transform: Callable[[V], V]) -> Optional[V]:
+        try:
+            value = self._store.modify(key, transform)
+        except Exception:
+            self._invalidate(key)
+            raise
+        self._cache(key, value)
+        return value
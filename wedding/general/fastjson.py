@@ -0,0 +1,103 @@
+import json
+from collections import OrderedDict, namedtuple
+from typing import Any, Callable, Dict, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+Default = Optional[Callable[[Any], Any]]
+
+Backend = namedtuple('Backend', ['name', 'dumps', 'loads'])
+"""A JSON library.
+
+Attributes:
+    name: The name of the library.
+    dumps: Function of a value, whether to sort object keys and a :data:`Default`, that serializes the value to a
+        JSON string.
+    loads: Function that parses a JSON string or UTF-8 encoded bytes.
+"""
+
+
+_STDLIB_ENCODERS: Dict[bool, json.JSONEncoder] = {
+    sort_keys: json.JSONEncoder(ensure_ascii = False, separators = (',', ':'), sort_keys = sort_keys)
+    for sort_keys in (False, True)
+}
+
+
+def _stdlib_dumps(value: Any, sort_keys: bool, default: Default) -> str:
+    return (
+        _STDLIB_ENCODERS[sort_keys].encode(value) if default is None else
+        json.dumps(value, ensure_ascii = False, separators = (',', ':'), sort_keys = sort_keys, default = default)
+    )
+
+
+def _stdlib_loads(text: Union[str, bytes]) -> Any:
+    return json.loads(text.decode('utf-8') if isinstance(text, bytes) else text)
+
+
+def _orjson_dumps(value: Any, sort_keys: bool, default: Default) -> str:
+    return orjson.dumps(value, default = default, option = orjson.OPT_SORT_KEYS if sort_keys else 0).decode('utf-8')
+
+
+def _ujson_dumps(value: Any, sort_keys: bool, default: Default) -> str:
+    # Not every ujson release supports `default`, so values that need one are left to the standard library
+    return (
+        ujson.dumps(value, ensure_ascii = False, escape_forward_slashes = False, sort_keys = sort_keys)
+        if default is None else
+        _stdlib_dumps(value, sort_keys, default)
+    )
+
+
+BACKENDS: Dict[str, Backend] = OrderedDict(
+    [(backend.name, backend) for backend in [
+        Backend('orjson', _orjson_dumps, orjson.loads) if orjson is not None else None,
+        Backend('ujson' , _ujson_dumps , ujson.loads ) if ujson  is not None else None,
+        Backend('json'  , _stdlib_dumps, _stdlib_loads)
+    ] if backend is not None]
+)
+"""The installed JSON libraries, fastest first. The standard library is always available."""
+
+_backend: Backend = next(iter(BACKENDS.values()))
+
+
+def backend() -> str:
+    """The name of the JSON library in use."""
+    return _backend.name
+
+
+def configure(name: Optional[str]) -> None:
+    """Use the installed JSON library named `name`, or the fastest installed library if it is `None`.
+
+    Raises:
+        KeyError: If no library named `name` is installed.
+    """
+    global _backend
+    _backend = BACKENDS[name] if name is not None else next(iter(BACKENDS.values()))
+
+
+def dumps(value: Any, sort_keys: bool = False, default: Default = None) -> str:
+    """Serialize a value to compact JSON, with non-ASCII characters left unescaped.
+
+    Every backend escapes strings correctly, but the exact text may differ between backends, e.g. in the escaping of
+    control characters, so it should only be compared with text serialized by the same backend.
+
+    Args:
+        value: The value to serialize, made of dicts with string keys, lists, tuples, strings, numbers, booleans and
+            `None`.
+        sort_keys: Whether to sort the keys of objects, to serialize equal values to equal text.
+        default: Function that converts values of other types to a serializable value.
+    """
+    return _backend.dumps(value, sort_keys, default)
+
+
+def loads(text: Union[str, bytes]) -> Any:
+    """Parse a JSON string, or UTF-8 encoded bytes."""
+    return _backend.loads(text)
@@ -0,0 +1,105 @@
+from collections import namedtuple
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, Mapping, Sequence, List
+
+from wedding.general.model import Json
+
+
+Filter = namedtuple('Filter', ['name', 'operator', 'value'])
+"""A condition on one attribute of a value's JSON form.
+
+Attributes:
+    name: The name of the attribute.
+    operator: One of :data:`OPERATORS`.
+    value: The value to compare the attribute with; a list of values for the `in` operator.
+"""
+
+
+OPERATORS = ['eq', 'ne', 'lt', 'le', 'gt', 'ge', 'in', 'begins_with']
+
+
+class InvalidFilter(ValueError):
+    """Raised when a query parameter is not a valid filter."""
+
+
+def boolean(value: str) -> bool:
+    """Parse `true` or `false`."""
+    lowered = value.lower()
+    if lowered not in ('true', 'false'):
+        raise ValueError(f'"{value}" is not a boolean')
+    return lowered == 'true'
+
+
+def number(value: str) -> Decimal:
+    """Parse a number as the :obj:`Decimal` DynamoDB returns numbers as."""
+    try:
+        return Decimal(value)
+    except InvalidOperation:
+        raise ValueError(f'"{value}" is not a number')
+
+
+def parse_filters(parameters: Mapping[str, str],
+                  attributes: Mapping[str, Callable[[str], Any]]) -> List[Filter]:
+    """Parse filters from query string parameters.
+
+    Each parameter is one filter, named after the attribute it applies to. Its value is either an operand, which the
+    attribute must equal, or an operator and an operand separated by a colon, as in `capacity=ge:3`. The operand of
+    `in` is a comma-separated list, as in `rsvpStage=in:email_sent,email_opened`. Only the first colon separates an
+    operator, and text before it that is not an operator is part of the operand; use `eq:` to filter on an operand
+    that starts with an operator.
+
+    Args:
+        parameters: The query string parameters that are filters.
+        attributes: The attributes that can be filtered on, each with a function that parses operands.
+
+    Raises:
+        InvalidFilter: If an attribute can't be filtered on or an operand can't be parsed.
+    """
+    filters = []
+
+    for name, text in parameters.items():
+        parse = attributes.get(name)
+        if parse is None:
+            raise InvalidFilter(f'Cannot filter on {name}')
+
+        operator, separator, operand = text.partition(':')
+        if not separator or operator not in OPERATORS:
+            operator, operand = 'eq', text
+
+        try:
+            value = (
+                [parse(v) for v in operand.split(',')] if operator == 'in' else
+                parse(operand)
+            )
+        except ValueError as error:
+            raise InvalidFilter(f'Invalid filter on {name}: {error}')
+
+        filters.append(Filter(name, operator, value))
+
+    return filters
+
+
+def _compare(compare: Callable[[Any, Any], bool]) -> Callable[[Any, Any], bool]:
+    def safe(a, b) -> bool:
+        try:
+            return a is not None and compare(a, b)
+        except TypeError:
+            return False
+    return safe
+
+
+_EVALUATORS = {
+    'eq'         : lambda a, b: a == b,
+    'ne'         : lambda a, b: a != b,
+    'lt'         : _compare(lambda a, b: a <  b),
+    'le'         : _compare(lambda a, b: a <= b),
+    'gt'         : _compare(lambda a, b: a >  b),
+    'ge'         : _compare(lambda a, b: a >= b),
+    'in'         : lambda a, b: a in b,
+    'begins_with': lambda a, b: isinstance(a, str) and a.startswith(b)
+}
+
+
+def matches(filters: Sequence[Filter], item: Json) -> bool:
+    """Whether the JSON form of a value satisfies every filter, as DynamoDB would evaluate them."""
+    return all(_EVALUATORS[f.operator](item.get(f.name), f.value) for f in filters)
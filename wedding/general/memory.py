@@ -0,0 +1,53 @@
+from collections import OrderedDict
+from typing import TypeVar, Callable, Optional, Iterable, Dict
+
+from wedding.general.model import JsonEncoder, Json
+from wedding.general.store import Store, WriteReport
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+
+class InMemoryStore(Store[K, V]):
+    """A store that keeps values in memory, for tests and for running handlers locally.
+
+    Values are kept in insertion order. Filters are evaluated against each value's JSON form, as DynamoDB evaluates
+    them against stored items.
+    """
+
+    def __init__(self,
+                 key_of : Callable[[V], K],
+                 encoder: JsonEncoder[V],
+                 values : Iterable[V] = ()) -> None:
+        """Create a new instance of the :obj:`InMemoryStore` class.
+
+        Args:
+            key_of: Function that gets the key of a value.
+            encoder: Encodes values into the JSON that filters are evaluated against.
+            values: Values to start with.
+        """
+        self.__key_of : Callable[[V], K] = key_of
+        self.__encoder: JsonEncoder[V]   = encoder
+        self.__values : Dict[K, V]       = OrderedDict((key_of(value), value) for value in values)
+
+    def get(self, key: K) -> Optional[V]:
+        return self.__values.get(key)
+
+    def get_all(self) -> Iterable[V]:
+        return list(self.__values.values())
+
+    def _json(self, value: V) -> Json:
+        return self.__encoder(value)
+
+    def put(self, value: V) -> None:
+        self.__values[self.__key_of(value)] = value
+
+    def put_all(self, values: Iterable[V]) -> WriteReport:
+        succeeded = []
+        for value in values:
+            self.put(value)
+            succeeded.append(self.__key_of(value))
+        return WriteReport(succeeded, [])
+
+    def delete(self, key: K) -> None:
+        self.__values.pop(key, None)
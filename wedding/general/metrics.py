@@ -0,0 +1,188 @@
+import threading
+import time
+from collections import namedtuple
+from typing import Callable, Dict, Optional
+
+from wedding.general import fastjson
+
+
+Measurements = namedtuple('Measurements', ['timers', 'calls', 'counters'])
+"""What a :obj:`Recorder` has measured during one invocation.
+
+Attributes:
+    timers: Total milliseconds spent in each timed operation.
+    calls: Number of times each timed operation ran.
+    counters: The value of each counter.
+"""
+
+
+class Recorder:
+    """Accumulates timers and counters for a single invocation. Safe to use from several threads."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        self.clock     : Callable[[], float] = clock
+        self.__lock    : threading.Lock      = threading.Lock()
+        self.__timers  : Dict[str, float]    = {}
+        self.__calls   : Dict[str, int]      = {}
+        self.__counters: Dict[str, float]    = {}
+
+    def time(self, name: str, seconds: float) -> None:
+        with self.__lock:
+            self.__timers[name] = self.__timers.get(name, 0.0) + seconds * 1000
+            self.__calls [name] = self.__calls .get(name, 0  ) + 1
+
+    def count(self, name: str, value: float = 1) -> None:
+        with self.__lock:
+            self.__counters[name] = self.__counters.get(name, 0) + value
+
+    @property
+    def measurements(self) -> Measurements:
+        with self.__lock:
+            return Measurements(
+                timers   = dict(self.__timers  ),
+                calls    = dict(self.__calls   ),
+                counters = dict(self.__counters)
+            )
+
+
+class _Timer:
+    def __init__(self, recorder: Recorder, name: str) -> None:
+        self.__recorder = recorder
+        self.__name     = name
+        self.__start    = 0.0
+
+    def __enter__(self):
+        self.__start = self.__recorder.clock()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.__recorder.time(self.__name, self.__recorder.clock() - self.__start)
+
+
+class _NoOp:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+_NOOP = _NoOp()
+
+_instrumentation: Optional['Instrumentation'] = None
+_recorder       : Optional[Recorder]          = None
+
+
+def timer(name: str):
+    """A context manager that adds the time spent in its block to the timer `name` of the current invocation.
+
+    When no invocation is being measured, the same do-nothing context manager is returned every time.
+    """
+    return _NOOP if _recorder is None else _Timer(_recorder, name)
+
+
+def count(name: str, value: float = 1) -> None:
+    """Add `value` to the counter `name` of the current invocation, if one is being measured."""
+    if _recorder is not None:
+        _recorder.count(name, value)
+
+
+class Instrumentation:
+    """Measures Lambda invocations and writes one metrics line per invocation in CloudWatch's embedded metric format.
+
+    Each line has the total duration of the invocation, the total time spent in every timer and the value of every
+    counter, with the name of the handler as the only dimension. `ColdStart` is `1` for the first invocation in a
+    Lambda container and `0` otherwise. A line is emitted whether or not the invocation raised an exception;
+    invocations that did also count one `Errors`.
+    """
+
+    def __init__(self,
+                 namespace: str,
+                 sink     : Callable[[str], None] = print,
+                 clock    : Callable[[], float]   = time.perf_counter,
+                 now      : Callable[[], float]   = time.time) -> None:
+        """Create a new instance of the :obj:`Instrumentation` class.
+
+        Args:
+            namespace: The CloudWatch namespace the metrics are published to.
+            sink: Function that writes a metrics line; Lambda sends standard output to CloudWatch Logs, which
+                extracts the metrics.
+            clock: Function returning a monotonic time in seconds, used to measure durations.
+            now: Function returning the current time in seconds since the epoch, used to timestamp metrics.
+        """
+        self.__namespace: str                   = namespace
+        self.__sink     : Callable[[str], None] = sink
+        self.__clock    : Callable[[], float]   = clock
+        self.__now      : Callable[[], float]   = now
+
+    def line(self, handler: str, measurements: Measurements) -> str:
+        """Format the measurements of one invocation as an embedded metric format log line."""
+        units = dict(
+            [(name, 'Milliseconds') for name in measurements.timers] +
+            [(name, 'Count'       ) for name in measurements.counters]
+        )
+        return fastjson.dumps(dict(
+            {
+                '_aws': {
+                    'Timestamp'        : int(self.__now() * 1000),
+                    'CloudWatchMetrics': [{
+                        'Namespace' : self.__namespace,
+                        'Dimensions': [['Handler']],
+                        'Metrics'   : [{'Name': name, 'Unit': unit} for name, unit in units.items()]
+                    }]
+                },
+                'Handler': handler,
+                'Calls'  : measurements.calls
+            },
+            **measurements.timers,
+            **measurements.counters
+        ))
+
+    def invocation(self, handler: str, cold: bool) -> '_Invocation':
+        recorder = Recorder(self.__clock)
+        recorder.count('ColdStart', 1 if cold else 0)
+        return _Invocation(self, handler, recorder)
+
+    def emit(self, handler: str, measurements: Measurements) -> None:
+        self.__sink(self.line(handler, measurements))
+
+
+class _Invocation:
+    def __init__(self, instrumentation: Instrumentation, handler: str, recorder: Recorder) -> None:
+        self.__instrumentation = instrumentation
+        self.__handler         = handler
+        self.__recorder        = recorder
+        self.__timer           = _Timer(recorder, 'Duration')
+
+    def __enter__(self):
+        global _recorder
+        _recorder = self.__recorder
+        self.__timer.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global _recorder
+        self.__timer.__exit__(exc_type, exc_value, traceback)
+        if exc_type is not None:
+            self.__recorder.count('Errors')
+        _recorder = None
+        self.__instrumentation.emit(self.__handler, self.__recorder.measurements)
+
+
+def configure(instrumentation: Optional[Instrumentation]) -> None:
+    """Measure every following Lambda invocation with `instrumentation`, or stop measuring invocations if it is
+    `None`."""
+    global _instrumentation
+    _instrumentation = instrumentation
+
+
+def invocation(handler: str, cold: bool = False):
+    """A context manager that measures one Lambda invocation of the handler named `handler`.
+
+    Does nothing if no :obj:`Instrumentation` is configured, or if an invocation is already being measured.
+
+    Args:
+        handler: The name of the invoked handler.
+        cold: Whether the invocation is the first in its Lambda container, reported as the `ColdStart` counter.
+    """
+    return _NOOP if _instrumentation is None or _recorder is not None else _instrumentation.invocation(handler, cold)
@@ -1,11 +1,13 @@
 from collections import namedtuple
 from functools import partial
-from typing import Generic, Callable, Dict, Any, Union, Type, Optional, Mapping, TypeVar
+from typing import Generic, Callable, Dict, Any, Union, Type, Optional, Mapping, TypeVar, Tuple, List, Sequence
 
-from marshmallow import Schema, post_load
-from marshmallow.fields import Field, Nested
-from toolz import merge, valfilter
+from marshmallow import Schema, ValidationError, post_load, missing
+from marshmallow.fields import Field, Nested, Number, String, Boolean
+from marshmallow.utils import is_collection
+from toolz import merge, valfilter, keyfilter
 
+from wedding.general.functional import option
 from wedding.general.functional.option import not_none
 
 
@@ -29,12 +31,37 @@ class JsonDecoder(Generic[V], Callable[[Json], V]):
         return self.__decode(value)
 
 
+FieldCodec = namedtuple('FieldCodec', ['attribute', 'encode', 'read'])
+"""Converts one attribute of a value to and from JSON.
+
+Attributes:
+    attribute: The name of the attribute of the value.
+    encode: Encodes the attribute.
+    read: Reads the attribute from trusted JSON, applying its default; returns `marshmallow.missing` if the JSON has no
+        value for it and there is no default.
+"""
+
+
 class JsonCodec(Generic[V]):
     def __init__(self,
-                 encode: JsonEncoder[V],
-                 decode: JsonDecoder[V]) -> None:
-        self.__encode = encode
-        self.__decode = decode
+                 encode        : JsonEncoder[V],
+                 decode        : JsonDecoder[V],
+                 decode_trusted: Optional[JsonDecoder[V]]          = None,
+                 fields        : Optional[Mapping[str, FieldCodec]] = None) -> None:
+        """Create a new instance of the :obj:`JsonCodec` class.
+
+        Args:
+            encode: Encodes values to JSON.
+            decode: Decodes and validates JSON from any source.
+            decode_trusted: Decodes JSON that this codec encoded, such as items read back from our own tables, possibly
+                without validating it. Defaults to `decode`.
+            fields: Codecs for the attributes of values, keyed by their names in JSON. Without them, partial encoding
+                encodes whole values and drops the attributes that were not asked for.
+        """
+        self.__encode         = encode
+        self.__decode         = decode
+        self.__decode_trusted = decode_trusted or decode
+        self.__fields         = fields
 
     def encode(self, value: V) -> Json:
         return self.__encode(value)
@@ -42,8 +69,212 @@ class JsonCodec(Generic[V]):
     def decode(self, value: Json) -> V:
         return self.__decode(value)
 
+    def decode_trusted(self, value: Json) -> V:
+        return self.__decode_trusted(value)
+
+    @property
+    def field_names(self) -> Optional[List[str]]:
+        """The names in JSON of the attributes of values, if they are known."""
+        return option.fmap(list)(self.__fields)
+
+    def encode_partial(self, value: V, names: Sequence[str]) -> Json:
+        """Encode only some attributes of a value.
+
+        Args:
+            value: The value to encode.
+            names: The names in JSON of the attributes to encode. Unknown names are ignored.
+        """
+        if self.__fields is None:
+            return keyfilter(lambda name: name in names, self.encode(value))
+        return {
+            name: self.__fields[name].encode(getattr(value, self.__fields[name].attribute))
+            for name in names
+            if name in self.__fields
+        }
+
+    def reencode_partial(self, item: Json, names: Sequence[str]) -> Json:
+        """Convert some attributes of trusted JSON into what :meth:`encode_partial` gives for them.
+
+        This is how items read with a projection are encoded. Attributes with no value and no default are left out.
+
+        Args:
+            item: The JSON, which may hold only some attributes of a value.
+            names: The names in JSON of the attributes to convert. Unknown names are ignored.
+        """
+        if self.__fields is None:
+            return keyfilter(lambda name: name in names, item)
+
+        partial = {}
+        for name in names:
+            field = self.__fields.get(name)
+            value = missing if field is None else field.read(item)
+            if value is not missing:
+                partial[name] = field.encode(value)
+        return partial
+
+
+def _dumper(attr: str, field: Field) -> Callable[[Any], Any]:
+    serialize = field._serialize
+
+    if isinstance(field, Nested) and _compilable(field.schema):
+        encode, _ = _compile(field.schema)
+        return (
+            (lambda v: None if v is None else [encode(e) for e in v]) if field.many else
+            (lambda v: None if v is None else encode(v))
+        )
+    if isinstance(field, Number) and field.as_string:
+        return lambda v: None if v is None else str(serialize(v, attr, None))
+    if type(field) is String:
+        return lambda v: v if type(v) is str else serialize(v, attr, None)
+    return lambda v: serialize(v, attr, None)
+
+
+def _converter(attr: str, field: Field, validate: bool) -> Callable[[Any], Any]:
+    deserialize = field._deserialize
+
+    if isinstance(field, Nested) and _compilable(field.schema):
+        _, decode = _compile(field.schema, validate)
+        if not field.many:
+            return decode
+        if not validate:
+            return lambda v: [decode(e) for e in v]
+
+        def decode_many(values):
+            if not is_collection(values):
+                field.fail('type', input = values, type = values.__class__.__name__)
+            decoded = []
+            for index, value in enumerate(values):
+                try:
+                    decoded.append(decode(value))
+                except ValidationError as error:
+                    raise ValidationError({index: error.messages})
+            return decoded
+        return decode_many
+    if not validate and type(field) in (String, Boolean):
+        return lambda v: v
+    if type(field) is String:
+        return lambda v: v if type(v) is str else deserialize(v, attr, None)
+    return lambda v: deserialize(v, attr, None)
+
+
+def _loader(attr: str, field: Field, validate: bool) -> Callable[[Any], Any]:
+    convert = _converter(attr, field, validate)
+    if not validate:
+        return lambda v: None if v is None else convert(v)
+
+    allow_none = field.allow_none is True
+    validators = field.validators
+
+    def load(value):
+        if value is None:
+            if allow_none:
+                return None
+            field.fail('null')
+        value = convert(value)
+        if validators:
+            field._validate(value)
+        return value
+    return load
+
+
+def _compilable(schema: Schema) -> bool:
+    return hasattr(schema, '_namedtuple') and not schema.only and not schema.exclude
+
+
+def _reader(name: str, load_from: Optional[str], default, load: Callable[[Any], Any]) -> Callable[[Json], Any]:
+    def read(data):
+        raw = data.get(name, missing)
+        if raw is missing and load_from:
+            raw = data.get(load_from, missing)
+        if raw is missing:
+            raw = default() if callable(default) else default
+        return raw if raw is missing else load(raw)
+    return read
+
+
+def _compile_fields(schema: Schema) -> Dict[str, FieldCodec]:
+    """Generate a codec for each attribute of a schema made by :func:`build`, keyed by its name in JSON."""
+    return {
+        field.dump_to or attr: FieldCodec(
+            field.attribute or attr,
+            _dumper(attr, field),
+            _reader(attr, field.load_from, field.missing, _loader(attr, field, validate = False))
+        )
+        for attr, field in schema.fields.items()
+        if not field.load_only and not field.dump_only
+    }
+
+
+def _compile(schema: Schema, validate: bool = True) -> Tuple[Callable[[Any], Json], Callable[[Json], Any]]:
+    """Generate functions that give the same results as `schema.dump` and `schema.load`.
+
+    Args:
+        schema: An instance of a schema made by :func:`build`.
+        validate: Whether the decode function validates its input. Without validation, values are only converted where
+            their JSON form differs from their Python form, and null checks and field validators are skipped; this is
+            only safe for JSON made by the encode function.
+
+    Returns:
+        An encode function and a decode function. The decode function raises a :obj:`ValidationError` for the first
+        invalid field it finds, including fields which have no value and no default.
+    """
+    make = schema._namedtuple
+
+    dumpers = [
+        (field.attribute or attr, field.dump_to or attr, _dumper(attr, field))
+        for attr, field in schema.fields.items()
+        if not field.load_only
+    ]
+    loaders = [
+        (field.attribute or attr, attr, field.load_from, field.missing, _loader(attr, field, validate))
+        for attr, field in schema.fields.items()
+        if not field.dump_only
+    ]
+
+    def encode(value):
+        return {key: dump(getattr(value, attr)) for attr, key, dump in dumpers}
+
+    def decode(data):
+        if not isinstance(data, Mapping):
+            raise ValidationError({'_schema': ['Invalid input type.']})
+
+        values = {}
+        for attr, name, load_from, default, load in loaders:
+            raw = data.get(name, missing)
+            if raw is missing and load_from:
+                raw = data.get(load_from, missing)
+            if raw is missing:
+                raw = default() if callable(default) else default
+            if raw is missing:
+                raise ValidationError({load_from or name: ['Missing data for required field.']})
+            try:
+                values[attr] = load(raw)
+            except ValidationError as error:
+                raise ValidationError({load_from or name: error.messages})
+        return make(**values)
+
+    return encode, decode
+
+
+def codec(schema: Schema, compiled: bool = True) -> JsonCodec[V]:
+    """Create a codec that converts values to and from JSON with a schema.
+
+    Strict schemas made by :func:`build` are compiled into plain functions that give the same results as the schema's
+    own `dump` and `load` methods without going through marshmallow for every value. Other schemas, and any schema
+    when `compiled` is `False`, use marshmallow directly, which reports every invalid field rather than the first.
+
+    The trusted decoder of a compiled codec skips type checks, null checks and field validators, so it must only be
+    used for JSON that the codec encoded itself.
+
+    Args:
+        schema: The schema to convert values with.
+        compiled: Whether to compile the schema if possible.
+    """
+    if compiled and schema.strict and _compilable(schema):
+        encode, decode    = _compile(schema)
+        _, decode_trusted = _compile(schema, validate = False)
+        return JsonCodec[V](encode, decode, decode_trusted, _compile_fields(schema))
 
-def codec(schema: Schema) -> JsonCodec[V]:
     return JsonCodec[V](
         lambda v: schema.dump(v).data,
         lambda j: schema.load(j).data
@@ -99,7 +330,7 @@ def build(name: str,
     schema: Type[Schema] = type(
         '{}Schema'.format(name),
         (Schema,),
-        {**fields, '_to_namedtuple': to_namedtuple}
+        {**fields, '_to_namedtuple': to_namedtuple, '_namedtuple': cls}
     )
 
     return cls, schema
\ No newline at end of file
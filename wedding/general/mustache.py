@@ -0,0 +1,55 @@
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import pystache
+from pystache.parsed import ParsedTemplate
+
+from wedding.general import metrics
+
+
+class TemplateRenderer:
+    """Renders mustache templates, parsing each distinct template only once.
+
+    Parsed templates are kept in a bounded least-recently-used cache keyed by the template's content, so templates
+    that are re-fetched or re-built for every request are still parsed only once per Lambda container.
+    """
+
+    def __init__(self, max_templates: int = 64) -> None:
+        """Create a new instance of the :obj:`TemplateRenderer` class.
+
+        Args:
+            max_templates: The maximum number of parsed templates to keep in memory.
+        """
+        self.__max_templates: int                       = max_templates
+        self.__parsed       : Dict[str, ParsedTemplate] = OrderedDict()
+        self.__renderer     : pystache.Renderer         = pystache.Renderer()
+
+    def parse(self, template: str) -> ParsedTemplate:
+        """Get the parsed form of a template, parsing it if it has not been seen recently."""
+        parsed = self.__parsed.get(template)
+
+        if parsed is None:
+            parsed = pystache.parse(template)
+            self.__parsed[template] = parsed
+            if len(self.__parsed) > self.__max_templates:
+                self.__parsed.popitem(last = False)
+        else:
+            self.__parsed.move_to_end(template)
+
+        return parsed
+
+    def render(self, template: str, context: Optional[Dict[str, Any]] = None) -> str:
+        """Render a template; equivalent to :func:`pystache.render`."""
+        with metrics.timer('Render'):
+            return self.__renderer.render(self.parse(template), context)
+
+
+_renderer = TemplateRenderer()
+
+
+def render(template: str, context: Optional[Dict[str, Any]] = None) -> str:
+    """Render a template with the shared :obj:`TemplateRenderer`.
+
+    A drop-in replacement for :func:`pystache.render` that parses each template only once.
+    """
+    return _renderer.render(template, context)
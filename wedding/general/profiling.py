@@ -0,0 +1,161 @@
+import logging
+import marshal
+import os
+import random
+import time
+from abc import ABC, abstractmethod
+from collections import namedtuple
+from typing import Callable, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pstats
+
+# cProfile and pstats are only imported once an invocation is sampled, so they add nothing to cold starts
+
+
+ProfileTag = namedtuple('ProfileTag', ['handler', 'cold', 'timestamp'])
+"""Identifies a profiled invocation.
+
+Attributes:
+    handler: The name of the handler that was invoked.
+    cold: Whether the invocation was the first in its Lambda container.
+    timestamp: When the invocation started, in seconds since the epoch.
+"""
+
+
+def profile_name(tag: ProfileTag) -> str:
+    """A file name for the profile of an invocation, e.g. `RsvpHandler-warm-1538352000123.pstats`."""
+    return f'{tag.handler}-{"cold" if tag.cold else "warm"}-{int(tag.timestamp * 1000)}.pstats'
+
+
+def dumps(stats: 'pstats.Stats') -> bytes:
+    """Serialize profile statistics in the format written by :meth:`pstats.Stats.dump_stats`."""
+    return marshal.dumps(stats.stats)
+
+
+class ProfileSink(ABC):
+    """A place profiles of invocations are written to."""
+
+    @abstractmethod
+    def write(self, tag: ProfileTag, stats: 'pstats.Stats') -> None:
+        """Write the profile of one invocation.
+
+        Args:
+            tag: Identifies the invocation that was profiled.
+            stats: The profile, aggregated by function.
+        """
+        pass
+
+
+class DirectoryProfileSink(ProfileSink):
+    """Profile sink that writes each profile to a file in a local directory, in :mod:`pstats` format.
+
+    Only the most recent profiles are kept, so the directory does not grow without bound. Meant for running handlers
+    locally: profiles written to the storage of a Lambda container can't be read.
+    """
+
+    def __init__(self, directory: str, max_profiles: int = 100) -> None:
+        """Create a new instance of the :obj:`DirectoryProfileSink` class.
+
+        Args:
+            directory: The directory to write profiles to.
+            max_profiles: The number of profiles to keep. Older profiles are deleted as new ones are written.
+        """
+        self.__directory   : str = directory
+        self.__max_profiles: int = max_profiles
+
+    def write(self, tag: ProfileTag, stats: 'pstats.Stats') -> None:
+        os.makedirs(self.__directory, exist_ok = True)
+        stats.dump_stats(os.path.join(self.__directory, profile_name(tag)))
+
+        profiles = sorted(
+            (os.path.join(self.__directory, name) for name in os.listdir(self.__directory) if name.endswith('.pstats')),
+            key = lambda path: (os.path.getmtime(path), path)
+        )
+        for path in profiles[:max(0, len(profiles) - self.__max_profiles)]:
+            os.remove(path)
+
+
+class _NoOp:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+_NOOP = _NoOp()
+
+_profiler: Optional['Profiler'] = None
+_active  : bool                 = False
+
+
+class Profiler:
+    """Profiles a random sample of Lambda invocations with :mod:`cProfile`."""
+
+    def __init__(self,
+                 sink  : ProfileSink,
+                 rate  : float,
+                 sample: Callable[[], float] = random.random,
+                 now   : Callable[[], float] = time.time) -> None:
+        """Create a new instance of the :obj:`Profiler` class.
+
+        Args:
+            sink: Where profiles are written.
+            rate: The fraction of invocations to profile, between `0` and `1`.
+            sample: Function returning a uniformly distributed number in `[0, 1)`.
+            now: Function returning the current time in seconds since the epoch.
+        """
+        self.__sink  : ProfileSink         = sink
+        self.__rate  : float               = rate
+        self.__sample: Callable[[], float] = sample
+        self.__now   : Callable[[], float] = now
+
+    def invocation(self, handler: str, cold: bool):
+        return (
+            _Invocation(self.__sink, ProfileTag(handler, cold, self.__now())) if self.__sample() < self.__rate else
+            _NOOP
+        )
+
+
+class _Invocation:
+    def __init__(self, sink: ProfileSink, tag: ProfileTag) -> None:
+        self.__sink    = sink
+        self.__tag     = tag
+        import cProfile
+        self.__profile = cProfile.Profile()
+
+    def __enter__(self):
+        global _active
+        _active = True
+        self.__profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        import pstats
+        global _active
+        self.__profile.disable()
+        _active = False
+        try:
+            self.__sink.write(self.__tag, pstats.Stats(self.__profile))
+        except Exception:
+            # Losing a profile must not fail the invocation that was profiled
+            logging.getLogger(__name__).warning(f'Failed to write profile of {self.__tag}', exc_info = True)
+
+
+def configure(profiler: Optional[Profiler]) -> None:
+    """Sample every following Lambda invocation with `profiler`, or stop profiling if it is `None`."""
+    global _profiler
+    _profiler = profiler
+
+
+def invocation(handler: str, cold: bool):
+    """A context manager that profiles one Lambda invocation of the handler named `handler`, if it is sampled.
+
+    Does nothing if no :obj:`Profiler` is configured, or if an invocation is already being profiled.
+
+    Args:
+        handler: The name of the invoked handler.
+        cold: Whether the invocation is the first in its Lambda container.
+    """
+    return _NOOP if _profiler is None or _active else _profiler.invocation(handler, cold)
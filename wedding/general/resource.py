@@ -1,35 +1,174 @@
-from typing import TypeVar, Iterable
+from typing import TypeVar, Iterable, Mapping, Callable, Any, Optional, Sequence, Union, List
+
+from toolz.dicttoolz import dissoc
+from toolz.itertoolz import unique
 
 from wedding.general.aws.rest.lambda_resource import RestResource
 from wedding.general.aws.rest import responses
+from wedding.general.aws.rest.ndjson import Lines, LineError
+from wedding.general.aws.rest.responses import HttpResponse
+from wedding.general import fastjson
 from wedding.general.model import JsonCodec, Json
-from wedding.general.store import Store
+from wedding.general.filters import Filter, InvalidFilter, parse_filters
+from wedding.general.store import Store, WriteReport, InvalidCursor
+from wedding.general.functional import option
 
 
 _A = TypeVar('_A')
 
 
+def _report_body(report: WriteReport, invalid: Sequence[LineError] = ()) -> str:
+    return fastjson.dumps(dict(
+        {
+            'succeeded': report.succeeded,
+            'failed'   : [{'key': key, 'error': reason} for key, reason in report.failed]
+        },
+        **({'invalid': [{'line': line, 'error': error} for line, error in invalid]} if invalid else {})
+    ), default = str)
+
+
 class StoreBackedResource(RestResource[_A]):
+    IDS_PARAMETER    = 'ids'
+    LIMIT_PARAMETER  = 'limit'
+    CURSOR_PARAMETER = 'cursor'
+    FIELDS_PARAMETER = 'fields'
+    MAX_LIMIT        = 1000
+
     def __init__(self,
-                 store: Store[str, _A],
-                 codec: JsonCodec[_A]) -> None:
+                 store    : Store[str, _A],
+                 codec    : JsonCodec[_A],
+                 filters  : Optional[Mapping[str, Callable[[str], Any]]] = None,
+                 key_field: str                                          = 'id') -> None:
+        """Create a new instance of the :obj:`StoreBackedResource` class.
+
+        Args:
+            store: The store to serve values from.
+            codec: Encodes and decodes values to and from request and response bodies.
+            filters: The attributes that collection GETs can filter on, each with a function that parses operands from
+                a query string; see :func:`wedding.general.filters.parse_filters`. Query string parameters other
+                than `ids`, `limit`, `cursor` and `fields` are filters, which are ignored when `ids` is given.
+                Collection DELETEs take the same filters.
+            key_field: The name in JSON of the attribute that holds the key of each value.
+        """
         super().__init__(codec)
-        self._store = store
+        self._store      = store
+        self.__codec     = codec
+        self.__filters   = filters or {}
+        self.__key_field = key_field
+
+    def _warm(self) -> None:
+        self._store.warm()
 
-    def _get(self, key: str):
-        return self._store.get(key) or responses.NotFound(f'No record with key {key}')
+    def __reader(self, query: Json) -> Union[Store[str, _A], Store[str, Json], HttpResponse]:
+        """The store to read from: a projection of the store if the `fields` parameter names attributes to read."""
+        fields = query.get(self.FIELDS_PARAMETER)
+        if fields is None:
+            return self._store
+
+        names   = list(unique(filter(None, fields.split(','))))
+        unknown = [name for name in names if name not in (self.__codec.field_names or names)]
+        return (
+            responses.BadRequest(f'Unknown {self.FIELDS_PARAMETER}: {", ".join(unknown)}') if unknown or not names else
+            self._store.project(names, self.__codec)
+        )
+
+    def _get(self, key: str, query: Json):
+        store = self.__reader(query)
+        if isinstance(store, HttpResponse):
+            return store
+        return store.get(key) or responses.NotFound(f'No record with key {key}')
 
     def _get_many(self, query: Json):
-        return self._store.get_all()
+        store = self.__reader(query)
+        if isinstance(store, HttpResponse):
+            return store
+
+        try:
+            filters = self.__parse_filters(query)
+        except InvalidFilter as error:
+            return responses.BadRequest(str(error))
+
+        return option.cata(
+            lambda ids: store.get_many(ids.split(',')),
+            lambda: self.__get_page(store, query, filters)
+        )(query.get(self.IDS_PARAMETER))
+
+    def __parse_filters(self, query: Json) -> List[Filter]:
+        return parse_filters(
+            dissoc(query, self.IDS_PARAMETER, self.LIMIT_PARAMETER, self.CURSOR_PARAMETER, self.FIELDS_PARAMETER),
+            self.__filters
+        )
+
+    def __get_page(self, store: Store, query: Json, filters: Sequence[Filter]):
+        """Get one page of the collection. Pages hold at most :attr:`MAX_LIMIT` items, whatever `limit` is given, and
+        :attr:`MAX_LIMIT` items if no `limit` is given, so no GET reads a whole large collection at once."""
+        try:
+            limit = int(query.get(self.LIMIT_PARAMETER) or self.MAX_LIMIT)
+        except ValueError:
+            return responses.BadRequest(f'{self.LIMIT_PARAMETER} must be an integer')
+        if limit <= 0:
+            return responses.BadRequest(f'{self.LIMIT_PARAMETER} must be positive')
+
+        try:
+            return store.get_page(min(limit, self.MAX_LIMIT), query.get(self.CURSOR_PARAMETER), filters)
+        except InvalidCursor:
+            return responses.BadRequest(f'Invalid {self.CURSOR_PARAMETER}')
 
     def _post(self, a: _A):
         self._store.put(a)
         return responses.Created()
 
     def _post_many(self, a: Iterable[_A]):
-        self._store.put_all(a)
-        return responses.Created()
+        report = self._store.put_all(a)
+        return (
+            responses.MultiStatus(_report_body(report)) if report.failed else
+            responses.Created    (_report_body(report))
+        )
+
+    def _post_lines(self, lines: Lines[_A]):
+        """Put the valid lines of a newline-delimited JSON body with the store's batch writer, as they are decoded.
+
+        The response reports the keys that were and were not written, and, under `invalid`, the number of every line
+        that could not be decoded and why.
+        """
+        report = self._store.put_all(lines)
+        return (
+            responses.MultiStatus(_report_body(report, lines.errors)) if report.failed or lines.errors else
+            responses.Created    (_report_body(report))
+        )
 
     def _delete(self, key: str):
         self._store.delete(key)
         return responses.NoContent()
+
+    def __keys(self, filters: Sequence[Filter]) -> List[str]:
+        # Only the keys are read, and all of them before anything is deleted, so deletes don't disturb the scan
+        return [
+            value[self.__key_field]
+            for value in self._store.project([self.__key_field], self.__codec).find(filters)
+        ]
+
+    def _delete_many(self, query: Json):
+        """Delete the values whose keys are listed in the `ids` parameter, or else every value that the filters in
+        the other parameters match, with the store's bulk deleter.
+
+        A DELETE with neither is rejected rather than deleting the whole collection. The response reports the keys
+        that were and were not deleted.
+        """
+        try:
+            filters = self.__parse_filters(query)
+        except InvalidFilter as error:
+            return responses.BadRequest(str(error))
+
+        keys = option.cata(
+            lambda ids: ids.split(','),
+            lambda: self.__keys(filters) if filters else None
+        )(query.get(self.IDS_PARAMETER))
+        if keys is None:
+            return responses.BadRequest(f'Give {self.IDS_PARAMETER} or a filter to delete many records')
+
+        report = self._store.delete_all(keys)
+        return (
+            responses.MultiStatus(_report_body(report)) if report.failed else
+            responses.Ok         (_report_body(report))
+        )
@@ -1,36 +1,212 @@
 from abc import ABC, abstractmethod
-from typing import TypeVar, Generic, Iterable, Callable, Optional
+from collections import namedtuple
+from itertools import islice
+from typing import TypeVar, Generic, Iterable, Callable, Optional, Sequence
 
+from wedding.general.filters import Filter, matches
+from wedding.general.model import JsonCodec, Json
 from wedding.general.functional import option
 
 K = TypeVar('K')
 V = TypeVar('V')
 
 
+WriteReport = namedtuple('WriteReport', ['succeeded', 'failed'])
+"""The outcome of a bulk write. Keys are reported as the store's callers pass them, not as the store encodes them.
+
+Attributes:
+    succeeded: The keys of the values that were written.
+    failed: A `(key, reason)` pair for each value that could not be written.
+"""
+
+
+Page = namedtuple('Page', ['items', 'cursor'])
+"""One page of the values in a store.
+
+Attributes:
+    items: The values on the page.
+    cursor: An opaque string that gets the next page when passed to :meth:`Store.get_page`, or `None` if this is the
+        last page.
+"""
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor passed to :meth:`Store.get_page` was not returned by the same store."""
+
+
+class ReadOnlyStore(TypeError):
+    """Raised when a value is written to a read-only store, such as one made by :meth:`Store.project`."""
+
+
 class Store(ABC, Generic[K, V]):
 
     @abstractmethod
     def get(self, key: K) -> Optional[V]:
         pass
 
+    def get_many(self, keys: Iterable[K]) -> Iterable[V]:
+        """Get the values with the given keys, in no particular order.
+
+        Keys that have no value are skipped.
+        """
+        return filter(option.not_none, map(self.get, keys))
+
     @abstractmethod
     def get_all(self) -> Iterable[V]:
         pass
 
+    def find(self, filters: Sequence[Filter]) -> Iterable[V]:
+        """Get every value whose JSON form satisfies all of `filters`, in no particular order.
+
+        The default implementation reads every value with :meth:`get_all` and evaluates the filters against the JSON
+        form of each, as given by :meth:`_json`. Stores that can filter values as they read them should override it.
+        """
+        return (value for value in self.get_all() if matches(filters, self._json(value)))
+
+    def _json(self, value: V) -> Json:
+        """The JSON form of a value, that the default :meth:`find` evaluates filters against.
+
+        Values that are already JSON are their own JSON form; stores of other values override this.
+
+        Raises:
+            TypeError: If the value is not JSON.
+        """
+        if not isinstance(value, dict):
+            raise TypeError(f'{type(self).__name__} cannot filter values of type {type(value).__name__}')
+        return value
+
+    def get_page(self,
+                 limit  : Optional[int]    = None,
+                 cursor : Optional[str]    = None,
+                 filters: Sequence[Filter] = ()) -> Page:
+        """Get one page of the values returned by :meth:`get_all`, or by :meth:`find` if there are filters.
+
+        The default implementation skips over the values of the earlier pages, so stores that can start reading
+        part-way through should override it.
+
+        Args:
+            limit: The maximum number of values on the page. A page may hold fewer values even if it is not the last.
+            cursor: The cursor of the previous page, or `None` for the first page.
+            filters: Filters that every value on the page satisfies. Later pages must be read with the same filters.
+
+        Raises:
+            InvalidCursor: If `cursor` was not returned by this store.
+        """
+        try:
+            start = int(cursor or 0)
+        except ValueError:
+            raise InvalidCursor(cursor)
+        if start < 0:
+            raise InvalidCursor(cursor)
+
+        source = self.find(filters) if filters else self.get_all()
+        values = list(islice(source, start, None if limit is None else start + limit + 1))
+        if limit is None or len(values) <= limit:
+            return Page(values, None)
+        return Page(values[:limit], str(start + limit))
+
+    def project(self, names: Sequence[str], codec: JsonCodec[V]) -> 'Store[K, Json]':
+        """Get a read-only view of this store whose values are partial JSON.
+
+        The view's values hold only the attributes named `names`, encoded as :meth:`JsonCodec.encode_partial` encodes
+        them. The default implementation reads whole values and encodes part of them; stores that can read only some
+        attributes should override it.
+
+        Args:
+            names: The names in JSON of the attributes to read.
+            codec: The codec that encodes values of this store.
+        """
+        return _ProjectedStore(self, names, codec)
+
     @abstractmethod
     def put(self, value: V) -> None:
         pass
 
     @abstractmethod
-    def put_all(self, values: Iterable[V]) -> None:
+    def put_all(self, values: Iterable[V]) -> WriteReport:
         pass
 
     @abstractmethod
     def delete(self, key: K) -> None:
         pass
 
+    def delete_all(self, keys: Iterable[K]) -> WriteReport:
+        """Delete the values with the given keys. Deleting a key that has no value succeeds.
+
+        The default implementation deletes one key at a time; stores that can delete in bulk should override it.
+
+        Returns:
+            A report of the keys that were and were not deleted.
+        """
+        succeeded = []
+        for key in keys:
+            self.delete(key)
+            succeeded.append(key)
+        return WriteReport(succeeded, [])
+
+    def replace(self, key: K, expected: V, value: V) -> bool:
+        """Replace a stored value, provided it has not changed since it was read.
+
+        Args:
+            key: The key of the value to replace.
+            expected: The value that was read from the store.
+            value: The value to store in its place.
+
+        Returns:
+            `True` if the value was replaced, `False` if the stored value no longer equals `expected`.
+        """
+        if self.get(key) != expected:
+            return False
+        if value != expected:
+            self.put(value)
+        return True
+
     def modify(self, key: K, transform: Callable[[V], V]) -> Optional[V]:
-        value = option.fmap(transform)(self.get(key))
-        if value:
+        original = self.get(key)
+        value    = option.fmap(transform)(original)
+        if value is not None and value != original:
             self.put(value)
         return value
+
+    def warm(self) -> None:
+        """Prepare the store to serve requests, e.g. by opening connections, ahead of the first request."""
+        pass
+
+
+class _ProjectedStore(Store[K, Json]):
+    """The default implementation of :meth:`Store.project`."""
+
+    def __init__(self, store: Store[K, V], names: Sequence[str], codec: JsonCodec[V]) -> None:
+        self.__store  = store
+        self.__encode = lambda value: codec.encode_partial(value, names)
+
+    def get(self, key: K) -> Optional[Json]:
+        return option.fmap(self.__encode)(self.__store.get(key))
+
+    def get_many(self, keys: Iterable[K]) -> Iterable[Json]:
+        return map(self.__encode, self.__store.get_many(keys))
+
+    def get_all(self) -> Iterable[Json]:
+        return map(self.__encode, self.__store.get_all())
+
+    def find(self, filters: Sequence[Filter]) -> Iterable[Json]:
+        return map(self.__encode, self.__store.find(filters))
+
+    def get_page(self,
+                 limit  : Optional[int]    = None,
+                 cursor : Optional[str]    = None,
+                 filters: Sequence[Filter] = ()) -> Page:
+        page = self.__store.get_page(limit, cursor, filters)
+        return page._replace(items = [self.__encode(value) for value in page.items])
+
+    def put(self, value: Json) -> None:
+        raise ReadOnlyStore('Projected stores are read-only')
+
+    def put_all(self, values: Iterable[Json]) -> WriteReport:
+        raise ReadOnlyStore('Projected stores are read-only')
+
+    def delete(self, key: K) -> None:
+        raise ReadOnlyStore('Projected stores are read-only')
+
+    def delete_all(self, keys: Iterable[K]) -> WriteReport:
+        raise ReadOnlyStore('Projected stores are read-only')
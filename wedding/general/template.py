@@ -0,0 +1,147 @@
+import logging
+import os.path
+import time
+from abc import ABC, abstractmethod
+from collections import namedtuple
+from typing import Optional, Callable, Dict
+
+from wedding import TemplateResolver
+from wedding.general import metrics
+
+
+TemplateVersion = namedtuple('TemplateVersion', ['body', 'etag', 'last_modified'])
+"""A template body together with the validators used to revalidate it."""
+
+
+TemplateCacheStats = namedtuple('TemplateCacheStats', ['hits', 'misses', 'revalidations', 'refreshes'])
+"""Counters describing how a :obj:`TemplateCache` has served its templates.
+
+Attributes:
+    hits: Number of lookups served from memory without contacting the source.
+    misses: Number of lookups that fetched a template that was not cached.
+    revalidations: Number of conditional requests made for cached templates whose TTL had expired.
+    refreshes: Number of revalidations that found the template had changed.
+"""
+
+
+class TemplateSource(ABC):
+    """A place templates are loaded from."""
+
+    @abstractmethod
+    def fetch(self, key: str, current: Optional[TemplateVersion]) -> Optional[TemplateVersion]:
+        """Fetch a template, unless `current` is still up to date.
+
+        Args:
+            key: The key of the template to fetch.
+            current: The version of the template the caller already has, if any.
+
+        Returns:
+            The latest version of the template, or `None` if `current` is not `None` and has not been modified.
+        """
+        pass
+
+
+class DirectoryTemplateSource(TemplateSource):
+    """Template source that reads templates from a local directory."""
+
+    def __init__(self, directory: str) -> None:
+        self.__directory = directory
+
+    @staticmethod
+    def __etag(stat: os.stat_result) -> str:
+        return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+    def fetch(self, key: str, current: Optional[TemplateVersion]) -> Optional[TemplateVersion]:
+        path = os.path.join(self.__directory, key)
+        etag = self.__etag(os.stat(path))
+
+        if current is not None and current.etag == etag:
+            return None
+
+        with open(path, encoding = 'utf-8') as template_file:
+            return TemplateVersion(
+                body          = template_file.read(),
+                etag          = etag,
+                last_modified = None
+            )
+
+
+class TemplateCache:
+    def __init__(self,
+                 source: TemplateSource,
+                 ttl   : Optional[float]     = 60.0,
+                 clock : Callable[[], float] = time.monotonic) -> None:
+        """Create a new instance of the :obj:`TemplateCache` class.
+
+        Templates are kept in memory for the life of the instance, so a cache created at module level is shared by
+        every warm invocation of a Lambda function.
+
+        Args:
+            source: Where templates are loaded from.
+            ttl: Number of seconds a cached template is served before it is revalidated against `source`.
+                Use `0` to revalidate on every lookup, or `None` to never revalidate.
+            clock: Function returning the current time in seconds.
+        """
+        self.__source  : TemplateSource             = source
+        self.__ttl     : Optional[float]            = ttl
+        self.__clock   : Callable[[], float]        = clock
+        self.__versions: Dict[str, TemplateVersion] = {}
+        self.__checked : Dict[str, float]           = {}
+
+        self.__hits          = 0
+        self.__misses        = 0
+        self.__revalidations = 0
+        self.__refreshes     = 0
+
+    @property
+    def stats(self) -> TemplateCacheStats:
+        return TemplateCacheStats(
+            hits          = self.__hits,
+            misses        = self.__misses,
+            revalidations = self.__revalidations,
+            refreshes     = self.__refreshes
+        )
+
+    def __expired(self, key: str, now: float) -> bool:
+        return self.__ttl is not None and now - self.__checked[key] >= self.__ttl
+
+    def get(self, key: str) -> str:
+        """Get the body of a template, fetching or revalidating it if necessary.
+
+        If revalidating a cached template fails, the failure is logged and the cached template is served until it is
+        revalidated again, after another TTL. Only failing to fetch a template that is not cached raises.
+        """
+        now     = self.__clock()
+        current = self.__versions.get(key)
+
+        if current is None:
+            self.__misses += 1
+            with metrics.timer('TemplateFetch'):
+                latest = self.__source.fetch(key, None)
+        elif self.__expired(key, now):
+            self.__revalidations += 1
+            try:
+                with metrics.timer('TemplateFetch'):
+                    latest = self.__source.fetch(key, current)
+            except Exception:
+                logging.getLogger(__name__).warning(
+                    f'Failed to revalidate template {key}; serving the cached version',
+                    exc_info = True
+                )
+                latest = None
+            if latest is not None:
+                self.__refreshes += 1
+        else:
+            self.__hits += 1
+            metrics.count('TemplateCacheHits')
+            return current.body
+
+        if latest is not None:
+            self.__versions[key] = latest
+        self.__checked[key] = now
+
+        return self.__versions[key].body
+
+    def resolver(self, key: str) -> TemplateResolver:
+        """Create a :obj:`TemplateResolver` for the template with the given key."""
+        return lambda: self.get(key)
@@ -0,0 +1,162 @@
+from collections import namedtuple, OrderedDict
+from typing import TypeVar, Callable, Optional, Iterable, Dict, Sequence
+
+from toolz.functoolz import compose
+
+from wedding.general.filters import Filter
+from wedding.general.model import JsonCodec, Json
+from wedding.general.store import Store, WriteReport, Page
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+
+_Pending = namedtuple('_Pending', ['expected', 'transforms'])
+"""A queued write. `transforms` is `None` for writes that replace the stored value outright."""
+
+
+class UnitOfWork(Store[K, V]):
+    """An identity map and write queue over another store, scoped to a single request.
+
+    Each key is read from the underlying store at most once; later reads, and reads of values written through the
+    unit of work, are served from memory. Writes are queued and sent by :meth:`flush`, which is called when the unit
+    of work is used as a context manager and the block exits without an exception.
+
+    Values changed with :meth:`modify` are flushed with :meth:`Store.replace`, so only the changed attributes are
+    written and nothing is re-read. If another writer changed the value in the meantime, the queued transforms are
+    re-applied with :meth:`Store.modify`.
+    """
+
+    def __init__(self,
+                 store : Store[K, V],
+                 key_of: Callable[[V], K]) -> None:
+        """Create a new instance of the :obj:`UnitOfWork` class.
+
+        Args:
+            store: The store to read from and write to.
+            key_of: Function that gets the key of a value.
+        """
+        self._store   : Store[K, V]          = store
+        self.__key_of : Callable[[V], K]     = key_of
+        self.__values : Dict[K, Optional[V]] = {}
+        self.__pending: Dict[K, _Pending]    = OrderedDict()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+
+    def _known(self, key: K) -> bool:
+        """Whether the value with key `key`, or its absence, is already in memory."""
+        return key in self.__values
+
+    def _remember(self, key: K, value: Optional[V]) -> None:
+        """Record a value, or its absence, that was read from or written to the underlying store."""
+        self.__values[key] = value
+
+    def __write(self, key: K, value: Optional[V]) -> None:
+        self.__values [key] = value
+        self.__pending[key] = _Pending(None, None)
+
+    def get(self, key: K) -> Optional[V]:
+        if key not in self.__values:
+            self.__values[key] = self._store.get(key)
+        return self.__values[key]
+
+    def get_many(self, keys: Iterable[K]) -> Iterable[V]:
+        keys    = list(keys)
+        missing = [key for key in keys if key not in self.__values]
+        for key in missing:
+            self.__values[key] = None
+        for value in self._store.get_many(missing):
+            self.__values[self.__key_of(value)] = value
+
+        return [self.__values[key] for key in OrderedDict.fromkeys(keys) if self.__values[key] is not None]
+
+    def get_all(self) -> Iterable[V]:
+        """Get every value from the underlying store. Queued writes are not reflected."""
+        return self._store.get_all()
+
+    def find(self, filters: Sequence[Filter]) -> Iterable[V]:
+        """Find values in the underlying store. Queued writes are not reflected."""
+        return self._store.find(filters)
+
+    def get_page(self,
+                 limit  : Optional[int]    = None,
+                 cursor : Optional[str]    = None,
+                 filters: Sequence[Filter] = ()) -> Page:
+        """Get a page of values from the underlying store. Queued writes are not reflected."""
+        return self._store.get_page(limit, cursor, filters)
+
+    def project(self, names: Sequence[str], codec: JsonCodec[V]) -> Store[K, Json]:
+        """Get a read-only view of the underlying store that reads only some attributes. Queued writes are not
+        reflected."""
+        return self._store.project(names, codec)
+
+    def warm(self) -> None:
+        self._store.warm()
+
+    def put(self, value: V) -> None:
+        self.__write(self.__key_of(value), value)
+
+    def put_all(self, values: Iterable[V]) -> WriteReport:
+        """Put many values directly with the underlying store's bulk writer, bypassing the write queue."""
+        keys = []
+
+        def track(value: V) -> V:
+            keys.append(self.__key_of(value))
+            return value
+
+        try:
+            return self._store.put_all(map(track, values))
+        finally:
+            for key in keys:
+                self.__values .pop(key, None)
+                self.__pending.pop(key, None)
+
+    def delete(self, key: K) -> None:
+        self.__write(key, None)
+
+    def delete_all(self, keys: Iterable[K]) -> WriteReport:
+        """Delete many values directly with the underlying store's bulk deleter, bypassing the write queue."""
+        deleted = []
+
+        def track(key: K) -> K:
+            deleted.append(key)
+            return key
+
+        try:
+            return self._store.delete_all(map(track, keys))
+        finally:
+            for key in deleted:
+                self.__values .pop(key, None)
+                self.__pending.pop(key, None)
+
+    def modify(self, key: K, transform: Callable[[V], V]) -> Optional[V]:
+        original = self.get(key)
+        if original is None:
+            return None
+
+        value = transform(original)
+        if value != original:
+            pending = self.__pending.get(key, _Pending(original, []))
+            self.__values [key] = value
+            self.__pending[key] = (
+                pending if pending.transforms is None else
+                pending._replace(transforms = pending.transforms + [transform])
+            )
+        return value
+
+    def flush(self) -> None:
+        """Send all queued writes to the underlying store."""
+        for key, pending in self.__pending.items():
+            value = self.__values[key]
+            if value is None:
+                self._store.delete(key)
+            elif pending.transforms is None:
+                self._store.put(value)
+            elif not self._store.replace(key, pending.expected, value):
+                self.__values[key] = self._store.modify(key, compose(*reversed(pending.transforms)))
+        self.__pending.clear()
@@ -1,11 +1,10 @@
 import os.path
 
-import pystache
-
-from wedding.general.aws.rest import LambdaHandler
-from wedding.general.aws.rest.responses import TemporaryRedirect, HttpResponse, Ok
+from wedding.general import mustache
+from wedding.general.aws.rest import LambdaHandler, compression, etags
+from wedding.general.aws.rest.responses import TemporaryRedirect, HttpResponse, conditional
 from wedding.general.functional import option
-from wedding.model import PartyStore, EmailOpened, Party, CardClicked, advance_stage
+from wedding.model import PartyStore, EmailOpened, Party, CardClicked, PartyUnitOfWork
 from wedding import TemplateResolver
 
 
@@ -24,14 +23,15 @@ class EnvelopeImageHandler(LambdaHandler):
 
     def _handle(self, event):
         party_id = os.path.splitext(event['partyId'])[0]
-        self.__parties.modify(
-            party_id,
-            advance_stage(EmailOpened)
-        )
+        with PartyUnitOfWork(self.__parties) as parties:
+            parties.advance(party_id, EmailOpened)
         return {
             'location': self.__prefix + ('/' if not self.__prefix.endswith('/') else '') + f'{party_id}.png'
         }
 
+    def _warm(self) -> None:
+        self.__parties.warm()
+
 
 class InvitationHandler(LambdaHandler):
     def __init__(self,
@@ -48,11 +48,15 @@ class InvitationHandler(LambdaHandler):
         self.__parties     : PartyStore        = parties
         self.__redirect    : TemporaryRedirect = TemporaryRedirect(error_url)
         self.__get_template: TemplateResolver  = get_template
+        self.__fingerprint : etags.Fingerprint = etags.Fingerprint()
 
-    def __render_invitation(self, guest_id: str, party: Party) -> HttpResponse:
-        return Ok(
-            pystache.render(
-                self.__get_template(),
+    def __render_invitation(self, event, guest_id: str, party: Party) -> HttpResponse:
+        template = self.__get_template()
+        return conditional(
+            etags.if_none_match(event),
+            etags.strong(self.__fingerprint(template), party.id, guest_id),
+            lambda: mustache.render(
+                template,
                 {
                     'partyId': party.id,
                     'guestId': guest_id
@@ -60,16 +64,16 @@ class InvitationHandler(LambdaHandler):
             )
         )
 
+    def _warm(self) -> None:
+        self.__fingerprint(self.__get_template())
+        self.__parties.warm()
+
     def _handle(self, event):
         party_id = event['partyId']
         guest_id = event['guestId']
 
-        self.__parties.modify(
-            party_id,
-            advance_stage(CardClicked)
-        )
-
-        return option.cata(
-            lambda party: self.__render_invitation(guest_id, party),
-            lambda: self.__redirect
-        )(self.__parties.get(party_id)).as_json()
\ No newline at end of file
+        with PartyUnitOfWork(self.__parties) as parties:
+            return option.cata(
+                lambda party: self.__render_invitation(event, guest_id, party),
+                lambda: self.__redirect
+            )(parties.advance(party_id, CardClicked)).as_json(compression.accept_encoding(event))
\ No newline at end of file
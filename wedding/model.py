@@ -1,13 +1,17 @@
 from abc import ABC, abstractmethod
-from typing import Optional, Callable
+from collections import OrderedDict
+from typing import Optional, Callable, Mapping, Dict, Union
 
+from boto3.dynamodb.conditions import Attr
 from marshmallow import ValidationError
 from marshmallow.fields import String, Boolean, Integer, DateTime, Field
 from marshmallow.validate import Range
-from toolz.functoolz import excepts, curry, compose
+from toolz.functoolz import excepts, curry
 from toolz.itertoolz import first
 
 from wedding.general.aws.dynamodb import DynamoDbStore
+from wedding.general.caching import CachingStore
+from wedding.general.unit_of_work import UnitOfWork
 from wedding.general.functional.error_handling import throw
 from wedding.general.functional import option
 from wedding.general.model import JsonCodec, codec, required, optional, build, JsonEncoder
@@ -56,13 +60,12 @@ class RsvpStageField(Field):
         return value.shows
 
     def _deserialize(self, value, attr, data):
+        if not isinstance(value, str):
+            raise ValidationError(f'{attr} is of type {type(value).__name__}, expected a string')
         value = value.lower()
+        stage = _RsvpStagesByName.get(value)
         return (
-            RsvpSubmitted if value == RsvpSubmitted.shows.lower() else
-            CardClicked   if value == CardClicked  .shows.lower() else
-            EmailOpened   if value == EmailOpened  .shows.lower() else
-            EmailSent     if value == EmailSent    .shows.lower() else
-            NotInvited    if value == NotInvited   .shows.lower() else
+            stage if stage is not None else
             throw(ValidationError(f'"{value}" is not a recognized RSVP stage'))
         )
 
@@ -74,6 +77,10 @@ EmailSent     = RsvpStage.instance('EmailSent'    , 'email_sent'    , 1)
 NotInvited    = RsvpStage.instance('NotInvited'   , 'not_invited'   , 0)
 
 
+RsvpStages = [NotInvited, EmailSent, EmailOpened, CardClicked, RsvpSubmitted]
+_RsvpStagesByName = {stage.shows.lower(): stage for stage in RsvpStages}
+
+
 EmailAddress, EmailAddressSchema = build('EmailAddress', {
     'username': required(String),
     'hostname': required(String)
@@ -147,32 +154,122 @@ Driver, DriverSchema = build('Driver', {
 DriverCodec: JsonCodec[Driver] = codec(DriverSchema(strict=True))
 
 
-PartyStore = Store[str, Party]
+class PartyStore(Store[str, Party]):
+    def advance(self, party_id: str, to_stage: RsvpStage) -> Optional[Party]:
+        """Advance the RSVP stage of a stored party. A party's RSVP stage never moves backwards.
+
+        Args:
+            party_id: The ID of the party to update.
+            to_stage: The stage to advance the party to.
+
+        Returns:
+            The party after it has been advanced, or `None` if there is no party with ID `party_id`.
+        """
+        return self.modify(party_id, advance_stage(to_stage))
+
+
 DriverStore = Store[str, Driver]
 PassengerGroupStore = Store[str, PassengerGroup]
 
 
-def party_store(dynamo_table) -> PartyStore:
-    return DynamoDbStore[str, Party](
+class DynamoDbPartyStore(DynamoDbStore[str, Party], PartyStore):
+    RSVP_STAGE_ATTRIBUTE = 'rsvpStage'
+
+    def advance(self, party_id: str, to_stage: RsvpStage) -> Optional[Party]:
+        """Advance the RSVP stage of a stored party with a single conditional `UpdateItem` request.
+
+        Nothing is written if the party is already at or past `to_stage`; in that case the stored party is returned
+        from the failed request, without reading it again.
+        """
+        earlier_stages = [stage.shows for stage in RsvpStages if stage._index < to_stage._index]
+        if not earlier_stages:
+            return self.get(party_id)
+
+        stage = Attr(self.RSVP_STAGE_ATTRIBUTE)
+        return self.update(
+            party_id,
+            {self.RSVP_STAGE_ATTRIBUTE: to_stage.shows},
+            stage.not_exists() | stage.is_in(earlier_stages),
+            return_current = True
+        )
+
+
+class CachingPartyStore(CachingStore[str, Party], PartyStore):
+    def __init__(self, parties: PartyStore, **kwargs) -> None:
+        """Create a new instance of the :obj:`CachingPartyStore` class.
+
+        Args:
+            parties: The store to cache parties from.
+            **kwargs: Cache settings; see :obj:`CachingStore`.
+        """
+        super().__init__(parties, lambda party: party.id, **kwargs)
+
+    def advance(self, party_id: str, to_stage: RsvpStage) -> Optional[Party]:
+        try:
+            party = self._store.advance(party_id, to_stage)
+        except Exception:
+            self._invalidate(party_id)
+            raise
+        self._cache(party_id, party)
+        return party
+
+
+class PartyUnitOfWork(UnitOfWork[str, Party], PartyStore):
+    def __init__(self, parties: PartyStore) -> None:
+        """Create a new instance of the :obj:`PartyUnitOfWork` class.
+
+        Args:
+            parties: The store to read parties from and write parties to.
+        """
+        super().__init__(parties, lambda party: party.id)
+
+    def advance(self, party_id: str, to_stage: RsvpStage) -> Optional[Party]:
+        """Advance the RSVP stage of a party.
+
+        A party that has not been read yet is advanced immediately by the underlying store, which can do so without
+        reading it first. Otherwise the party is advanced in memory and written when the unit of work is flushed.
+        """
+        if self._known(party_id):
+            return self.modify(party_id, advance_stage(to_stage))
+
+        party = self._store.advance(party_id, to_stage)
+        self._remember(party_id, party)
+        return party
+
+
+def party_store(dynamo_table, workers: int = 1, scan_segments: Optional[int] = None) -> PartyStore:
+    return DynamoDbPartyStore(
         dynamo_table,
+        lambda party: party.id,
         JsonEncoder[str](lambda i: {'id': i}),
-        PartyCodec
+        PartyCodec,
+        workers       = workers,
+        scan_segments = scan_segments,
+        trusted       = True
     )
 
 
-def driver_store(dynamo_table) -> DriverStore:
+def driver_store(dynamo_table, workers: int = 1, scan_segments: Optional[int] = None) -> DriverStore:
     return DynamoDbStore[str, Driver](
         dynamo_table,
+        lambda driver: driver.id,
         JsonEncoder[str](lambda i: {'id': i}),
-        DriverCodec
+        DriverCodec,
+        workers       = workers,
+        scan_segments = scan_segments,
+        trusted       = True
     )
 
 
-def passenger_group_store(dynamo_table) -> PassengerGroupStore:
+def passenger_group_store(dynamo_table, workers: int = 1, scan_segments: Optional[int] = None) -> PassengerGroupStore:
     return DynamoDbStore[str, PassengerGroup](
         dynamo_table,
+        lambda group: group.id,
         JsonEncoder[str](lambda i: {'id': i}),
-        PassengerGroupCodec
+        PassengerGroupCodec,
+        workers       = workers,
+        scan_segments = scan_segments,
+        trusted       = True
     )
 
 
@@ -201,6 +298,37 @@ def remove_guest(guest_id: str,
     return party._replace(guests = [g for g in party.guests if g.id != guest_id])
 
 
+def guests_by_id(party: Party) -> Dict[str, Guest]:
+    """Index the guests of a party by their IDs, in the order they appear in the party.
+
+    The index is a new :obj:`OrderedDict`, so setting a guest that is already in it keeps the guest's position, and
+    adding a guest puts it last.
+    """
+    return OrderedDict((guest.id, guest) for guest in party.guests)
+
+
+@curry
+def modify_guests(updates: Union[Callable[[Guest], Guest], Mapping[str, Callable[[Guest], Guest]]],
+                  party: Party) -> Party:
+    """Create a function that modifies many guests of a party in a single pass.
+
+    Args:
+        updates: A function that modifies every guest, or functions that modify guests, keyed by the ID of the guest
+            each one applies to. IDs of guests that are not in the party are ignored.
+        party: The party whose guests to modify.
+
+    Returns:
+        A new :obj:`Party` instance, equivalent to `party` except with each guest in `updates` modified. Guests keep
+        their order.
+    """
+    if callable(updates):
+        return party._replace(guests = [updates(guest) for guest in party.guests])
+    return party._replace(guests = [
+        updates[guest.id](guest) if guest.id in updates else guest
+        for guest in party.guests
+    ])
+
+
 @curry
 def set_guest(guest: Guest,
               party: Party) -> Party:
@@ -208,30 +336,22 @@ def set_guest(guest: Guest,
 
     Args:
         guest: The guest to add to the party, or to replace an existing guest with. If the party already contains a
-            guest whose ID is equal to `guest.id`, then that guest is replaced with `guest`. Otherwise, `guest` is added
-            to the party.
+            guest whose ID is equal to `guest.id`, then that guest is replaced with `guest`, keeping its position.
+            Otherwise, `guest` is added to the end of the party.
         party: The party to add `guest` to.
 
     Returns:
         A new :obj:`Party` instance, equivalent to `party` except with the specified guest added or updated.
     """
-    without_guest = remove_guest(guest.id)(party)
-    return without_guest._replace(
-        guests = without_guest.guests + [guest]
-    )
+    guests = guests_by_id(party)
+    guests[guest.id] = guest
+    return party._replace(guests = list(guests.values()))
 
 
 def modify_guest(guest_id: str,
                  modify: Callable[[Guest], Guest]) -> Callable[[Party], Party]:
-    def _modify_guest(party: Party) -> Optional[Guest]:
-        maybe_guest = get_guest(guest_id)(party)
-        new_guest   = option.fmap(modify)(maybe_guest)
-        return compose(
-            set_guest   (new_guest),
-            remove_guest(guest_id )
-        )(party)
-
-    return _modify_guest
+    """Create a function that modifies a guest in a party. The party is unmodified if it has no such guest."""
+    return modify_guests({guest_id: modify})
 
 
 @curry
@@ -2,7 +2,6 @@ from logging import Logger
 from typing import Any, Dict
 from urllib.parse import parse_qs
 
-import pystache
 from botocore.exceptions import ClientError
 from marshmallow import fields
 from toolz.dicttoolz import valmap, dissoc, valfilter
@@ -10,12 +9,13 @@ from toolz.functoolz import partial, compose
 from toolz.itertoolz import first
 
 from wedding import TemplateResolver
-from wedding.general.aws.rest import LambdaHandler
-from wedding.general.aws.rest.responses import TemporaryRedirect, HttpResponse, Ok, InternalServerError
+from wedding.general import fastjson, mustache
+from wedding.general.aws.rest import LambdaHandler, compression, etags
+from wedding.general.aws.rest.responses import TemporaryRedirect, HttpResponse, Ok, InternalServerError, conditional
 from wedding.general.functional import option
-from wedding.general.functional import sequence
 from wedding.general.model import optional, required, build, JsonCodec, codec
-from wedding.model import PartyStore, Party, RsvpSubmitted, get_guest, Guest, modify_guest, advance_stage
+from wedding.model import PartyStore, Party, RsvpSubmitted, get_guest, Guest, modify_guest, modify_guests, \
+    advance_stage, PartyUnitOfWork
 
 
 def _parse_bool(s: str) -> bool:
@@ -166,12 +166,17 @@ class RsvpHandler(LambdaHandler):
         self.__rideshare_url_template: str               = rideshare_url_template
         self.__decline_url           : str               = decline_url
         self.__logger                : Logger            = logger
+        self.__fingerprint           : etags.Fingerprint = etags.Fingerprint()
 
-    @staticmethod
-    def __render(template: str,
+    def __render(self,
+                 event,
+                 template: str,
                  context: Dict[str, Any]) -> HttpResponse:
-        return Ok(
-            pystache.render(
+        # The page is a function of the template and the context, so its tag is computed without rendering it
+        return conditional(
+            etags.if_none_match(event),
+            etags.strong(self.__fingerprint(template), fastjson.dumps(context, sort_keys = True)),
+            lambda: mustache.render(
                 template,
                 context
             )
@@ -194,42 +199,38 @@ class RsvpHandler(LambdaHandler):
             ]
         }
 
-    def __get(self, event):
+    def __get(self, event, parties: PartyStore):
         party_id: str = event['partyId']
         guest_id: str = event['guestId']
 
         maybe_get_context, get_template = option.fmap(
             lambda party: (partial(self.__rsvp_context, party), self.__rsvp_template)
-        )(self.__parties.get(party_id))
+        )(parties.get(party_id))
 
         return option.cata(
             lambda get_context: self.__render(
+                event,
                 get_template(),
                 get_context(guest_id)
             ),
             lambda: self.__internal_error
         )(maybe_get_context)
 
-    def __post(self, event):
+    def __post(self, event, parties: PartyUnitOfWork):
         raw_form: str = event['query']
         form = RsvpFormData.parse(raw_form)
 
         self.__logger.debug(f'RSVP submitted: {form}')
 
-        def set_attending(guest: Guest):
-            return modify_guest(
-                guest.id,
-                lambda g: g._replace(attending = form.attending.get(g.id, False))
-            )
+        def set_attending(guest: Guest) -> Guest:
+            return guest._replace(attending = form.attending.get(guest.id, False))
 
         try:
-            maybe_party = self.__parties.modify(
+            maybe_party = parties.modify(
                 form.party_id,
-                compose(
-                    advance_stage(RsvpSubmitted),
-                    lambda p: sequence.foldr(set_attending)(p.guests)(p)
-                )
+                compose(advance_stage(RsvpSubmitted), modify_guests(set_attending))
             )
+            parties.flush()
         except ClientError as exc:
             self.__logger.error(
                 f'RSVP submitted for party "{form.party_id}", but database operation failed with error "{exc}. ' +
@@ -245,7 +246,7 @@ class RsvpHandler(LambdaHandler):
                 party_id  = form.party_id,
                 rideshare = option.fmap(lambda guest: guest.rideshare)(maybe_guest) or False
             )
-            return pystache.render(
+            return mustache.render(
                 self.__rideshare_url_template,
                 RideShareQueryCodec.encode(rideshare_query)
             )
@@ -261,13 +262,18 @@ class RsvpHandler(LambdaHandler):
             lambda: self.__internal_error
         )(maybe_party)
 
+    def _warm(self) -> None:
+        self.__fingerprint(self.__rsvp_template())
+        self.__parties.warm()
+
     def _handle(self, event):
         method = event[self.METHOD_FIELD].upper()
-        return (
-            self.__get (event) if method == 'GET'  else
-            self.__post(event) if method == 'POST' else
-            self.__internal_error
-        ).as_json()
+        with PartyUnitOfWork(self.__parties) as parties:
+            return (
+                self.__get (event, parties) if method == 'GET'  else
+                self.__post(event, parties) if method == 'POST' else
+                self.__internal_error
+            ).as_json(compression.accept_encoding(event))
 
 
 class RideShareHandler(LambdaHandler):
@@ -295,22 +301,23 @@ class RideShareHandler(LambdaHandler):
 
     def __get(self, query: RideShareQuery) -> HttpResponse:
         return Ok(
-            pystache.render(
+            mustache.render(
                 self.__template(),
                 RideShareQueryCodec.encode(query)
             )
         )
 
-    def __post(self, form: RideShareFormData) -> HttpResponse:
+    def __post(self, form: RideShareFormData, parties: PartyUnitOfWork) -> HttpResponse:
         self.__logger.debug(f'Rideshare submitted: {form}')
         try:
-            party = self.__parties.modify(
+            party = parties.modify(
                 form.party_id,
                 modify_guest(
                     form.guest_id,
                     lambda guest: guest._replace(rideshare = form.rideshare)
                 )
             )
+            parties.flush()
         except ClientError as exc:
             self.__logger.error(
                 f'Ride share preference submitted for guest "{form.guest_id}" in party "{form.party_id}", ' +
@@ -322,7 +329,7 @@ class RideShareHandler(LambdaHandler):
 
         return option.cata(
             lambda guest: TemporaryRedirect(
-                pystache.render(
+                mustache.render(
                     self.__thank_you_url,
                     { 'firstName': guest.first_name }
                 )
@@ -330,15 +337,20 @@ class RideShareHandler(LambdaHandler):
             lambda: self.__internal_error
         )(maybe_guest)
 
+    def _warm(self) -> None:
+        self.__template()
+        self.__parties.warm()
+
     def _handle(self, event):
         method   = event[self.METHOD_FIELD].upper()
         raw_data = event['query']
         self.__logger.debug(f'Ride share {method} received. Raw data = "{raw_data}"')
-        return (
-            self.__get (RideShareQueryCodec.decode(raw_data)) if method == 'GET'  else
-            self.__post(RideShareFormData  .parse (raw_data)) if method == 'POST' else
-            self.__internal_error
-        ).as_json()
+        with PartyUnitOfWork(self.__parties) as parties:
+            return (
+                self.__get (RideShareQueryCodec.decode(raw_data)         ) if method == 'GET'  else
+                self.__post(RideShareFormData  .parse (raw_data), parties) if method == 'POST' else
+                self.__internal_error
+            ).as_json(compression.accept_encoding(event))
 
 
 class ThankYouHandler(LambdaHandler):
@@ -347,17 +359,12 @@ class ThankYouHandler(LambdaHandler):
                  homepage_url: str) -> None:
         self.__get_template = thank_you_template
         self.__homepage_url = homepage_url
+        self.__anonymous    = (None, None)
 
-    def _handle(self, event):
-        maybe_respondent = option.fmap(
-            lambda first_name: {
-                'firstName': first_name
-            }
-        )(event.get('firstName'))
-
+    def __render(self, template: str, maybe_respondent) -> HttpResponse:
         return Ok(
-            pystache.render(
-                self.__get_template(),
+            mustache.render(
+                template,
                 valfilter(
                     option.not_none,
                     {
@@ -366,4 +373,28 @@ class ThankYouHandler(LambdaHandler):
                     }
                 )
             )
-        ).as_json()
+        )
+
+    def __render_anonymous(self, template: str) -> HttpResponse:
+        # The page without a respondent only changes with the template, so it is rendered and compressed once
+        cached_template, response = self.__anonymous
+        if cached_template != template:
+            response         = self.__render(template, None).precompress()
+            self.__anonymous = (template, response)
+        return response
+
+    def _warm(self) -> None:
+        self.__render_anonymous(self.__get_template())
+
+    def _handle(self, event):
+        maybe_respondent = option.fmap(
+            lambda first_name: {
+                'firstName': first_name
+            }
+        )(event.get('firstName'))
+
+        template = self.__get_template()
+        return (
+            self.__render(template, maybe_respondent) if maybe_respondent is not None else
+            self.__render_anonymous(template)
+        ).as_json(compression.accept_encoding(event))